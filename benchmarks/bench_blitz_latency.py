@@ -0,0 +1,96 @@
+"""
+Задержка блица: от нажатия на вариант до отрисовки следующего вопроса.
+
+Нажатие имитируется button.invoke(), отрисовка - root.update_idletasks();
+между нажатиями интерфейс простаивает (root.update), и очередь вопросов
+пополняется, как в игре. Без дисплея измеряется только часть без виджетов.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_blitz_latency [число_нажатий]
+"""
+
+import random
+import sys
+import time
+
+from core.blitz import BlitzRound
+from core.game import Game
+from core.question_manager import QuestionManager
+
+LATENCY_BUDGET_MS = 50
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))]
+
+
+def report(name, samples):
+    p50, p95, worst = percentile(samples, 50), percentile(samples, 95), max(samples)
+    print(f"  {name}: p50 {p50:.2f} мс, p95 {p95:.2f} мс, максимум {worst:.2f} мс")
+    return p95
+
+
+def measure_round(question_manager, clicks, rng):
+    """Ответ и выдача следующего вопроса без интерфейса"""
+    blitz = BlitzRound(question_manager.fork(), duration=10 ** 6)
+    blitz.start()
+    samples = []
+    for _ in range(clicks):
+        started = time.perf_counter()
+        blitz.answer(rng.randrange(4))
+        blitz.next_question()
+        samples.append((time.perf_counter() - started) * 1000)
+        blitz.refill()
+    return samples
+
+
+def measure_screen(game, clicks, rng):
+    """Полный путь через BlitzScreen; None, если нет дисплея"""
+    import tkinter as tk
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"  Интерфейс не измерен (нет дисплея): {e}")
+        return None
+
+    from ui.blitz_screen import BlitzScreen
+
+    screen = BlitzScreen(root, game, app=None, duration=10 ** 6)
+    screen.pack(fill=tk.BOTH, expand=True)
+    root.update()
+
+    samples = []
+    for _ in range(clicks):
+        button = screen.answer_buttons[rng.randrange(4)]
+        started = time.perf_counter()
+        button.invoke()
+        root.update_idletasks()  # Отрисовка измененных виджетов
+        samples.append((time.perf_counter() - started) * 1000)
+        root.update()  # Простой: срабатывают after_idle (пополнение очереди) и таймер
+    root.destroy()
+    return samples
+
+
+def main():
+    clicks = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    rng = random.Random(1)
+    game = Game(QuestionManager(lazy=True))
+
+    print(f"Нажатий: {clicks}, бюджет: {LATENCY_BUDGET_MS} мс")
+    worst_p95 = report("очередь вопросов", measure_round(game.question_manager, clicks, rng))
+
+    screen_samples = measure_screen(game, clicks, rng)
+    if screen_samples is not None:
+        worst_p95 = max(worst_p95, report("нажатие -> отрисовка", screen_samples))
+
+    if worst_p95 > LATENCY_BUDGET_MS:
+        print(f"❌ p95 {worst_p95:.2f} мс превышает бюджет {LATENCY_BUDGET_MS} мс")
+        return 1
+    print("✓ Укладываемся в бюджет")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
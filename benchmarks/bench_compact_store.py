@@ -0,0 +1,78 @@
+"""
+Сравнение памяти: список словарей (как в JSON-наборах) против CompactQuestionStore.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_compact_store [число_вопросов]
+"""
+
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+from core.compact_store import CompactQuestionStore
+from core.question_manager import list_question_files
+
+
+def make_questions(count, seed=1):
+    """Строит синтетический банк: уникальные тексты и варианты из реальных наборов"""
+    samples = []
+    for file in list_question_files("data/questions"):
+        with open(file, "r", encoding="utf-8") as f:
+            samples.extend(json.load(f))
+
+    rng = random.Random(seed)
+    questions = []
+    for i in range(count):
+        sample = samples[i % len(samples)]
+        # json.loads возвращает новые строки, как при настоящей загрузке файлов
+        questions.append(json.loads(json.dumps({
+            "question": f"{sample['question']} ({i})",
+            "options": rng.sample(sample["options"], len(sample["options"])),
+            "correct_answer": sample["correct_answer"],
+            "difficulty": sample["difficulty"]
+        }, ensure_ascii=False)))
+    return questions
+
+
+def measure(build):
+    """Возвращает (результат, байт памяти, секунд) для построения структуры"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - started
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size, elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    source = json.dumps(make_questions(count), ensure_ascii=False)
+
+    dicts, dict_bytes, _ = measure(lambda: json.loads(source))
+
+    def build_store():
+        store = CompactQuestionStore()
+        store.add_set("bench", json.loads(source))
+        return store
+
+    store, store_bytes, _ = measure(build_store)
+
+    started = time.perf_counter()
+    for question_id in range(count):
+        store.get_question(question_id)
+    access = (time.perf_counter() - started) / count
+
+    assert store.get_question(count // 2) == dicts[count // 2]
+
+    print(f"Вопросов: {count}, уникальных строк: {len(store.strings)}")
+    print(f"  список словарей:      {dict_bytes / 2 ** 20:8.1f} МБ")
+    print(f"  CompactQuestionStore: {store_bytes / 2 ** 20:8.1f} МБ "
+          f"({store_bytes / dict_bytes:.0%} от словарей)")
+    print(f"  get_question:         {access * 1e6:8.2f} мкс на вопрос")
+
+
+if __name__ == "__main__":
+    main()
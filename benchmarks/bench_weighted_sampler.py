@@ -0,0 +1,52 @@
+"""
+Скорость AdaptiveQuestionSampler на большом пуле: выдача и учет ответа.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_weighted_sampler [число_вопросов]
+"""
+
+import random
+import sys
+import time
+
+from core.weighted_sampler import AdaptiveQuestionSampler
+
+
+class SyntheticBank:
+    """Минимальный банк для сэмплера: только число вопросов и их сложность"""
+
+    def __init__(self, count, seed=1):
+        rng = random.Random(seed)
+        self.difficulties = [rng.choice((1, 2, 3)) for _ in range(count)]
+
+    def get_question_count(self):
+        return len(self.difficulties)
+
+    def get_question_difficulty(self, question_id):
+        return self.difficulties[question_id]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    rounds = 100_000
+    rng = random.Random(2)
+
+    started = time.perf_counter()
+    sampler = AdaptiveQuestionSampler(SyntheticBank(count), rng=random.Random(3))
+    build = time.perf_counter() - started
+
+    # У каждого вопроса своя "настоящая" доля верных ответов
+    accuracy = [rng.random() for _ in range(count)]
+
+    started = time.perf_counter()
+    for i in range(rounds):
+        question_id = sampler.draw_for_level(i % 15 + 1)
+        sampler.record_answer(question_id, rng.random() < accuracy[question_id])
+    elapsed = time.perf_counter() - started
+
+    print(f"Вопросов: {count}, построение: {build:.2f} с")
+    print(f"  выдача + учет ответа: {elapsed / rounds * 1e6:.1f} мкс ({rounds / elapsed:,.0f} в секунду)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Блиц: вопросы идут подряд без пауз, пока не кончится время.
+
+Вопросы заранее раскладываются в очередь готовых кортежей (текст, варианты,
+правильный ответ), поэтому между нажатием и следующим вопросом не остается
+ни чтения файлов, ни декодирования из банка - только popleft.
+Очередь пополняется порциями, когда интерфейс простаивает (refill).
+"""
+
+import time
+from collections import deque
+
+BLITZ_DURATION = 60.0  # Секунд на раунд
+WRONG_ANSWER_PENALTY = 3.0  # Неверный ответ отнимает время
+QUEUE_TARGET = 32  # Сколько готовых вопросов держать в очереди
+REFILL_CHUNK = 8  # Сколько вопросов готовить за один простой интерфейса
+
+
+class BlitzRound:
+    """Раунд блица над отдельной копией позиции в наборах (QuestionManager.fork)"""
+
+    def __init__(self, question_manager, duration=BLITZ_DURATION, clock=time.monotonic):
+        self.question_manager = question_manager
+        self.duration = duration
+        self.clock = clock
+        self.queue = deque()  # (текст, варианты, правильный ответ)
+        self.current = None
+        self.correct = 0
+        self.answered = 0
+        self.penalty = 0.0
+        self.started_at = None
+        self._exhausted = False
+        self.refill(QUEUE_TARGET)
+
+    def _decode_next(self):
+        """Следующий вопрос по наборам подряд; после последнего набора - снова с первого"""
+        manager = self.question_manager
+        question = manager.get_question()
+        if question is None:
+            if not manager.load_next_set():
+                manager.reset_to_first_set()
+            question = manager.get_question()
+        if question is None:
+            return None
+        return question["question"], tuple(question["options"]), question["correct_answer"]
+
+    def refill(self, limit=REFILL_CHUNK):
+        """Готовит до limit вопросов (вызывается, пока интерфейс простаивает)"""
+        added = 0
+        while added < limit and len(self.queue) < QUEUE_TARGET and not self._exhausted:
+            entry = self._decode_next()
+            if entry is None:
+                self._exhausted = True  # Вопросов нет вовсе
+                break
+            self.queue.append(entry)
+            added += 1
+        return added
+
+    def start(self):
+        self.started_at = self.clock()
+        return self.next_question()
+
+    def next_question(self):
+        """Берет готовый вопрос из очереди (или None, если вопросов нет)"""
+        if not self.queue:
+            self.refill(1)  # Очередь не успела пополниться - готовим один вопрос сразу
+        self.current = self.queue.popleft() if self.queue else None
+        return self.current
+
+    def answer(self, answer_index):
+        """Засчитывает ответ и возвращает, верен ли он"""
+        if self.current is None or self.is_over():
+            return False
+        is_correct = answer_index == self.current[2]
+        self.answered += 1
+        if is_correct:
+            self.correct += 1
+        else:
+            self.penalty += WRONG_ANSWER_PENALTY
+        return is_correct
+
+    def time_left(self):
+        if self.started_at is None:
+            return self.duration
+        return max(0.0, self.duration - self.penalty - (self.clock() - self.started_at))
+
+    def is_over(self):
+        return self.started_at is not None and (self.time_left() <= 0 or self.current is None)
@@ -0,0 +1,77 @@
+import sys
+from array import array
+
+from core.question_bank import BankQuestionSet
+
+
+class CompactQuestionStore:
+    """
+    Компактное хранение вопросов в параллельных массивах вместо словаря на вопрос.
+    Все строки (тексты и варианты ответов) интернируются в общую таблицу, поэтому
+    повторяющиеся ответы вроде "Нил" или "Венера" хранятся один раз.
+    Интерфейс совпадает с QuestionBank: get_set, get_question, get_question_info.
+    """
+
+    def __init__(self):
+        self.strings = []  # Таблица уникальных строк
+        self._string_ids = {}  # строка -> номер в таблице
+        self.texts = array('I')  # Номер строки с текстом вопроса
+        self.option_starts = array('I', [0])  # Начало вариантов вопроса в option_ids
+        self.option_ids = array('I')  # Номера строк вариантов ответа
+        self.correct_answers = array('b')
+        self.difficulties = array('b')
+        self.sets = []  # (имя, первый вопрос, количество)
+
+    @property
+    def set_count(self):
+        return len(self.sets)
+
+    @property
+    def question_count(self):
+        return len(self.texts)
+
+    def _intern(self, text):
+        """Возвращает номер строки в общей таблице, добавляя ее при первом появлении"""
+        string_id = self._string_ids.get(text)
+        if string_id is None:
+            string_id = len(self.strings)
+            text = sys.intern(text)
+            self.strings.append(text)
+            self._string_ids[text] = string_id
+        return string_id
+
+    def add_set(self, name, questions):
+        """Добавляет набор вопросов и возвращает его номер"""
+        first = self.question_count
+        for question in questions:
+            self.texts.append(self._intern(question["question"]))
+            self.option_ids.extend(self._intern(option) for option in question["options"])
+            self.option_starts.append(len(self.option_ids))
+            self.correct_answers.append(int(question["correct_answer"]))
+            self.difficulties.append(int(question.get("difficulty", 0)))
+        self.sets.append((name, first, self.question_count - first))
+        return len(self.sets) - 1
+
+    def get_set_name(self, set_index):
+        """Возвращает имя набора"""
+        return self.sets[set_index][0]
+
+    def get_set(self, set_index):
+        """Возвращает ленивое представление набора"""
+        _, first, count = self.sets[set_index]
+        return BankQuestionSet(self, first, count)
+
+    def get_question_info(self, question_id):
+        """Возвращает (правильный ответ, сложность)"""
+        return self.correct_answers[question_id], self.difficulties[question_id]
+
+    def get_question(self, question_id):
+        """Собирает вопрос в том же виде, что и в JSON-наборах"""
+        strings = self.strings
+        start, end = self.option_starts[question_id], self.option_starts[question_id + 1]
+        return {
+            "question": strings[self.texts[question_id]],
+            "options": [strings[i] for i in self.option_ids[start:end]],
+            "correct_answer": self.correct_answers[question_id],
+            "difficulty": self.difficulties[question_id]
+        }
@@ -39,6 +39,9 @@ BACKGROUND_MAP = {
     "end": os.path.join(ASSETS_DIR, "backgrounds", "end.png")
 }
 
+# Как часто проверять изменения файлов вопросов (мс)
+QUESTIONS_POLL_INTERVAL = 2000
+
 # Пути к темам
 THEMES_DIR = os.path.join("assets", "themes")
 CURRENT_THEME = "default"
@@ -0,0 +1,176 @@
+"""
+Векторизованная оценка выигрыша методом Монте-Карло (NumPy).
+
+Все испытания одного уровня считаются одной операцией над массивом,
+поэтому миллионы прохождений всех семи наборов занимают секунды.
+Модель совпадает с игрой и core.simulation: 50/50 убирает два неверных
+варианта, друг прав в 80% случаев, зал голосует по модели audience_help.
+
+Запуск из корня проекта:
+    python -m core.estimator [число_испытаний]
+"""
+
+import sys
+
+import numpy as np
+
+from core import hints
+from core.game import PRIZE_LEVELS, guaranteed_prize_for_level
+
+LEVELS = 15
+BATCH_SIZE = 250_000  # Испытаний за один проход (ограничивает память)
+
+# Выигрыш при проигрыше с k верными ответами (k = 0..14) и за пройденный набор
+FAIL_PRIZES = np.array([guaranteed_prize_for_level(passed + 1) for passed in range(LEVELS)], dtype=np.int64)
+SET_PRIZE = PRIZE_LEVELS[LEVELS]
+
+
+def knowledge_matrix(question_manager, player, sets=None):
+    """Вероятности знать ответ: массив (наборы, 15) по игроку из core.simulation"""
+    sets = range(question_manager.get_total_sets()) if sets is None else sets
+    rows = []
+    for set_index in sets:
+        questions = question_manager.get_set_questions(set_index)
+        rows.append([player.knowledge(questions[level]) for level in range(LEVELS)])
+    return np.array(rows, dtype=np.float64)
+
+
+def _guess_correct(used_now, size, rng):
+    """
+    Угадал ли игрок, не знающий ответа, при данном сочетании подсказок.
+    Правильный вариант считается нулевым - от порядка вариантов ничего не зависит.
+    """
+    options = hints.OPTIONS_COUNT
+    if "fifty_fifty" in used_now:
+        # Остается правильный вариант и один случайный неверный
+        available = np.zeros((size, options), dtype=bool)
+        available[:, 0] = True
+        available[np.arange(size), rng.integers(1, options, size)] = True
+    else:
+        available = np.ones((size, options), dtype=bool)
+
+    decided = np.zeros(size, dtype=bool)
+    answer = np.zeros(size, dtype=np.int64)
+
+    if "call_friend" in used_now:
+        friend = np.where(rng.random(size) < hints.FRIEND_ACCURACY, 0, rng.integers(1, options, size))
+        follows = available[np.arange(size), friend]
+        answer[follows] = friend[follows]
+        decided |= follows
+
+    if "audience_help" in used_now:
+        low, high = hints.AUDIENCE_BASE_VOTES
+        votes = rng.integers(low, high + 1, (size, options)).astype(np.float64)
+        bonus_low, bonus_high = hints.AUDIENCE_CORRECT_BONUS
+        votes[:, 0] += rng.integers(bonus_low, bonus_high + 1, size)
+        percentages = np.round(votes / votes.sum(axis=1, keepdims=True) * 100)
+        # Среди равных процентов выбор случайный, убранные 50/50 варианты не рассматриваются
+        score = np.where(available, percentages + rng.random((size, options)) * 0.5, -1)
+        pick = score.argmax(axis=1)
+        answer[~decided] = pick[~decided]
+        decided[:] = True
+
+    if not decided.all():
+        # Случайный выбор среди оставшихся вариантов
+        score = np.where(available, rng.random((size, options)), -1)
+        pick = score.argmax(axis=1)
+        answer[~decided] = pick[~decided]
+
+    return answer == 0
+
+
+class WinningsDistribution:
+    """Результат оценки: итоговый выигрыш каждого испытания и сводка по нему"""
+
+    def __init__(self, totals, sets_won):
+        self.totals = totals  # Общий выигрыш (как Game.get_total_prize)
+        self.sets_won = sets_won  # Сколько наборов пройдено подряд
+
+    @property
+    def trials(self):
+        return len(self.totals)
+
+    def mean(self):
+        return float(self.totals.mean())
+
+    def percentile(self, q):
+        return float(np.percentile(self.totals, q))
+
+    def histogram(self):
+        """Выигрыш -> доля испытаний"""
+        values, counts = np.unique(self.totals, return_counts=True)
+        return {int(value): count / self.trials for value, count in zip(values, counts)}
+
+    def set_reach(self):
+        """Доля испытаний, дошедших до каждого набора (индекс 0 - первый набор)"""
+        sets = int(self.sets_won.max(initial=0)) + 1
+        counts = np.bincount(self.sets_won, minlength=sets)
+        return (counts[::-1].cumsum()[::-1] / self.trials).tolist()
+
+
+def estimate_winnings(knowledge, trials=1_000_000, hint_plan=None, seed=None, batch_size=BATCH_SIZE):
+    """
+    Оценивает распределение общего выигрыша при прохождении наборов подряд.
+
+    knowledge - массив (наборы, 15) вероятностей знать ответ;
+    hint_plan - {уровень: (имена подсказок)}, как FixedLevelHints.hint_plan();
+    подсказки возвращаются в начале каждого набора, как в Game.start_new_game.
+    Игрок, ошибившийся в наборе, получает несгораемую сумму и заканчивает.
+    """
+    knowledge = np.asarray(knowledge, dtype=np.float64)
+    if knowledge.ndim != 2 or knowledge.shape[1] != LEVELS:
+        raise ValueError(f"knowledge должен иметь форму (наборы, {LEVELS})")
+    hint_plan = hint_plan or {}
+    rng = np.random.default_rng(seed)
+
+    totals = np.empty(trials, dtype=np.int64)
+    sets_won = np.empty(trials, dtype=np.int64)
+    for start in range(0, trials, batch_size):
+        size = min(batch_size, trials - start)
+        total = np.zeros(size, dtype=np.int64)
+        won = np.zeros(size, dtype=np.int64)
+        alive = np.ones(size, dtype=bool)
+
+        for set_knowledge in knowledge:
+            correct = rng.random((size, LEVELS)) < set_knowledge
+            for level, used_now in hint_plan.items():
+                if 1 <= level <= LEVELS and used_now:
+                    column = correct[:, level - 1]
+                    column |= _guess_correct(used_now, size, rng)
+            unknown_levels = [lvl for lvl in range(1, LEVELS + 1) if not hint_plan.get(lvl)]
+            if unknown_levels:
+                columns = np.array(unknown_levels) - 1
+                correct[:, columns] |= rng.random((size, len(columns))) < 1 / hints.OPTIONS_COUNT
+
+            passed = np.where(correct.all(axis=1), LEVELS, correct.argmin(axis=1))
+            finished = passed == LEVELS
+            total += np.where(alive, np.where(finished, SET_PRIZE, FAIL_PRIZES[np.minimum(passed, LEVELS - 1)]), 0)
+            won += alive & finished
+            alive &= finished
+            if not alive.any():
+                break
+
+        totals[start:start + size] = total
+        sets_won[start:start + size] = won
+
+    return WinningsDistribution(totals, sets_won)
+
+
+if __name__ == "__main__":
+    import time
+
+    from core.question_manager import QuestionManager
+    from core.simulation import FixedLevelHints, SkillPlayer
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    matrix = knowledge_matrix(QuestionManager(lazy=True), SkillPlayer())
+
+    started = time.perf_counter()
+    result = estimate_winnings(matrix, count, FixedLevelHints().hint_plan(), seed=1)
+    elapsed = time.perf_counter() - started
+
+    print(f"Испытаний: {result.trials} за {elapsed:.2f} с")
+    print(f"Средний выигрыш: {result.mean():,.0f} руб., медиана: {result.percentile(50):,.0f} руб.")
+    print("Доля дошедших до набора: " + ", ".join(f"{i + 1}: {share:.1%}" for i, share in enumerate(result.set_reach())))
+    for prize, share in result.histogram().items():
+        print(f"  {prize:>10,} руб.: {share:.2%}")
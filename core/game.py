@@ -1,10 +1,38 @@
+import time
+
+from core import journal as journal_events
 from core.question_manager import QuestionManager
 
+# Несгораемые суммы после 5 и 10 вопросов
+SAFE_POINTS = [5, 10]
+PRIZE_LEVELS = {
+    1: 500, 2: 1000, 3: 2000, 4: 3000, 5: 5000,
+    6: 10000, 7: 20000, 8: 30000, 9: 40000, 10: 50000,
+    11: 100000, 12: 200000, 13: 300000, 14: 500000, 15: 1000000
+}
+
+
+def guaranteed_prize_for_level(level, prize_levels=PRIZE_LEVELS):
+    """Несгораемая сумма, которую получает игрок, ошибившись на уровне level"""
+    if level >= 10:
+        return prize_levels[10]
+    elif level >= 5:
+        return prize_levels[5]
+    return 0
+
 
 class Game:
-    def __init__(self):
-        self.question_manager = QuestionManager()
+    def __init__(self, question_manager=None):
+        self.question_manager = question_manager or QuestionManager()
+        self.question_pool = None  # Случайная выдача по сложности (core.question_pool)
         self.current_question = None
+        self.current_question_id = None  # Номер вопроса в общей нумерации
+        self.prefetched_draw = None  # (уровень, номер, вопрос), вытянутые из пула заранее
+        self.journal = None  # Журнал событий для восстановления после сбоя (core.journal)
+        self.question_stats = None  # Счетчики показов и ответов по вопросам (core.question_stats)
+        self.response_times = None  # Гистограммы времени ответа (core.response_times)
+        self.question_shown_at = None  # time.monotonic() показа текущего вопроса
+        self.resume_pending = False  # Восстановлена незаконченная игра, ждет продолжения
         self.score = 0
         self.current_level = 1
         self.total_accumulated_winnings = 0  # Накопленная сумма за все игры
@@ -16,23 +44,25 @@ class Game:
         }
 
         # Несгораемые суммы после 5 и 10 вопросов
-        self.safe_points = [5, 10]
-        self.prize_levels = {
-            1: 500, 2: 1000, 3: 2000, 4: 3000, 5: 5000,
-            6: 10000, 7: 20000, 8: 30000, 9: 40000, 10: 50000,
-            11: 100000, 12: 200000, 13: 300000, 14: 500000, 15: 1000000
-        }
+        self.safe_points = list(SAFE_POINTS)
+        self.prize_levels = dict(PRIZE_LEVELS)
 
     def start_new_game(self, reset_questions=True, is_new_session=True):
         """Начинает новую игру"""
         self.current_level = 1
         self.current_game_winnings = 0  # Сбрасываем выигрыш текущей игры
+        self._discard_prefetched_draw()
         self.used_hints = {
             "50_50": False,
             "call_friend": False,
             "audience_help": False
         }
 
+        # Наборы, измененные авторами во время прошлой игры, подменяются только сейчас
+        if self.question_manager.apply_pending_updates() and self.question_pool is not None:
+            # Нумерация вопросов могла сдвинуться - пул того же вида строится заново
+            self.question_pool = type(self.question_pool)(self.question_manager, self.question_pool.rng)
+
         if is_new_session:
             # Полный сброс только для новой сессии
             self.total_accumulated_winnings = 0
@@ -44,6 +74,78 @@ class Game:
         if reset_questions:
             self.question_manager.reset_current_set()
 
+        self.resume_pending = False
+        if self.journal is not None:
+            if is_new_session:
+                self.journal.start_session()
+            else:
+                self.journal.append(journal_events.GAME_STARTED, set_index=self.question_manager.current_set_index)
+
+    def attach_journal(self, journal):
+        """Подключает журнал событий"""
+        self.journal = journal
+
+    def restore_from_journal(self):
+        """Восстанавливает незаконченную сессию из журнала; True, если есть что продолжить"""
+        if self.journal is None or not self.journal.state.is_resumable():
+            return False
+
+        state = self.journal.state
+        if not self.restore_state(state.set_index, state.level, state.total_accumulated_winnings,
+                                  state.current_game_winnings, state.used_hints, log=False):
+            return False
+        print(f"Восстановлена игра: набор {state.set_index + 1}, уровень {state.level}, "
+              f"накоплено {state.total_accumulated_winnings}")
+        return True
+
+    def restore_state(self, set_index, level, total_accumulated_winnings, current_game_winnings, used_hints,
+                      question_id=None, log=True):
+        """
+        Восстанавливает игру (из журнала или сохранения): вопрос уровня level будет
+        показан заново. Файлы вопросов при этом не читаются.
+        """
+        if not self.question_manager.restore_position(set_index, level - 1):
+            return False
+        self.total_accumulated_winnings = total_accumulated_winnings
+        self.current_game_winnings = current_game_winnings
+        self.current_level = level
+        self.used_hints = {name: name in used_hints for name in journal_events.HINT_NAMES}
+        self.current_question = None
+        self.current_question_id = None
+        self.question_shown_at = None
+        self._discard_prefetched_draw()
+        if self.question_pool is not None and question_id is not None:
+            # При случайной выдаче повторяем тот же вопрос; сам он прочитается при показе
+            self.prefetched_draw = (level, question_id, None)
+        self.resume_pending = True
+
+        if log and self.journal is not None:
+            # Журнал начинается заново с восстановленного состояния
+            self.journal.start_session()
+            self.journal.append(journal_events.SET_COMPLETED, set_index=set_index, value=total_accumulated_winnings)
+            if level > 1:
+                self.journal.append(journal_events.LEVEL_ADVANCED, level=level, set_index=set_index,
+                                    value=current_game_winnings)
+            for name in used_hints:
+                self.journal.append(journal_events.HINT_USED, level=level, set_index=set_index,
+                                    arg=journal_events.HINT_NAMES.index(name))
+            self.journal.sync()
+        return True
+
+    def close_session(self):
+        """
+        Сессия закончена штатно (выход из игры или возврат в меню): журнал помечается
+        законченным, и после перезапуска "ИГРАТЬ" начнет новую игру. Продолжить
+        игру, оставленную через меню, можно из слота сохранения.
+        """
+        self.resume_pending = False
+        if self.journal is not None:
+            self.journal.append(journal_events.SESSION_CLOSED, sync=True)
+
+    def resume_recovered_session(self):
+        """Продолжает восстановленную игру с того же вопроса"""
+        self.resume_pending = False
+
     def handle_level_completion(self):
         """Обрабатывает завершение уровня (15 вопросов)"""
 
@@ -55,21 +157,127 @@ class Game:
 
             self.current_level = 1
             self.current_game_winnings = 0  # Сбрасываем для новой игры
+            self._log_set_completed(final=False)
             return True
         else:
+            self._log_set_completed(final=True)
             print("Все наборы пройдены - финальная победа!")
             return False
 
+    def enable_random_draw(self, pool=None):
+        """Включает случайную выдачу вопросов по сложности вместо порядка набора"""
+        from core.question_pool import QuestionPool
+        self.question_pool = pool or QuestionPool(self.question_manager)
+
+    def enable_adaptive_draw(self, sampler=None):
+        """Включает выдачу вопросов с весами по статистике ответов (core.weighted_sampler)"""
+        from core.weighted_sampler import AdaptiveQuestionSampler
+        self.question_pool = sampler or AdaptiveQuestionSampler(self.question_manager)
+
+    def start_blitz(self, duration=None):
+        """Раунд блица над отдельной позицией в наборах (текущая игра не сдвигается)"""
+        from core.blitz import BLITZ_DURATION, BlitzRound
+        return BlitzRound(self.question_manager.fork(), duration or BLITZ_DURATION)
+
+    def prefetch_next_question(self):
+        """Заранее готовит вопрос следующего уровня (пока идет пауза после ответа)"""
+        if self.question_pool is None:
+            self.question_manager.prefetch_next_question()
+            return
+
+        level = self.current_level + 1
+        if self.prefetched_draw is None or self.prefetched_draw[0] != level:
+            self._discard_prefetched_draw()
+            question_id = self.question_pool.draw_for_level(level)
+            if question_id is not None:
+                self.prefetched_draw = (level, question_id, self.question_manager.get_question_by_id(question_id))
+
+    def attach_question_stats(self, question_stats):
+        """Подключает сбор статистики по вопросам"""
+        self.question_stats = question_stats
+
+    def attach_response_times(self, response_times):
+        """Подключает замер времени ответа"""
+        self.response_times = response_times
+
     def load_question(self):
         """Загружает следующий вопрос"""
+        question = self._next_question()
+        self.question_shown_at = time.monotonic() if question is not None else None
+        if question is not None and self.question_stats is not None:
+            self.question_stats.record_shown(question)
+        return question
+
+    def _discard_prefetched_draw(self):
+        """Заранее вытянутый вопрос не понадобился - возвращаем его в пул"""
+        if self.prefetched_draw is not None and self.question_pool is not None:
+            self.question_pool.return_question(self.prefetched_draw[1])
+        self.prefetched_draw = None
+
+    def _next_question(self):
+        if self.prefetched_draw is not None:
+            level, question_id, question = self.prefetched_draw
+            if level == self.current_level:
+                self.prefetched_draw = None
+                if question is None:
+                    question = self.question_manager.get_question_by_id(question_id)
+                self.current_question_id, self.current_question = question_id, question
+                return self.current_question
+            self._discard_prefetched_draw()
+
+        if self.question_pool is not None:
+            self.current_question_id = self.question_pool.draw_for_level(self.current_level)
+            if self.current_question_id is None:
+                self.current_question = None
+            else:
+                self.current_question = self.question_manager.get_question_by_id(self.current_question_id)
+            return self.current_question
+
         self.current_question = self.question_manager.get_question()
+        self.current_question_id = self.question_manager.get_current_question_id() if self.current_question else None
         return self.current_question
 
+    def _log_set_completed(self, final):
+        if self.journal is not None:
+            # Деньги - самое ценное в журнале, поэтому сразу на диск
+            self.journal.append(journal_events.SET_COMPLETED, flag=final, sync=True,
+                                set_index=self.question_manager.current_set_index,
+                                value=self.total_accumulated_winnings)
+
     def check_answer(self, answer_index):
         """Проверяет правильность ответа"""
         if not self.current_question:
             return False
-        return self.current_question["correct_answer"] == answer_index
+        is_correct = self.current_question["correct_answer"] == answer_index
+        if self.response_times is not None and self.question_shown_at is not None:
+            self.response_times.record(self.current_level, self.question_manager.current_set_index,
+                                       time.monotonic() - self.question_shown_at)
+        self.question_shown_at = None  # Повторная проверка того же вопроса не учитывается
+        if self.question_pool is not None and self.current_question_id is not None:
+            self.question_pool.record_answer(self.current_question_id, is_correct)
+        if self.question_stats is not None:
+            self.question_stats.record_answer(self.current_question, answer_index, is_correct)
+        if self.journal is not None:
+            self.journal.append(journal_events.ANSWER_GIVEN, level=self.current_level, arg=answer_index,
+                                flag=is_correct, set_index=self.question_manager.current_set_index)
+        return is_correct
+
+    def advance_level(self):
+        """Переходит на следующий уровень после верного ответа"""
+        self.current_level += 1
+        if self.journal is not None:
+            self.journal.append(journal_events.LEVEL_ADVANCED, level=self.current_level,
+                                set_index=self.question_manager.current_set_index,
+                                value=self.current_game_winnings)
+        return self.current_level
+
+    def use_hint(self, hint):
+        """Отмечает подсказку ('50_50', 'call_friend', 'audience_help') использованной"""
+        self.used_hints[hint] = True
+        if self.journal is not None:
+            self.journal.append(journal_events.HINT_USED, level=self.current_level,
+                                arg=journal_events.HINT_NAMES.index(hint),
+                                set_index=self.question_manager.current_set_index)
 
     def add_current_prize(self):
         """Добавляет текущий приз к выигрышу игры"""
@@ -80,18 +288,14 @@ class Game:
 
     def get_guaranteed_prize(self):
         """Возвращает несгораемую сумму для ТЕКУЩЕЙ игры"""
-        if self.current_level >= 10:
-            return self.prize_levels[10]
-        elif self.current_level >= 5:
-            return self.prize_levels[5]
-        return 0
+        return guaranteed_prize_for_level(self.current_level, self.prize_levels)
 
     def get_last_safe_sum(self):
         """Возвращает последнюю несгораемую сумму для ТЕКУЩЕЙ игры"""
         return self.get_guaranteed_prize()
 
     def get_current_question_set(self):
-        """Возвращает номер текущего набора вопросов (1-7)"""
+        """Возвращает номер текущего набора вопросов (начиная с 1)"""
         return self.question_manager.current_set_index + 1
 
     def get_total_prize(self):
@@ -116,11 +320,13 @@ class Game:
         return self.handle_level_completion()
 
     def is_final_win(self):
-        """Проверяет, достигнут ли финальный выигрыш (все 7 наборов)"""
-        return self.question_manager.current_set_index >= 6  # 0-based index, 6 = 7й набор
+        """Проверяет, достигнут ли финальный выигрыш (пройден последний из наборов)"""
+        return self.question_manager.is_last_set()
 
     def has_more_questions(self):
         """Проверяет, есть ли еще вопросы в текущем наборе"""
+        if self.question_pool is not None:
+            return self.question_pool.question_count > 0
         return self.question_manager.has_more_questions()
 
     def is_last_set(self):
@@ -0,0 +1,35 @@
+import random
+
+OPTIONS_COUNT = 4
+FRIEND_ACCURACY = 0.8  # Друг называет правильный ответ с вероятностью 80%
+AUDIENCE_BASE_VOTES = (5, 25)  # Голоса за каждый вариант (включительно)
+AUDIENCE_CORRECT_BONUS = (30, 60)  # Дополнительные голоса за правильный вариант
+
+# Названия подсказок -> ключи в Game.used_hints
+HINT_KEYS = {
+    "fifty_fifty": "50_50",
+    "call_friend": "call_friend",
+    "audience_help": "audience_help"
+}
+
+
+def fifty_fifty(correct_answer, rng=random):
+    """Возвращает два неверных варианта, которые нужно убрать"""
+    wrong_answers = [i for i in range(OPTIONS_COUNT) if i != correct_answer]
+    rng.shuffle(wrong_answers)
+    return wrong_answers[:2]
+
+
+def call_friend(correct_answer, rng=random):
+    """Возвращает (вариант, уверен ли друг): с вероятностью 80% - правильный"""
+    if rng.random() < FRIEND_ACCURACY:
+        return correct_answer, True
+    return rng.choice([i for i in range(OPTIONS_COUNT) if i != correct_answer]), False
+
+
+def audience_help(correct_answer, rng=random):
+    """Возвращает проценты голосов зала по вариантам"""
+    votes = [rng.randint(*AUDIENCE_BASE_VOTES) for _ in range(OPTIONS_COUNT)]
+    votes[correct_answer] += rng.randint(*AUDIENCE_CORRECT_BONUS)
+    total = sum(votes)
+    return [round((v / total) * 100) for v in votes]
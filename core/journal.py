@@ -0,0 +1,151 @@
+"""
+Журнал игровых событий для восстановления после сбоя.
+
+Каждое событие - запись фиксированной длины с CRC, дописываемая в конец
+файла. Данные уходят в ОС сразу, а fsync выполняется пачками: по числу
+событий, раз в sync_interval секунд из фонового потока (интерфейс при
+ответах только пишет) и обязательно после завершения набора.
+При запуске журнал проигрывается и восстанавливает состояние Game;
+оборванная запись в конце файла отбрасывается.
+"""
+
+import os
+import struct
+import threading
+import zlib
+from pathlib import Path
+
+from core.persistence import PeriodicFlusher
+
+DEFAULT_JOURNAL_PATH = "data/session.journal"
+
+# Типы событий
+SESSION_STARTED = 1  # Новая сессия: накопленный выигрыш обнуляется
+GAME_STARTED = 2  # Новая игра в той же сессии (продолжение или переигровка)
+ANSWER_GIVEN = 3  # Ответ: level, arg = вариант, flag = верно ли
+LEVEL_ADVANCED = 4  # Переход на уровень level, value = выигрыш текущей игры
+HINT_USED = 5  # arg = номер подсказки в HINT_NAMES
+SET_COMPLETED = 6  # Набор пройден: set_index = новый набор, value = накопленный выигрыш, flag = последний
+SESSION_CLOSED = 7  # Штатный выход или возврат в меню: после перезапуска восстанавливать нечего
+
+HINT_NAMES = ("50_50", "call_friend", "audience_help")
+
+RECORD = struct.Struct("<BBBBIq")  # тип, уровень, аргумент, флаг, набор, сумма
+CRC = struct.Struct("<I")
+RECORD_SIZE = RECORD.size + CRC.size
+
+
+class JournalState:
+    """Состояние сессии, восстановленное из журнала"""
+
+    def __init__(self):
+        self.set_index = 0
+        self.level = 1
+        self.total_accumulated_winnings = 0
+        self.current_game_winnings = 0
+        self.used_hints = set()
+        self.finished = True  # Последняя игра закончилась (ошибкой) или еще не начиналась
+
+    def is_resumable(self):
+        """Есть ли незаконченная игра или накопленный прогресс"""
+        return not self.finished and (self.level > 1 or self.set_index > 0 or self.total_accumulated_winnings > 0)
+
+    def apply(self, event_type, level, arg, flag, set_index, value):
+        if event_type == SESSION_STARTED:
+            self.__init__()
+            self.finished = False
+        elif event_type == GAME_STARTED:
+            self.set_index = set_index
+            self.level = 1
+            self.current_game_winnings = 0
+            self.used_hints = set()
+            self.finished = False
+        elif event_type == ANSWER_GIVEN:
+            if not flag:
+                self.finished = True
+        elif event_type == LEVEL_ADVANCED:
+            self.level = level
+            self.current_game_winnings = value
+        elif event_type == HINT_USED:
+            if arg < len(HINT_NAMES):
+                self.used_hints.add(HINT_NAMES[arg])
+        elif event_type == SET_COMPLETED:
+            self.set_index = set_index
+            self.total_accumulated_winnings = value
+            self.level = 1
+            self.current_game_winnings = 0
+            self.used_hints = set()
+            if flag:
+                self.finished = True  # Пройдены все наборы
+        elif event_type == SESSION_CLOSED:
+            self.finished = True
+
+
+def replay(path):
+    """Проигрывает журнал; возвращает (состояние, длина корректной части файла)"""
+    state = JournalState()
+    valid_length = 0
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return state, 0
+
+    for offset in range(0, len(data) - RECORD_SIZE + 1, RECORD_SIZE):
+        body = data[offset:offset + RECORD.size]
+        (crc,) = CRC.unpack_from(data, offset + RECORD.size)
+        if zlib.crc32(body) != crc:
+            break  # Оборванная или испорченная запись - дальше не читаем
+        state.apply(*RECORD.unpack(body))
+        valid_length = offset + RECORD_SIZE
+    return state, valid_length
+
+
+class SessionJournal:
+    """Журнал событий, дописываемый в конец файла"""
+
+    def __init__(self, path=DEFAULT_JOURNAL_PATH, sync_every=16, sync_interval=1.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+
+        self.state, valid_length = replay(self.path)
+        self._file = open(self.path, "ab")
+        if self._file.tell() != valid_length:
+            self._file.truncate(valid_length)  # Отбрасываем оборванный хвост
+        # Счетчики событий: _appended меняет только поток интерфейса, _synced - sync под блокировкой
+        self._appended = 0
+        self._synced = 0
+        self._sync_lock = threading.Lock()
+        self._flusher = PeriodicFlusher(self.sync, sync_interval, name="journal-sync")
+
+    def append(self, event_type, level=0, arg=0, flag=False, set_index=0, value=0, sync=False):
+        """Дописывает событие; fsync - сразу при sync=True или каждые sync_every событий, иначе в фоне"""
+        body = RECORD.pack(event_type, level, arg, int(flag), set_index, value)
+        self._file.write(body + CRC.pack(zlib.crc32(body)))
+        self._file.flush()
+        self.state.apply(event_type, level, arg, int(flag), set_index, value)
+
+        self._appended += 1
+        if sync or self._appended - self._synced >= self.sync_every:
+            self.sync()
+
+    def sync(self):
+        """Сбрасывает записанное на диск (вызывается и из фонового потока)"""
+        with self._sync_lock:
+            appended = self._appended  # Все эти события уже отданы ОС
+            if appended != self._synced and not self._file.closed:
+                os.fsync(self._file.fileno())
+                self._synced = appended
+
+    def start_session(self):
+        """Новая сессия: прошлые события больше не нужны, журнал начинается заново"""
+        self._file.truncate(0)
+        self.state = JournalState()
+        self.append(SESSION_STARTED, sync=True)
+
+    def close(self):
+        self._flusher.close()
+        self.sync()
+        self._file.close()
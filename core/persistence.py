@@ -0,0 +1,179 @@
+"""
+Отложенная запись на диск в фоновом потоке (write-behind).
+
+Интерфейс только ставит запись в очередь (submit) и сразу возвращается.
+Записи с одним ключом объединяются: пока ползунок громкости двигают,
+каждое новое значение заменяет предыдущее, и на диск попадает только
+последнее - через delay секунд после последнего изменения (но не позже
+max_delay после первого). Записи без ключа (например, новые рекорды)
+выполняются все, в порядке поступления.
+
+Файлы пишутся во временный и подменяют прежний (write_json_atomic),
+поэтому при сбое на диске остается либо старая, либо новая версия.
+
+PeriodicFlusher - поток, который раз в interval секунд сбрасывает на диск
+то, что интерфейс только записал в ОС (fsync журнала, msync статистики).
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+DEBOUNCE_DELAY = 0.3  # Секунд тишины, после которых пачка записывается
+MAX_DELAY = 2.0  # Дольше этого запись не откладывается даже при непрерывных изменениях
+
+
+def write_atomic(path, write, mode="w"):
+    """
+    Пишет файл через временный в той же папке и подменяет прежний.
+    write(f) получает открытый файл; при любой ошибке временный файл удаляется.
+    """
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode, encoding=None if "b" in mode else "utf-8") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_json_atomic(path, data):
+    write_atomic(path, lambda f: json.dump(data, f, indent=2, ensure_ascii=False))
+
+
+class WriteBehind:
+    """Фоновый поток, выполняющий отложенные записи пачками"""
+
+    def __init__(self, delay=DEBOUNCE_DELAY, max_delay=MAX_DELAY, clock=time.monotonic):
+        self.delay = delay
+        self.max_delay = max_delay
+        self.clock = clock
+        self._condition = threading.Condition()
+        self._keyed = {}  # ключ -> последняя запись (dict хранит порядок первой постановки)
+        self._ordered = []  # записи без ключа, все по порядку
+        self._first_at = None  # Когда в пачку попала первая запись
+        self._last_at = None  # Когда - последняя
+        self._busy = False  # Поток сейчас пишет пачку
+        self._flush_requested = False
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+
+    def submit(self, write, key=None):
+        """Ставит запись в очередь; write вызывается без аргументов в фоновом потоке"""
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("WriteBehind закрыт")
+            if key is None:
+                self._ordered.append(write)
+            else:
+                self._keyed.pop(key, None)
+                self._keyed[key] = write
+            now = self.clock()
+            if self._first_at is None:
+                self._first_at = now
+            self._last_at = now
+            self._condition.notify_all()
+
+    def pending(self):
+        with self._condition:
+            return len(self._keyed) + len(self._ordered) + (1 if self._busy else 0)
+
+    def flush(self, timeout=None):
+        """Записывает все отложенное немедленно и ждет окончания; False - не успели за timeout"""
+        with self._condition:
+            self._flush_requested = True
+            self._condition.notify_all()
+            finished = self._condition.wait_for(
+                lambda: not (self._keyed or self._ordered or self._busy), timeout
+            )
+            self._flush_requested = False
+            return finished
+
+    def close(self, timeout=5.0):
+        """Дописывает очередь и останавливает поток (вызывается при выходе из игры)"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def _seconds_to_wait(self):
+        """Сколько еще ждать до записи пачки (0 - пора писать)"""
+        if self._flush_requested or self._closed:
+            return 0
+        now = self.clock()
+        return max(0.0, min(self._last_at + self.delay, self._first_at + self.max_delay) - now)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while True:
+                    if not (self._keyed or self._ordered):
+                        if self._closed:
+                            return
+                        self._condition.wait()
+                        continue
+                    wait = self._seconds_to_wait()
+                    if wait <= 0:
+                        break
+                    self._condition.wait(wait)  # Новые изменения отодвигают запись
+
+                batch = self._ordered + list(self._keyed.values())
+                self._ordered = []
+                self._keyed = {}
+                self._first_at = self._last_at = None
+                self._busy = True
+
+            for write in batch:
+                try:
+                    write()
+                except Exception as e:
+                    print(f"Ошибка фоновой записи: {e}")
+
+            with self._condition:
+                self._busy = False
+                self._condition.notify_all()
+
+
+class PeriodicFlusher:
+    """Фоновый поток, вызывающий flush раз в interval секунд (и сразу по wake)"""
+
+    def __init__(self, flush, interval, name="periodic-flush"):
+        self.flush = flush
+        self.interval = interval
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def wake(self):
+        """Просит сбросить данные, не дожидаясь конца интервала"""
+        self._wake.set()
+
+    def close(self, timeout=5.0):
+        """Останавливает поток; последний сброс делает владелец (в своем close)"""
+        self._closed = True
+        self._wake.set()
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._closed:
+                return
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Ошибка фонового сброса на диск: {e}")
@@ -0,0 +1,280 @@
+"""
+Скомпилированный банк вопросов - один бинарный файл вместо множества JSON.
+
+Формат (little-endian):
+    заголовок         HEADER: сигнатура, версия, число наборов, число вопросов
+    таблица наборов   SET_ENTRY на каждый набор: имя, первый вопрос, количество
+    таблица вопросов  QUESTION_ENTRY на каждый вопрос: смещение записи, длина,
+                      правильный ответ и сложность
+    блок строк        имена наборов и записи вопросов (UTF-8 с длиной впереди)
+
+Любой вопрос находится за O(1) по своему номеру, файл читается через mmap,
+а вопрос декодируется только в момент запроса.
+"""
+
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+from array import array
+from collections.abc import Sequence
+from pathlib import Path
+
+from core.persistence import write_atomic
+from core.question_manager import MANIFEST_FILE, list_question_files
+from core.question_validator import MAX_DIFFICULTY, MIN_DIFFICULTY, OPTIONS_PER_QUESTION, validate_file
+
+
+BANK_MAGIC = b"MQB1"
+BANK_VERSION = 1
+DEFAULT_BANK_PATH = "data/questions.mqb"
+
+HEADER = struct.Struct("<4sHxxII")  # сигнатура, версия, наборов, вопросов
+SET_ENTRY = struct.Struct("<IIII")  # смещение имени, длина имени, первый вопрос, количество
+QUESTION_ENTRY = struct.Struct("<IIbbxx")  # смещение записи, длина, ответ, сложность
+STRING_LENGTH = struct.Struct("<I")
+
+
+class BankFormatError(Exception):
+    """Файл не является банком вопросов поддерживаемой версии"""
+
+
+def _pack_string(text):
+    data = str(text).encode("utf-8")
+    return STRING_LENGTH.pack(len(data)) + data
+
+
+class BankWriter:
+    """
+    Потоковая запись банка: записи вопросов сразу уходят во временный файл,
+    в памяти остаются только компактные таблицы смещений.
+    """
+
+    def __init__(self, output_path):
+        self.output_path = Path(output_path)
+        self._records = tempfile.TemporaryFile()
+        self._records_size = 0
+        self._offsets = array('I')
+        self._lengths = array('I')
+        self._answers = array('b')
+        self._difficulties = array('b')
+        self._sets = []  # (имя, первый вопрос, количество)
+        self._set_start = None
+        self._set_name = None
+
+    def begin_set(self, name):
+        """Начинает новый набор вопросов"""
+        if self._set_name is not None:
+            self.end_set()
+        self._set_name = name
+        self._set_start = len(self._offsets)
+
+    def add_question(self, question):
+        """Добавляет вопрос в текущий набор (поля, не помещающиеся в таблицу банка, - ValueError)"""
+        answer = int(question["correct_answer"])
+        difficulty = int(question.get("difficulty", 0))
+        if not 0 <= answer < OPTIONS_PER_QUESTION:
+            raise ValueError(f"correct_answer вне диапазона: {answer}")
+        if not MIN_DIFFICULTY <= difficulty <= MAX_DIFFICULTY:
+            raise ValueError(f"difficulty вне диапазона: {difficulty}")
+        options = question["options"]
+        record = bytes([len(options)]) + _pack_string(question["question"])
+        record += b"".join(_pack_string(option) for option in options)
+
+        self._records.write(record)
+        self._offsets.append(self._records_size)
+        self._lengths.append(len(record))
+        self._answers.append(answer)
+        self._difficulties.append(difficulty)
+        self._records_size += len(record)
+
+    def end_set(self):
+        """Завершает текущий набор"""
+        if self._set_name is None:
+            return
+        self._sets.append((self._set_name, self._set_start, len(self._offsets) - self._set_start))
+        self._set_name = None
+
+    def close(self):
+        """Собирает итоговый файл и атомарно заменяет им старый банк"""
+        self.end_set()
+
+        names = [name.encode("utf-8") for name, _, _ in self._sets]
+        question_count = len(self._offsets)
+        names_start = HEADER.size + SET_ENTRY.size * len(self._sets) + QUESTION_ENTRY.size * question_count
+        records_start = names_start + sum(len(name) for name in names)
+
+        def write_bank(out):
+            out.write(HEADER.pack(BANK_MAGIC, BANK_VERSION, len(self._sets), question_count))
+
+            name_offset = names_start
+            for name, (_, first, count) in zip(names, self._sets):
+                out.write(SET_ENTRY.pack(name_offset, len(name), first, count))
+                name_offset += len(name)
+
+            for i in range(question_count):
+                out.write(QUESTION_ENTRY.pack(
+                    records_start + self._offsets[i], self._lengths[i],
+                    self._answers[i], self._difficulties[i]
+                ))
+
+            out.write(b"".join(names))
+            self._records.seek(0)
+            shutil.copyfileobj(self._records, out)
+
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            write_atomic(self.output_path, write_bank, "wb")
+        finally:
+            self._records.close()
+
+        return question_count
+
+    def discard(self):
+        """Удаляет временные записи, если банк так и не был собран (после close ничего не делает)"""
+        self._records.close()
+
+
+class BankQuestionSet(Sequence):
+    """Набор вопросов хранилища (банка или компактного): вопрос собирается при обращении по индексу"""
+
+    def __init__(self, bank, first, count):
+        self.bank = bank
+        self.first = first
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.count))]
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("индекс вопроса вне набора")
+        return self.bank.get_question(self.first + index)
+
+
+class QuestionBank:
+    """Банк вопросов, открытый через mmap только для чтения"""
+
+    def __init__(self, path=DEFAULT_BANK_PATH):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        try:
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise BankFormatError(f"Пустой файл банка: {self.path}")
+
+        magic, version, self.set_count, self.question_count = HEADER.unpack_from(self._data, 0)
+        if magic != BANK_MAGIC or version != BANK_VERSION:
+            self.close()
+            raise BankFormatError(f"Неподдерживаемый формат банка: {self.path}")
+
+        self._questions_start = HEADER.size + SET_ENTRY.size * self.set_count
+
+    def _set_entry(self, set_index):
+        if not 0 <= set_index < self.set_count:
+            raise IndexError("номер набора вне банка")
+        return SET_ENTRY.unpack_from(self._data, HEADER.size + SET_ENTRY.size * set_index)
+
+    def get_set_name(self, set_index):
+        """Возвращает имя набора"""
+        name_offset, name_length, _, _ = self._set_entry(set_index)
+        return self._data[name_offset:name_offset + name_length].decode("utf-8")
+
+    def get_set(self, set_index):
+        """Возвращает ленивое представление набора"""
+        _, _, first, count = self._set_entry(set_index)
+        return BankQuestionSet(self, first, count)
+
+    def get_question_info(self, question_id):
+        """Возвращает (правильный ответ, сложность) без декодирования строк"""
+        _, _, correct_answer, difficulty = self._question_entry(question_id)
+        return correct_answer, difficulty
+
+    def _question_entry(self, question_id):
+        if not 0 <= question_id < self.question_count:
+            raise IndexError("номер вопроса вне банка")
+        return QUESTION_ENTRY.unpack_from(self._data, self._questions_start + QUESTION_ENTRY.size * question_id)
+
+    def get_question(self, question_id):
+        """Декодирует вопрос в том же виде, что и в JSON-наборах"""
+        offset, _, correct_answer, difficulty = self._question_entry(question_id)
+        data = self._data
+
+        option_count = data[offset]
+        offset += 1
+        strings = []
+        for _ in range(option_count + 1):
+            (length,) = STRING_LENGTH.unpack_from(data, offset)
+            offset += STRING_LENGTH.size
+            strings.append(data[offset:offset + length].decode("utf-8"))
+            offset += length
+
+        return {
+            "question": strings[0],
+            "options": strings[1:],
+            "correct_answer": correct_answer,
+            "difficulty": difficulty
+        }
+
+    def close(self):
+        """Закрывает отображение и файл"""
+        if self._data is not None:
+            self._data.close()
+            self._data = None
+        self._file.close()
+
+
+def find_newer_sources(bank_path=DEFAULT_BANK_PATH, questions_dir="data/questions"):
+    """
+    Файлы наборов, измененные после сборки банка (пустой список - банк свежий).
+    Учитываются и сама папка (в ней добавили или удалили набор), и manifest.json.
+    """
+    bank_mtime = os.stat(bank_path).st_mtime_ns
+    questions_dir = Path(questions_dir)
+    candidates = [questions_dir, questions_dir / MANIFEST_FILE, *list_question_files(questions_dir)]
+    newer = []
+    for path in candidates:
+        try:
+            if os.stat(path).st_mtime_ns > bank_mtime:
+                newer.append(path)
+        except OSError:
+            continue  # Файла нет (например, manifest.json необязателен)
+    return newer
+
+
+def compile_bank(questions_dir="data/questions", output_path=DEFAULT_BANK_PATH):
+    """
+    Упаковывает все JSON-наборы папки в один банк и возвращает число вопросов.
+    Наборы проверяются до упаковки: набор с ошибками пропускается целиком.
+    """
+    writer = BankWriter(output_path)
+    try:
+        for file in list_question_files(questions_dir):
+            name, problems, questions = validate_file(file)
+            if problems:
+                print(f"  ❌ {name} пропущен: {'; '.join(problems)}")
+                continue
+
+            writer.begin_set(name)
+            for question in questions:
+                writer.add_question(question)
+            print(f"  ✓ {name} ({len(questions)} вопросов)")
+
+        return writer.close()
+    finally:
+        writer.discard()
+
+
+if __name__ == "__main__":
+    # python -m core.question_bank [папка_вопросов] [файл_банка]
+    source = sys.argv[1] if len(sys.argv) > 1 else "data/questions"
+    target = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_BANK_PATH
+    total = compile_bank(source, target)
+    print(f"Банк {target} собран: {total} вопросов")
@@ -0,0 +1,137 @@
+import json
+import re
+import zlib
+from array import array
+from pathlib import Path
+
+from core.persistence import write_atomic
+
+SIGNATURE_SIZE = 32  # Ячеек в MinHash-подписи
+BANDS = 8  # Полос LSH: вопросы с совпавшей полосой становятся кандидатами
+ROWS = SIGNATURE_SIZE // BANDS
+SHINGLE_SIZE = 4  # Длина символьного шингла
+DEFAULT_THRESHOLD = 0.6
+EMPTY_CELL = 0xFFFFFFFF
+
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+def normalize_text(text):
+    """Приводит текст к виду для сравнения: регистр, ё -> е, без пунктуации"""
+    text = str(text).casefold().replace("ё", "е")
+    return _NON_WORD.sub(" ", text).strip()
+
+
+def question_shingles(question):
+    """Символьные шинглы текста вопроса и вариантов (порядок вариантов не важен)"""
+    options = sorted(normalize_text(option) for option in question.get("options", []))
+    text = " | ".join([normalize_text(question.get("question", ""))] + options)
+    if len(text) <= SHINGLE_SIZE:
+        return {text}
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def minhash_signature(shingles):
+    """
+    MinHash с одной хеш-функцией: хеш шингла выбирает ячейку подписи,
+    в ячейке остается минимум. Пустые ячейки заполняются из соседних,
+    поэтому подпись строится за один проход по шинглам.
+    """
+    signature = array('I', [EMPTY_CELL]) * SIGNATURE_SIZE
+    for shingle in shingles:
+        value = zlib.crc32(shingle.encode("utf-8"))
+        cell = value % SIGNATURE_SIZE
+        value //= SIGNATURE_SIZE
+        if value < signature[cell]:
+            signature[cell] = value
+
+    filled = [i for i in range(SIGNATURE_SIZE) if signature[i] != EMPTY_CELL]
+    if filled:
+        for cell in range(SIGNATURE_SIZE):
+            if signature[cell] == EMPTY_CELL:
+                donor = min(filled, key=lambda i: (i - cell) % SIGNATURE_SIZE)
+                signature[cell] = (signature[donor] + (donor - cell) % SIGNATURE_SIZE) & 0xFFFFFFFF
+    return signature
+
+
+def signature_similarity(first, second):
+    """Оценка сходства Жаккара по доле совпавших ячеек"""
+    return sum(a == b for a, b in zip(first, second)) / SIGNATURE_SIZE
+
+
+class NearDuplicateIndex:
+    """
+    Индекс похожих вопросов на MinHash + LSH.
+    Каждый вопрос сравнивается только с кандидатами из общих корзин,
+    поэтому проверка всего банка идет примерно за линейное время,
+    а новый набор можно добавить к уже построенному индексу.
+    Ключ вопроса - (имя набора, номер вопроса с 1).
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        self.signatures = {}  # ключ -> подпись
+        self.buckets = [{} for _ in range(BANDS)]  # полоса -> {значения полосы: [ключи]}
+
+    def __len__(self):
+        return len(self.signatures)
+
+    def set_names(self):
+        """Имена наборов, уже попавших в индекс"""
+        return {set_name for set_name, _ in self.signatures}
+
+    def _bands(self, signature):
+        for band in range(BANDS):
+            yield band, tuple(signature[band * ROWS:(band + 1) * ROWS])
+
+    def add(self, key, question):
+        """Добавляет вопрос и возвращает [(ключ похожего вопроса, сходство)]"""
+        return self._add_signature(key, minhash_signature(question_shingles(question)))
+
+    def _add_signature(self, key, signature):
+        candidates = set()
+        for band, values in self._bands(signature):
+            bucket = self.buckets[band].setdefault(values, [])
+            candidates.update(bucket)
+            bucket.append(key)
+        self.signatures[key] = signature
+
+        duplicates = []
+        for other in candidates:
+            similarity = signature_similarity(signature, self.signatures[other])
+            if similarity >= self.threshold:
+                duplicates.append((other, similarity))
+        duplicates.sort(key=lambda item: -item[1])
+        return duplicates
+
+    def add_set(self, set_name, questions):
+        """Добавляет набор и возвращает [(ключ, ключ похожего вопроса, сходство)]"""
+        found = []
+        for number, question in enumerate(questions, 1):
+            key = (set_name, number)
+            for other, similarity in self.add(key, question):
+                found.append((key, other, similarity))
+        return found
+
+    def save(self, path):
+        """Сохраняет подписи, чтобы следующий запуск проверял только новые наборы"""
+        data = {
+            "threshold": self.threshold,
+            "entries": [[set_name, number, list(signature)]
+                        for (set_name, number), signature in self.signatures.items()]
+        }
+        write_atomic(path, lambda f: json.dump(data, f, ensure_ascii=False))
+
+    @classmethod
+    def load(cls, path, threshold=None):
+        """Загружает сохраненный индекс; корзины восстанавливаются по подписям"""
+        with open(Path(path), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        index = cls(threshold if threshold is not None else data.get("threshold", DEFAULT_THRESHOLD))
+        for set_name, number, signature in data.get("entries", []):
+            key = (set_name, number)
+            signature = array('I', signature)
+            index.signatures[key] = signature
+            for band, values in index._bands(signature):
+                index.buckets[band].setdefault(values, []).append(key)
+        return index
@@ -0,0 +1,149 @@
+"""
+Потоковый импорт больших выгрузок вопросов (CSV или JSONL).
+
+Записи читаются по одной и сразу уходят в наборы setN.json или в банк,
+в памяти держится не больше одного набора.
+"""
+
+import csv
+import json
+import re
+from pathlib import Path
+
+from core.persistence import write_atomic
+from core.question_bank import BankWriter
+from core.question_validator import OPTIONS_PER_QUESTION, normalize_question, validate_question
+
+SET_SIZE = 15  # Вопросов в одном наборе - по числу уровней лестницы
+CSV_OPTION_COLUMNS = [f"option{i}" for i in range(1, OPTIONS_PER_QUESTION + 1)]
+MAX_REPORTED_PROBLEMS = 20  # Сколько ошибок печатать, остальные только считаются
+
+
+def _csv_question(row):
+    """Строка CSV -> вопрос: question, option1..option4, correct_answer (с 0), difficulty"""
+    question = {
+        "question": row.get("question") or "",
+        "options": [row.get(column) or "" for column in CSV_OPTION_COLUMNS]
+    }
+    for field in ("correct_answer", "difficulty"):
+        value = (row.get(field) or "").strip()
+        if value:
+            question[field] = int(value) if value.lstrip("-").isdigit() else value
+    return question
+
+
+def iter_csv_questions(path):
+    """Потоково читает CSV с заголовком; выдает (номер строки, вопрос)"""
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            yield reader.line_num, _csv_question(row)
+
+
+def iter_jsonl_questions(path):
+    """Потоково читает JSONL (один вопрос на строку); выдает (номер строки, вопрос)"""
+    with open(path, "r", encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield number, json.loads(line)
+            except json.JSONDecodeError:
+                yield number, None
+
+
+def iter_dump_questions(path):
+    """Выбирает читатель по расширению файла"""
+    if Path(path).suffix.lower() == ".csv":
+        return iter_csv_questions(path)
+    return iter_jsonl_questions(path)
+
+
+class SetFileWriter:
+    """Пишет вопросы порциями в setN.json, продолжая нумерацию существующих наборов"""
+
+    def __init__(self, questions_dir, set_size=SET_SIZE, prefix="set"):
+        self.questions_dir = Path(questions_dir)
+        self.questions_dir.mkdir(parents=True, exist_ok=True)
+        self.set_size = set_size
+        self.prefix = prefix
+        self.pending = []
+        self.written = []  # Пути записанных наборов
+
+        pattern = re.compile(rf"^{re.escape(prefix)}(\d+)$")
+        numbers = [int(m.group(1)) for m in (pattern.match(f.stem) for f in self.questions_dir.glob("*.json")) if m]
+        self.next_number = max(numbers, default=0) + 1
+
+    def add_question(self, question):
+        self.pending.append(question)
+        if len(self.pending) >= self.set_size:
+            self.flush()
+
+    def flush(self):
+        """Записывает накопленную порцию отдельным набором (атомарно)"""
+        if not self.pending:
+            return
+        path = self.questions_dir / f"{self.prefix}{self.next_number}.json"
+        pending = self.pending
+        write_atomic(path, lambda f: json.dump(pending, f, indent=4, ensure_ascii=False))
+
+        self.written.append(path)
+        self.next_number += 1
+        self.pending = []
+
+    def close(self):
+        self.flush()
+        return len(self.written)
+
+
+class BankSetWriter:
+    """Пишет вопросы порциями по set_size в новые наборы скомпилированного банка"""
+
+    def __init__(self, bank_path, set_size=SET_SIZE, prefix="import"):
+        self.writer = BankWriter(bank_path)
+        self.set_size = set_size
+        self.prefix = prefix
+        self.in_set = 0
+        self.sets = 0
+
+    def add_question(self, question):
+        if self.in_set == 0:
+            self.sets += 1
+            self.writer.begin_set(f"{self.prefix}{self.sets}")
+        self.writer.add_question(question)
+        self.in_set = (self.in_set + 1) % self.set_size
+
+    def close(self):
+        self.writer.close()
+        return self.sets
+
+
+def import_questions(source, questions_dir=None, bank_path=None, set_size=SET_SIZE):
+    """
+    Импортирует выгрузку в папку наборов или в банк.
+    Некорректные записи пропускаются. Возвращает словарь со статистикой.
+    """
+    if not isinstance(set_size, int) or set_size < 1:
+        raise ValueError(f"Размер набора должен быть целым числом от 1, получено: {set_size}")
+    if bank_path:
+        writer = BankSetWriter(bank_path, set_size)
+    else:
+        writer = SetFileWriter(questions_dir or "data/questions", set_size)
+
+    imported = 0
+    skipped = 0
+    for line, question in iter_dump_questions(source):
+        problems = ["некорректная запись"] if question is None else validate_question(question)
+        if problems:
+            skipped += 1
+            if skipped <= MAX_REPORTED_PROBLEMS:
+                print(f"  ⚠ строка {line}: {'; '.join(problems)}")
+            continue
+        writer.add_question(normalize_question(question))
+        imported += 1
+
+    sets = writer.close()
+    if imported % set_size:
+        print(f"  ⚠ последний набор неполный: {imported % set_size} из {set_size} вопросов")
+    return {"imported": imported, "skipped": skipped, "sets": sets}
@@ -1,14 +1,118 @@
+import copy
 import json
+import re
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from collections.abc import Sequence
 from pathlib import Path
 
+MANIFEST_FILE = "manifest.json"  # Необязательный список наборов в папке вопросов
+REQUIRED_KEYS = frozenset(("question", "options", "correct_answer"))  # Без них вопрос показать нельзя
+DEFAULT_CACHE_SIZE = 8  # Сколько разобранных наборов держим в памяти в ленивом режиме
+
+
+def _natural_key(path):
+    """Ключ сортировки, при котором set2 идет раньше set10"""
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r"(\d+)", path.stem)]
+
+
+def list_question_files(questions_dir):
+    """Возвращает файлы наборов по порядку: из manifest.json или сканированием папки"""
+    questions_dir = Path(questions_dir)
+    manifest = questions_dir / MANIFEST_FILE
+    if manifest.exists():
+        try:
+            with open(manifest, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+            return [questions_dir / (e if isinstance(e, str) else e["file"]) for e in entries]
+        except Exception as e:
+            print(f"  ❌ Ошибка чтения {manifest.name}: {e}")
+            return []
+
+    return sorted(
+        (f for f in questions_dir.glob("*.json") if f.name != MANIFEST_FILE),
+        key=_natural_key
+    )
+
+
+class QuestionCursor:
+    """Позиция сессии в наборе вопросов; сам набор общий и не изменяется"""
+
+    __slots__ = ("questions", "position", "prefetched")
+
+    def __init__(self, questions=()):
+        self.questions = questions
+        self.position = 0
+        self.prefetched = None  # Заранее подготовленный следующий вопрос
+
+    def peek(self):
+        """Готовит следующий вопрос заранее, не сдвигая позицию"""
+        if self.prefetched is None and self.position < len(self.questions):
+            self.prefetched = self.questions[self.position]  # В банке вопрос декодируется здесь
+        return self.prefetched
+
+    def next(self):
+        """Возвращает следующий вопрос или None, если вопросы закончились"""
+        question = self.peek()
+        if question is not None:
+            self.prefetched = None
+            self.position += 1
+        return question
+
+    def has_more(self):
+        """Проверяет, остались ли вопросы"""
+        return self.position < len(self.questions)
+
+    def reset(self):
+        """Возвращается к первому вопросу набора"""
+        self.position = 0
+        self.prefetched = None
+
+
+class DeferredSet(Sequence):
+    """Вопросы набора, которые читаются только при первом обращении (восстановление без разбора файлов)"""
+
+    def __init__(self, manager, index):
+        self.manager = manager
+        self.index = index
+        self._questions = None
+
+    def _resolve(self):
+        if self._questions is None:
+            self._questions = self.manager.get_set_questions(self.index)
+        return self._questions
+
+    def __len__(self):
+        return len(self._resolve())
+
+    def __getitem__(self, index):
+        return self._resolve()[index]
+
 
 class QuestionManager:
-    def __init__(self, questions_dir="data/questions"):
+    def __init__(self, questions_dir="data/questions", lazy=False, cache_size=DEFAULT_CACHE_SIZE, bank_path=None,
+                 compact=False):
         self.questions_dir = Path(questions_dir)
-        self.question_sets = []  # Все наборы вопросов
+        self.lazy = lazy  # Ленивый режим: при старте читаем только метаданные наборов
+        self.cache_size = max(1, cache_size)
+        # Хранилище с доступом по номеру вопроса: QuestionBank или CompactQuestionStore
+        self.bank = None
+        self.question_sets = []  # Все наборы вопросов (в ленивом режиме - без 'questions')
+        self._set_cache = OrderedDict()  # LRU разобранных наборов: индекс -> вопросы
+        self._question_offsets = [0]  # Номер первого вопроса каждого набора в общей нумерации
+        self._pending_updates = {}  # Изменившиеся наборы, ждущие конца игры: индекс -> вопросы
+        self._warmed = {}  # Разобранные фоновым потоком warm_next_set: индекс -> (mtime файла, вопросы)
         self.current_set_index = 0  # Текущий набор (0 = set1)
-        self.current_questions = []  # Вопросы текущего набора
-        self.load_question_sets()
+        self.cursor = QuestionCursor()  # Позиция в текущем наборе
+        if bank_path:
+            self.open_bank(bank_path)
+        elif self.lazy:
+            self.scan_question_sets()
+        else:
+            self.load_question_sets()
+            if compact:
+                self.compact_question_sets()
 
     def load_question_sets(self):
         """Загружает наборы вопросов СТРОГО ПО ПОРЯДКУ: set1.json -> set7.json"""
@@ -30,10 +134,13 @@ class QuestionManager:
                         questions = json.load(f)
                         # Проверяем, что вопросы не пустые
                         if questions and len(questions) > 0:
+                            stat = file.stat()
                             self.question_sets.append({
                                 'name': file.stem,
-                                'questions': questions,
-                                'file_path': file
+                                'questions': tuple(questions),
+                                'file_path': file,
+                                'size': stat.st_size,
+                                'mtime': stat.st_mtime_ns
                             })
                             print(f"  ✓ {file.stem} ({len(questions)} вопросов)")
                         else:
@@ -46,7 +153,103 @@ class QuestionManager:
 
         # Загружаем первый набор
         if self.question_sets:
-            self.current_questions = self.question_sets[0]['questions'].copy()
+            self._start_set(0)
+
+    def scan_question_sets(self):
+        """Собирает только метаданные наборов: из manifest.json или сканированием папки"""
+        for file in list_question_files(self.questions_dir):
+            try:
+                stat = file.stat()
+            except OSError:
+                print(f"  ❌ {file.name} - файл не найден")
+                continue
+            self.question_sets.append({
+                'name': file.stem,
+                'file_path': file,
+                'size': stat.st_size,
+                'mtime': stat.st_mtime_ns
+            })
+
+        print(f"  ✓ Найдено наборов: {len(self.question_sets)} (загрузка по требованию)")
+
+        if self.question_sets:
+            self.reset_to_first_set()  # Пустые и испорченные наборы в начале пропускаются
+
+    def compact_question_sets(self):
+        """Переносит загруженные наборы в компактное хранилище с общими строками"""
+        from core.compact_store import CompactQuestionStore
+
+        store = CompactQuestionStore()
+        for question_set in self.question_sets:
+            question_set['bank_index'] = store.add_set(question_set['name'], question_set.pop('questions'))
+        self.bank = store
+
+        if self.question_sets:
+            self._start_set(self.current_set_index)
+
+    def open_bank(self, bank_path):
+        """Открывает скомпилированный банк: вопросы декодируются только при выдаче"""
+        from core.question_bank import QuestionBank
+
+        self.bank = QuestionBank(bank_path)
+        for index in range(self.bank.set_count):
+            self.question_sets.append({
+                'name': self.bank.get_set_name(index),
+                'bank_index': index
+            })
+
+        print(f"  ✓ Банк {self.bank.path.name}: {len(self.question_sets)} наборов, "
+              f"{self.bank.question_count} вопросов")
+
+        if self.question_sets:
+            self._start_set(0)
+
+    def _get_set_questions(self, index):
+        """Возвращает вопросы набора, при необходимости разбирая файл (LRU-кэш)"""
+        question_set = self.question_sets[index]
+        if 'questions' in question_set:
+            return question_set['questions']
+        if 'bank_index' in question_set:
+            return self.bank.get_set(question_set['bank_index'])
+
+        if index in self._set_cache:
+            self._set_cache.move_to_end(index)
+            return self._set_cache[index]
+
+        warmed = self._warmed.pop(index, None)
+        if warmed is not None and warmed[0] == question_set.get('mtime'):
+            questions = warmed[1]  # Уже разобран в фоне, и файл с тех пор не менялся
+        else:
+            questions = self._read_set_file(question_set['file_path'])
+
+        question_set['count'] = len(questions)  # Размер помним и после вытеснения из кэша
+        self._set_cache[index] = questions
+        if len(self._set_cache) > self.cache_size:
+            self._set_cache.popitem(last=False)
+        return questions
+
+    @staticmethod
+    def _parse_set_file(file):
+        """Читает и проверяет файл набора; при ошибке бросает исключение"""
+        with open(file, "r", encoding="utf-8") as f:
+            data = json.load(f) or []
+        if not isinstance(data, list) or not all(isinstance(q, dict) and REQUIRED_KEYS <= q.keys() for q in data):
+            raise ValueError("ожидается список вопросов с полями " + ", ".join(sorted(REQUIRED_KEYS)))
+        return tuple(data)
+
+    @staticmethod
+    def _read_set_file(file):
+        """Разбирает файл набора (можно вызывать из фонового потока)"""
+        questions = ()
+        try:
+            questions = QuestionManager._parse_set_file(file)
+            if questions:
+                print(f"  ✓ {file.stem} ({len(questions)} вопросов)")
+            else:
+                print(f"  ⚠ {file.stem} - пустой файл, набор пропускается")
+        except Exception as e:
+            print(f"  ❌ Ошибка загрузки {file.name}: {e} - набор пропускается")
+        return questions
 
     def get_current_set_name(self):
         """Возвращает название текущего набора"""
@@ -54,42 +257,220 @@ class QuestionManager:
             return self.question_sets[self.current_set_index]['name']
         return None
 
+    def fork(self):
+        """Создает менеджер для другой сессии: наборы общие, позиция своя"""
+        session = copy.copy(self)
+        session.reset_to_first_set()
+        return session
+
+    def _start_set(self, index):
+        """Делает набор текущим и встает на его первый вопрос"""
+        self.cursor = QuestionCursor(self._get_set_questions(index))
+
     def get_question(self):
         """Возвращает следующий вопрос из текущего набора"""
-        if not self.current_questions:
-            return None    # Если вопросы закончились, возвращаем None
-        return self.current_questions.pop(0)  # Берем первый вопрос
+        if not self.has_more_questions():
+            return None  # Вопросы закончились
+        return self.cursor.next()
 
     def has_more_questions(self):
-        """Проверяет, есть ли еще вопросы в текущем наборе"""
-        return len(self.current_questions) > 0
-
-    def load_next_set(self):
-        """Загружает следующий набор вопросов и возвращает True если успешно"""
-        if self.current_set_index < len(self.question_sets) - 1:
-            self.current_set_index += 1
-            self.current_questions = self.question_sets[self.current_set_index]['questions'].copy()
+        """Проверяет, есть ли еще вопросы в текущем наборе (пустой набор пропускается)"""
+        if self.cursor.has_more():
             return True
+        if self.cursor.position == 0 and self.question_sets and self.load_next_set():
+            return self.cursor.has_more()  # Текущий набор оказался пустым - перешли к следующему
         return False
 
+    def prefetch_next_question(self):
+        """Заранее готовит следующий вопрос текущего набора"""
+        return self.cursor.peek()
+
+    def warm_next_set(self):
+        """
+        Заранее разбирает следующий набор в фоновом потоке, чтобы переход к нему
+        был мгновенным. Поток только читает файл; готовые вопросы забирает
+        _get_set_questions в потоке интерфейса.
+        """
+        next_index = self.current_set_index + 1
+        if next_index >= len(self.question_sets):
+            return None
+        question_set = self.question_sets[next_index]
+        if 'file_path' not in question_set or 'questions' in question_set or 'bank_index' in question_set:
+            return None  # Набор уже в памяти или в банке - разбирать нечего
+        if next_index in self._set_cache or next_index in self._warmed:
+            return None
+
+        mtime, file = question_set.get('mtime'), question_set['file_path']
+
+        def warm():
+            self._warmed[next_index] = (mtime, self._read_set_file(file))
+
+        thread = threading.Thread(target=warm, name="warm-next-set", daemon=True)
+        thread.start()
+        return thread
+
+    def _is_playable(self, index):
+        """
+        Есть ли в наборе вопросы. В ленивом режиме пустые и испорченные файлы
+        видны только после разбора: такой набор помечается count=0 и пропускается.
+        """
+        count = self.question_sets[index].get('count')
+        if count is None:
+            count = len(self._get_set_questions(index))
+        return count > 0
+
+    def _next_playable_set(self, start):
+        """Номер первого непустого набора начиная с start (None - таких нет)"""
+        for index in range(start, len(self.question_sets)):
+            if self._is_playable(index):
+                return index
+        return None
+
+    def load_next_set(self):
+        """Загружает следующий непустой набор вопросов и возвращает True если успешно"""
+        index = self._next_playable_set(self.current_set_index + 1)
+        if index is None:
+            return False
+        self.current_set_index = index
+        self._start_set(index)
+        return True
+
     def reset_to_first_set(self):
-        """Сбрасывает к первому набору (полный сброс)"""
-        self.current_set_index = 0
+        """Сбрасывает к первому непустому набору (полный сброс)"""
         if self.question_sets:
-            self.current_questions = self.question_sets[0]['questions'].copy()
+            index = self._next_playable_set(0)
+            self.current_set_index = 0 if index is None else index
+            self._start_set(self.current_set_index)
+        else:
+            self.current_set_index = 0
 
     def reset_current_set(self):
         """Сбрасывает текущий набор вопросов (для переигрывания)"""
         if self.question_sets and self.current_set_index < len(self.question_sets):
-            self.current_questions = self.question_sets[self.current_set_index]['questions'].copy()
+            self.cursor.reset()  # Набор уже привязан к курсору - O(1)
+
+    def _get_set_offset(self, index):
+        """Номер первого вопроса набора в общей нумерации (считается по мере надобности)"""
+        offsets = self._question_offsets
+        while len(offsets) <= index:
+            set_index = len(offsets) - 1
+            count = self.question_sets[set_index].get('count')
+            if count is None:
+                count = len(self._get_set_questions(set_index))
+            offsets.append(offsets[-1] + count)
+        return offsets[index]
+
+    def check_for_updates(self):
+        """
+        Дешево опрашивает размер и время изменения файлов наборов.
+        Изменившиеся наборы разбираются заново и откладываются до
+        apply_pending_updates(), текущая игра их не видит.
+        Возвращает имена изменившихся наборов.
+        """
+        changed = []
+        for index, question_set in enumerate(self.question_sets):
+            if 'mtime' not in question_set or 'bank_index' in question_set:
+                continue  # Банк и компактное хранилище не перечитываются
+
+            file = question_set['file_path']
+            try:
+                stat = file.stat()
+            except OSError:
+                continue  # Файл временно недоступен (например, перезаписывается)
+
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if signature == (question_set['mtime'], question_set['size']):
+                continue
+            question_set['mtime'], question_set['size'] = signature
+
+            try:
+                questions = self._parse_set_file(file)
+            except Exception as e:
+                print(f"  ❌ Ошибка перезагрузки {file.name}: {e}")
+                continue  # Оставляем прежнюю версию, повторим после следующей записи файла
+
+            if not questions:
+                print(f"  ⚠ {file.stem} - пустой файл, оставляем прежнюю версию")
+                continue
+
+            self._pending_updates[index] = questions
+            changed.append(question_set['name'])
+            print(f"  ↻ {file.stem} изменен ({len(questions)} вопросов)")
+        return changed
+
+    def apply_pending_updates(self):
+        """Подменяет изменившиеся наборы новыми версиями (вызывается между играми)"""
+        if not self._pending_updates:
+            return False
+
+        updates, self._pending_updates = self._pending_updates, {}
+        for index, questions in updates.items():
+            self._warmed.pop(index, None)  # Разобранная заранее версия устарела
+            question_set = self.question_sets[index]
+            if 'questions' in question_set:
+                question_set['questions'] = questions
+            else:
+                question_set['count'] = len(questions)
+                self._set_cache[index] = questions
+                self._set_cache.move_to_end(index)
+                if len(self._set_cache) > self.cache_size:
+                    self._set_cache.popitem(last=False)
+
+        # Размеры наборов могли измениться - общая нумерация считается заново
+        self._question_offsets = [0]
+        if self.current_set_index in updates:
+            self._start_set(self.current_set_index)
+        return True
+
+    def get_set_questions(self, index):
+        """Возвращает вопросы набора только для чтения (разбирает файл при необходимости)"""
+        return self._get_set_questions(index)
+
+    def get_question_offsets(self):
+        """Номера первых вопросов наборов в общей нумерации (последний элемент - всего вопросов)"""
+        self._get_set_offset(len(self.question_sets))
+        return self._question_offsets
+
+    def get_question_count(self):
+        """Возвращает общее количество вопросов во всех наборах"""
+        return self.get_question_offsets()[-1]
+
+    def get_question_by_id(self, question_id):
+        """Возвращает вопрос по номеру в общей нумерации"""
+        if self.bank is not None:
+            return self.bank.get_question(question_id)
+        offsets = self.get_question_offsets()
+        set_index = bisect_right(offsets, question_id) - 1
+        return self._get_set_questions(set_index)[question_id - offsets[set_index]]
+
+    def get_question_difficulty(self, question_id):
+        """Возвращает сложность вопроса (в банке - без декодирования строк)"""
+        if self.bank is not None:
+            return self.bank.get_question_info(question_id)[1]
+        return self.get_question_by_id(question_id).get("difficulty", 0)
+
+    def get_current_question_id(self):
+        """Номер последнего выданного вопроса текущего набора в общей нумерации"""
+        if self.cursor.position == 0:
+            return None
+        return self._get_set_offset(self.current_set_index) + self.cursor.position - 1
+
+    def restore_position(self, set_index, position):
+        """Делает набор текущим и встает на позицию в нем (восстановление после сбоя)"""
+        if not 0 <= set_index < len(self.question_sets):
+            return False
+        self.current_set_index = set_index
+        self.cursor = QuestionCursor(DeferredSet(self, set_index))
+        self.cursor.position = position
+        return True
 
     def get_total_sets(self):
         """Возвращает общее количество наборов вопросов"""
         return len(self.question_sets)
 
     def is_last_set(self):
-        """Проверяет, является ли текущий набор последним"""
-        return self.current_set_index >= len(self.question_sets) - 1
+        """Проверяет, является ли текущий набор последним (пустые наборы после него не считаются)"""
+        return self._next_playable_set(self.current_set_index + 1) is None
 
     def get_current_set_number(self):
         """Возвращает номер текущего набора (начиная с 1)"""
@@ -0,0 +1,131 @@
+import random
+from array import array
+
+# Уровни лестницы -> сложность вопросов (несгораемые суммы делят лестницу на три части)
+LEVEL_DIFFICULTY_BANDS = (
+    (range(1, 6), 1),
+    (range(6, 11), 2),
+    (range(11, 16), 3)
+)
+
+
+def difficulty_for_level(level):
+    """Возвращает сложность вопроса для уровня лестницы"""
+    for levels, difficulty in LEVEL_DIFFICULTY_BANDS:
+        if level in levels:
+            return difficulty
+    return LEVEL_DIFFICULTY_BANDS[-1][1]
+
+
+class QuestionPool:
+    """
+    Случайная выдача вопросов из общего пула с учетом сложности.
+    Для каждой сложности хранится массив номеров вопросов: невыданные лежат
+    в начале массива, поэтому каждая выдача - это O(1) обмен элементов.
+    Место каждого вопроса в его массиве хранится в positions, поэтому и
+    возврат невыданного вопроса - такой же O(1) обмен, без поиска.
+    Выданные вопросы отмечаются в битовом поле и не повторяются, пока
+    не закончится вся группа сложности.
+    """
+
+    def __init__(self, question_manager, rng=None):
+        self.question_manager = question_manager
+        self.rng = rng or random.Random()
+        self.question_count = question_manager.get_question_count()
+        self.served = bytearray((self.question_count + 7) // 8)  # Бит на вопрос
+        self.bands = {}  # сложность -> array('I') номеров вопросов
+        self.remaining = {}  # сложность -> сколько вопросов еще не выдано
+        self.positions = array('I', bytes(4 * self.question_count))  # номер вопроса -> место в своем массиве
+
+        for question_id in range(self.question_count):
+            difficulty = question_manager.get_question_difficulty(question_id)
+            band = self.bands.setdefault(difficulty, array('I'))
+            self.positions[question_id] = len(band)
+            band.append(question_id)
+
+        for difficulty, band in self.bands.items():
+            self.remaining[difficulty] = len(band)
+
+    def is_served(self, question_id):
+        """Проверяет, выдавался ли вопрос"""
+        return bool(self.served[question_id >> 3] & (1 << (question_id & 7)))
+
+    def _nearest_band(self, difficulty):
+        """Ближайшая по сложности непустая группа"""
+        if difficulty in self.bands:
+            return difficulty
+        if not self.bands:
+            return None
+        return min(self.bands, key=lambda d: (abs(d - difficulty), d))
+
+    def _swap(self, band, first, second):
+        """Меняет местами два вопроса массива группы и обновляет их места"""
+        band[first], band[second] = band[second], band[first]
+        self.positions[band[first]] = first
+        self.positions[band[second]] = second
+
+    def _refill(self, difficulty):
+        """Все вопросы группы выданы - начинаем ее заново"""
+        for question_id in self.bands[difficulty]:
+            self.served[question_id >> 3] &= ~(1 << (question_id & 7)) & 0xFF
+        self.remaining[difficulty] = len(self.bands[difficulty])
+
+    def draw(self, difficulty):
+        """Выдает номер случайного невыданного вопроса нужной сложности"""
+        difficulty = self._nearest_band(difficulty)
+        if difficulty is None:
+            return None
+
+        if self.remaining[difficulty] == 0:
+            self._refill(difficulty)
+
+        band = self.bands[difficulty]
+        last = self.remaining[difficulty] - 1
+        pick = self.rng.randint(0, last)
+        question_id = band[pick]
+        self._swap(band, pick, last)
+        self.remaining[difficulty] = last
+
+        self.served[question_id >> 3] |= 1 << (question_id & 7)
+        return question_id
+
+    def return_question(self, question_id):
+        """Возвращает выданный, но так и не показанный вопрос обратно в пул"""
+        if not self.is_served(question_id):
+            return  # Группа уже начата заново
+        difficulty = self.question_manager.get_question_difficulty(question_id)
+        first_served = self.remaining[difficulty]
+        self._swap(self.bands[difficulty], self.positions[question_id], first_served)
+        self.remaining[difficulty] = first_served + 1
+        self.served[question_id >> 3] &= ~(1 << (question_id & 7)) & 0xFF
+
+    def draw_for_level(self, level):
+        """Выдает номер вопроса для уровня лестницы"""
+        return self.draw(difficulty_for_level(level))
+
+    def record_answer(self, question_id, is_correct):
+        """Случайная выдача не зависит от ответов (нужно для совместимости с AdaptiveQuestionSampler)"""
+
+    def draw_ladder(self, levels=15):
+        """Выдает номера вопросов на всю лестницу"""
+        return [self.draw_for_level(level) for level in range(1, levels + 1)]
+
+    def get_served_state(self):
+        """Возвращает битовое поле выданных вопросов (для сохранения)"""
+        return bytes(self.served)
+
+    def load_served_state(self, data):
+        """Восстанавливает выданные вопросы из битового поля"""
+        if len(data) != len(self.served):
+            print("Состояние пула не подходит к текущему банку вопросов - пропускаем")
+            return False
+
+        self.served = bytearray(data)
+        for difficulty, band in self.bands.items():
+            fresh = [q for q in band if not self.is_served(q)]
+            used = [q for q in band if self.is_served(q)]
+            band = self.bands[difficulty] = array('I', fresh + used)
+            for position, question_id in enumerate(band):
+                self.positions[question_id] = position
+            self.remaining[difficulty] = len(fresh)
+        return True
@@ -0,0 +1,199 @@
+import heapq
+import math
+import os
+import pickle
+from collections import Counter
+from pathlib import Path
+
+from core.persistence import write_atomic
+from core.question_dedup import normalize_text
+
+QUESTION_WEIGHT = 2  # Совпадение в тексте вопроса важнее совпадения в варианте ответа
+OPTION_WEIGHT = 1
+
+DEFAULT_INDEX_PATH = "data/search_index.pickle"
+INDEX_VERSION = 1
+
+
+def tokenize(text):
+    """Разбивает текст на нормализованные слова (регистр и ё/е не различаются)"""
+    return normalize_text(text).split()
+
+
+class QuestionSearchIndex:
+    """
+    Обратный индекс по текстам вопросов и вариантов ответов.
+    Результаты ранжируются по TF-IDF, а при изменении набора
+    переиндексируется только он.
+    Ключ вопроса - (имя набора, номер вопроса с 1).
+
+    Индекс хранится на диске вместе с отпечатками наборов (время изменения
+    и размер файла): load_or_build читает его и переиндексирует только
+    наборы, изменившиеся с прошлого раза, поэтому поиск не разбирает
+    заново все наборы.
+    """
+
+    def __init__(self):
+        self.postings = {}  # слово -> {ключ: вес}
+        self.documents = {}  # ключ -> {слово: вес} (нужно для удаления; None - еще не восстановлен после load)
+        self.set_keys = {}  # имя набора -> [ключи]
+        self.questions = {}  # ключ -> текст вопроса
+        self.signatures = {}  # имя набора -> отпечаток версии, по которой он проиндексирован
+
+    def __len__(self):
+        return len(self.questions)
+
+    @classmethod
+    def from_manager(cls, question_manager):
+        """Строит индекс по всем наборам QuestionManager"""
+        index = cls()
+        index.sync(question_manager)
+        return index
+
+    @classmethod
+    def load_or_build(cls, question_manager, path=DEFAULT_INDEX_PATH):
+        """Читает индекс с диска, переиндексирует изменившиеся наборы и сохраняет, если было что менять"""
+        index = cls.load(path) or cls()
+        if index.sync(question_manager):
+            try:
+                index.save(path)
+            except OSError as e:
+                print(f"Ошибка сохранения поискового индекса: {e}")
+        return index
+
+    @staticmethod
+    def set_signature(question_manager, question_set):
+        """Отпечаток версии набора: меняется, когда меняется файл набора или банк"""
+        if 'bank_index' in question_set:
+            bank_path = getattr(question_manager.bank, "path", None)
+            if bank_path is None:
+                return None  # Компактное хранилище в памяти - отпечатка нет
+            stat = os.stat(bank_path)
+            return ("bank", str(bank_path), stat.st_mtime_ns, stat.st_size, question_set['bank_index'])
+        stat = os.stat(question_set['file_path'])
+        return ("file", stat.st_mtime_ns, stat.st_size)
+
+    def sync(self, question_manager):
+        """Приводит индекс к наборам QuestionManager; возвращает, изменилось ли что-нибудь"""
+        changed = False
+        names = set()
+        for set_index, question_set in enumerate(question_manager.question_sets):
+            name = question_set['name']
+            names.add(name)
+            try:
+                signature = self.set_signature(question_manager, question_set)
+            except OSError:
+                signature = None
+            if signature is not None and self.signatures.get(name) == signature:
+                continue
+            self.update_set(name, question_manager.get_set_questions(set_index))
+            self.signatures[name] = signature
+            changed = True
+
+        for name in set(self.set_keys) - names:
+            self.remove_set(name)  # Набор удален
+            changed = True
+        return changed
+
+    @classmethod
+    def load(cls, path=DEFAULT_INDEX_PATH):
+        """Читает индекс с диска (None - файла нет или он другой версии)"""
+        try:
+            with open(path, "rb") as f:
+                data = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError) as e:
+            print(f"Поисковый индекс не прочитан ({e}) - строим заново")
+            return None
+        if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+            return None
+
+        index = cls()
+        index.postings = data["postings"]
+        index.documents = None  # Не сохраняется: восстанавливается из postings, только если что-то удаляют
+        index.set_keys = data["set_keys"]
+        index.questions = data["questions"]
+        index.signatures = data["signatures"]
+        return index
+
+    def save(self, path=DEFAULT_INDEX_PATH):
+        """Сохраняет индекс через временный файл"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": INDEX_VERSION,
+            "postings": self.postings,
+            "set_keys": self.set_keys,
+            "questions": self.questions,
+            "signatures": self.signatures
+        }
+        write_atomic(path, lambda f: pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL), "wb")
+
+    def _add(self, key, question):
+        terms = Counter()
+        for token in tokenize(question.get("question", "")):
+            terms[token] += QUESTION_WEIGHT
+        for option in question.get("options", []):
+            for token in tokenize(option):
+                terms[token] += OPTION_WEIGHT
+
+        self._ensure_documents()
+        self.documents[key] = terms
+        self.questions[key] = question.get("question", "")
+        for token, weight in terms.items():
+            self.postings.setdefault(token, {})[key] = weight
+
+    def _ensure_documents(self):
+        """Восстанавливает documents обращением postings (после load, перед первым удалением)"""
+        if self.documents is None:
+            documents = {}
+            for token, posting in self.postings.items():
+                for key, weight in posting.items():
+                    documents.setdefault(key, {})[token] = weight
+            self.documents = documents
+
+    def _remove(self, key):
+        self._ensure_documents()
+        for token in self.documents.pop(key, ()):
+            posting = self.postings.get(token)
+            if posting is not None:
+                posting.pop(key, None)
+                if not posting:
+                    del self.postings[token]
+        self.questions.pop(key, None)
+
+    def remove_set(self, set_name):
+        """Убирает набор из индекса"""
+        for key in self.set_keys.pop(set_name, ()):
+            self._remove(key)
+        self.signatures.pop(set_name, None)
+
+    def update_set(self, set_name, questions):
+        """Переиндексирует один набор (после добавления или изменения файла)"""
+        self.remove_set(set_name)
+        keys = []
+        for number, question in enumerate(questions, 1):
+            key = (set_name, number)
+            self._add(key, question)
+            keys.append(key)
+        self.set_keys[set_name] = keys
+
+    def search(self, query, limit=20):
+        """Возвращает [(ключ, текст вопроса, оценка)] по убыванию релевантности"""
+        tokens = set(tokenize(query))
+        if not tokens:
+            return []
+
+        total = len(self.questions)
+        scores = Counter()
+        for token in tokens:
+            posting = self.postings.get(token)
+            if not posting:
+                continue
+            idf = math.log(1 + total / len(posting))
+            for key, weight in posting.items():
+                scores[key] += weight * idf
+
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return [(key, self.questions[key], score) for key, score in best]
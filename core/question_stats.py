@@ -0,0 +1,192 @@
+"""
+Статистика ответов по каждому вопросу в файле, отображенном в память (NumPy memmap).
+
+Запись массива - ключ вопроса и его счетчики: сколько раз вопрос показан,
+сколько раз на него ответили верно и сколько раз выбран каждый вариант.
+Ключ - 64-битный хеш текста вопроса и вариантов (question_key), а не
+номер в общей нумерации: номер сдвигается при добавлении и перестановке
+наборов, переключении между JSON и банком и горячей перезагрузке, а ключ
+остается за тем же вопросом. Счетчики увеличиваются на месте без
+перезаписи файла, а на диск их сбрасывает фоновый поток - раз в
+flush_interval секунд или раньше, если накопилось flush_every изменений;
+ответ игрока сам msync не ждет. Файл - обычный .npy, его можно открыть
+np.load(path, mmap_mode="r").
+"""
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from core.persistence import PeriodicFlusher
+
+DEFAULT_STATS_PATH = "data/question_stats.npy"
+
+# Столбцы счетчиков
+SHOWN = 0
+CORRECT = 1
+FIRST_OPTION = 2
+OPTIONS_COUNT = 4
+COLUMNS = FIRST_OPTION + OPTIONS_COUNT
+
+RECORD_DTYPE = np.dtype([("key", "<u8"), ("counts", "<u4", (COLUMNS,))])
+EMPTY_KEY = 0  # Свободная запись
+
+INITIAL_ROWS = 1024  # Файл растет удвоением, когда свободные записи кончаются
+
+
+def question_key(question):
+    """Постоянный ключ вопроса: хеш текста и вариантов (не зависит от места в наборах)"""
+    text = "\x1f".join([question["question"], *question["options"]])
+    key = int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+    return key or 1  # 0 означает свободную запись
+
+
+class QuestionStats:
+    """Счетчики показов и ответов по вопросам"""
+
+    def __init__(self, path=DEFAULT_STATS_PATH, flush_every=64, flush_interval=5.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        # Счетчики изменений: _changes растит только поток интерфейса, _flushed - flush под блокировкой
+        self._changes = 0
+        self._flushed = 0
+        self._lock = threading.Lock()  # Фоновый сброс не должен попасть на подмену файла
+
+        self._memmap = None
+        self.records = None  # Обычный ndarray поверх того же отображения - без накладных расходов memmap
+        self.counts = None  # Столбец счетчиков (представление records)
+        self._rows = {}  # ключ вопроса -> номер записи
+        self._last_question = None  # Последний вопрос и его запись: показ и ответ хешируются один раз
+        self._last_row = None
+        if self.path.exists():
+            try:
+                self._open()
+                if self.records is None:
+                    print(f"Файл статистики {self.path} другого формата - начинаем заново")
+            except (OSError, ValueError) as e:
+                print(f"Ошибка чтения статистики вопросов: {e}")
+                self._release()
+        if self.records is None:
+            self._create(INITIAL_ROWS)
+        self._flusher = PeriodicFlusher(self.flush, flush_interval, name="question-stats-flush")
+
+    def _open(self):
+        records = np.lib.format.open_memmap(self.path, mode="r+")
+        if records.ndim != 1 or records.dtype != RECORD_DTYPE:
+            return
+        self._memmap = records
+        self.records = records.view(np.ndarray)
+        self.counts = self.records["counts"]
+        keys = self.records["key"]
+        self._rows = {int(key): row for row, key in enumerate(keys.tolist()) if key != EMPTY_KEY}
+
+    def _release(self):
+        """Закрывает отображение файла (на Windows иначе файл нельзя подменить)"""
+        self._memmap = None
+        self.records = None
+        self.counts = None
+        self._last_question = self._last_row = None
+
+    def _create(self, rows):
+        """
+        Создает файл нужного размера (с копией прежних записей) и подменяет им прежний.
+        Перед подменой оба отображения закрываются, после - файл открывается заново.
+        """
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        records = np.lib.format.open_memmap(temp_path, mode="w+", dtype=RECORD_DTYPE, shape=(rows,))
+        if self.records is not None:
+            records[:len(self.records)] = self.records
+        records.flush()
+        del records
+        self._release()
+        try:
+            os.replace(temp_path, self.path)
+        finally:
+            if temp_path.exists():
+                temp_path.unlink()
+            self._open()
+
+    def _row_for(self, question):
+        """Номер записи вопроса (новая запись - при первом появлении); None - файл не вырос"""
+        if question is self._last_question:
+            return self._last_row
+        key = question_key(question)
+        row = self._rows.get(key)
+        if row is None:
+            row = len(self._rows)
+            if row >= len(self.records):
+                try:
+                    self.flush()
+                    with self._lock:
+                        self._create(len(self.records) * 2)
+                except OSError as e:
+                    print(f"Ошибка увеличения файла статистики: {e}")
+                    if self.records is None:
+                        self._create_fallback()
+                    return None
+            self.records["key"][row] = key
+            self._rows[key] = row
+        self._last_question, self._last_row = question, row
+        return row
+
+    def _create_fallback(self):
+        """Файл не удалось открыть заново - дальше считаем в памяти, чтобы игра не падала"""
+        self.records = np.zeros(INITIAL_ROWS, dtype=RECORD_DTYPE)
+        self.counts = self.records["counts"]
+        self._rows = {}
+
+    def record_shown(self, question):
+        """Вопрос показан игроку"""
+        row = self._row_for(question)
+        if row is None:
+            return
+        self.counts[row, SHOWN] += 1
+        self._changed()
+
+    def record_answer(self, question, answer_index, is_correct):
+        """Игрок выбрал вариант answer_index"""
+        row = self._row_for(question)
+        if row is None:
+            return
+        counts = self.counts
+        if is_correct:
+            counts[row, CORRECT] += 1
+        if 0 <= answer_index < OPTIONS_COUNT:
+            counts[row, FIRST_OPTION + answer_index] += 1
+        self._changed()
+
+    def _changed(self):
+        self._changes += 1
+        if self._changes - self._flushed >= self.flush_every:
+            self._flusher.wake()  # Сбросит фоновый поток, ответ игрока не ждет
+
+    def get_question_stats(self, question):
+        """Счетчики вопроса: {'shown', 'correct', 'options': [по вариантам]}"""
+        row_index = self._rows.get(question_key(question))
+        if row_index is None:
+            return {"shown": 0, "correct": 0, "options": [0] * OPTIONS_COUNT}
+        row = self.counts[row_index]
+        return {
+            "shown": int(row[SHOWN]),
+            "correct": int(row[CORRECT]),
+            "options": [int(value) for value in row[FIRST_OPTION:]]
+        }
+
+    def flush(self):
+        """Сбрасывает измененные страницы на диск (вызывается и из фонового потока)"""
+        with self._lock:
+            changes = self._changes
+            if changes != self._flushed and self._memmap is not None:
+                self._memmap.flush()
+                self._flushed = changes
+
+    def close(self):
+        self._flusher.close()
+        self.flush()
+        with self._lock:
+            self._release()
@@ -0,0 +1,78 @@
+import json
+from pathlib import Path
+
+OPTIONS_PER_QUESTION = 4
+# В банке вопросов (core.question_bank) сложность хранится одним байтом со знаком
+MIN_DIFFICULTY = 0
+MAX_DIFFICULTY = 127
+
+
+def validate_question(question):
+    """Проверяет один вопрос и возвращает список найденных проблем"""
+    if not isinstance(question, dict):
+        return ["вопрос должен быть объектом"]
+
+    problems = []
+    text = question.get("question")
+    if not isinstance(text, str) or not text.strip():
+        problems.append("нет текста вопроса")
+
+    options = question.get("options")
+    if not isinstance(options, list) or len(options) != OPTIONS_PER_QUESTION:
+        problems.append(f"должно быть ровно {OPTIONS_PER_QUESTION} варианта ответа")
+    elif not all(isinstance(option, str) and option.strip() for option in options):
+        problems.append("пустой вариант ответа")
+
+    correct = question.get("correct_answer")
+    if not isinstance(correct, int) or isinstance(correct, bool) or not 0 <= correct < OPTIONS_PER_QUESTION:
+        problems.append(f"correct_answer должен быть числом от 0 до {OPTIONS_PER_QUESTION - 1}")
+
+    difficulty = question.get("difficulty")
+    if difficulty is None:
+        problems.append("нет поля difficulty")
+    elif not isinstance(difficulty, int) or isinstance(difficulty, bool):
+        problems.append("difficulty должен быть числом")
+    elif not MIN_DIFFICULTY <= difficulty <= MAX_DIFFICULTY:
+        problems.append(f"difficulty должен быть от {MIN_DIFFICULTY} до {MAX_DIFFICULTY}")
+
+    return problems
+
+
+def normalize_question(question):
+    """Приводит корректный вопрос к единому виду: обрезанные строки и только нужные поля"""
+    return {
+        "question": question["question"].strip(),
+        "options": [option.strip() for option in question["options"]],
+        "correct_answer": question["correct_answer"],
+        "difficulty": question["difficulty"]
+    }
+
+
+def validate_file(path):
+    """
+    Проверяет файл набора.
+    Возвращает (имя набора, список проблем, нормализованные вопросы);
+    проблема - строка с номером вопроса, начиная с 1.
+    """
+    path = Path(path)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            questions = json.load(f)
+    except Exception as e:
+        return path.stem, [f"ошибка чтения: {e}"], []
+
+    if not isinstance(questions, list):
+        return path.stem, ["набор должен быть списком вопросов"], []
+    if not questions:
+        return path.stem, ["пустой набор"], []
+
+    problems = []
+    normalized = []
+    for number, question in enumerate(questions, 1):
+        question_problems = validate_question(question)
+        if question_problems:
+            problems.extend(f"вопрос {number}: {problem}" for problem in question_problems)
+        else:
+            normalized.append(normalize_question(question))
+
+    return path.stem, problems, normalized
@@ -0,0 +1,121 @@
+"""
+Хранилище рекордов в SQLite - для киосков с десятками тысяч результатов за сезон.
+
+Интерфейс совпадает с RecordsLog (append, top, query_records, count_records,
+iter_records, build_index, compact), поэтому Settings работает с любым из них. Выборки
+идут по индексам (очки, дата, тема, имя) и возвращают одну страницу -
+при запуске ничего не загружается и не сортируется в Python.
+"""
+
+import sqlite3
+from pathlib import Path
+
+from core.records_log import PAGE_SIZE, TOP_SIZE
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    theme TEXT
+);
+CREATE INDEX IF NOT EXISTS records_by_score ON records (score DESC, id);
+CREATE INDEX IF NOT EXISTS records_by_date ON records (date DESC, id DESC);
+CREATE INDEX IF NOT EXISTS records_by_theme ON records (theme, score DESC, id);
+CREATE INDEX IF NOT EXISTS records_by_name ON records (name, score DESC, id);
+"""
+
+ORDERS = {
+    "score": "score DESC, id",  # При равных очках выше тот, кто раньше
+    "date": "date DESC, id DESC"
+}
+
+
+def _where(since, name, theme):
+    conditions = []
+    params = []
+    if since is not None:
+        conditions.append("date >= ?")
+        params.append(since)
+    if name is not None:
+        conditions.append("name = ?")
+        params.append(name)
+    if theme is not None:
+        conditions.append("theme = ?")
+        params.append(theme)
+    return (" WHERE " + " AND ".join(conditions) if conditions else ""), params
+
+
+def _as_record(row):
+    name, score, date, theme = row
+    return {"name": name, "score": score, "date": date, "theme": theme}
+
+
+class SqliteRecords:
+    """Рекорды в базе SQLite"""
+
+    def __init__(self, path="data/records.sqlite3", top_size=TOP_SIZE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.top_size = top_size
+        # Рекорды дописываются из фонового потока записи (core.persistence); доступ
+        # к соединению в Settings идет под блокировкой
+        self.connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")  # Запись не блокирует чтение таблицы
+        self.connection.executescript(SCHEMA)
+
+    @property
+    def count(self):
+        return self.count_records()
+
+    def append(self, record):
+        with self.connection:
+            self.connection.execute(
+                "INSERT INTO records (name, score, date, theme) VALUES (?, ?, ?, ?)",
+                (record["name"], record["score"], record.get("date", ""), record.get("theme"))
+            )
+
+    def extend(self, records):
+        """Добавляет много результатов одной транзакцией (перенос из журнала)"""
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO records (name, score, date, theme) VALUES (?, ?, ?, ?)",
+                ((r["name"], r["score"], r.get("date", ""), r.get("theme")) for r in records)
+            )
+
+    def top(self):
+        return self.query_records(limit=self.top_size)
+
+    def query_records(self, order="score", since=None, name=None, theme=None, offset=0, limit=PAGE_SIZE):
+        """Страница результатов: order="score" - по убыванию очков, "date" - сначала новые"""
+        where, params = _where(since, name, theme)
+        rows = self.connection.execute(
+            f"SELECT name, score, date, theme FROM records{where} ORDER BY {ORDERS[order]} LIMIT ? OFFSET ?",
+            params + [limit, offset]
+        )
+        return [_as_record(row) for row in rows]
+
+    def count_records(self, since=None, name=None, theme=None):
+        where, params = _where(since, name, theme)
+        return self.connection.execute(f"SELECT COUNT(*) FROM records{where}", params).fetchone()[0]
+
+    def build_index(self):
+        """Индексы выборок ведет сама база - строить нечего"""
+
+    def iter_records(self):
+        """Все результаты в порядке записи"""
+        for row in self.connection.execute("SELECT name, score, date, theme FROM records ORDER BY id"):
+            yield _as_record(row)
+
+    def compact(self):
+        """Переносит WAL в основной файл базы"""
+        try:
+            self.connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        except sqlite3.Error as e:
+            print(f"Ошибка сжатия базы рекордов: {e}")
+            return False
+        return True
+
+    def close(self):
+        self.connection.close()
@@ -0,0 +1,380 @@
+"""
+Журнал рекордов: каждый результат - одна строка JSON в конце файла.
+
+Сохраняются все результаты, а не только лучшие: запись - одна короткая
+дозапись в файл, сколько бы игр ни было сыграно. Лучшие N держатся в
+куче (O(log N) на результат).
+
+Время от времени журнал сжимается (compact): лучшие результаты, число
+записей и длина уже учтенной части журнала сохраняются в маленький
+снимок, и при запуске читается только хвост журнала после него.
+Оборванная при сбое строка при этом выбрасывается из журнала.
+
+Для выборок за пределами лучших журнал один раз просматривается целиком
+(build_index) и дальше держит индексы в плотных массивах: смещение строки,
+очки и дата каждого результата, порядок по очкам, по дате, по игроку и
+лучшие за текущую неделю. append обновляет их insort, а страница выборки -
+срез индекса и чтение нужных строк по смещениям, без просмотра журнала.
+"""
+
+import heapq
+import json
+import re
+from array import array
+from bisect import bisect_right, insort
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from core.persistence import write_atomic
+
+TOP_SIZE = 10
+COMPACT_EVERY = 100  # Через столько дозаписей снимок обновляется
+PAGE_SIZE = 10
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"  # Формат поля date; строки сравниваются как даты
+SEQUENCE_BITS = 32  # Младшие биты ключа порядка по очкам - номер результата
+SEQUENCE_MASK = (1 << SEQUENCE_BITS) - 1
+
+
+def _score_key(score, sequence):
+    """Ключ порядка по очкам в одном int64: больше очков - меньше ключ, при равенстве - кто раньше"""
+    return (-score << SEQUENCE_BITS) | sequence
+
+
+def _date_key(date):
+    """Дата из поля date числом ГГГГММДДччммсс: сравнивается так же, как строки DATE_FORMAT"""
+    return int(re.sub(r"\D", "", date or "")[:14].ljust(14, "0"))
+
+
+def _rank_key(entry):
+    """Порядок таблицы: больше очков выше, при равенстве - кто раньше"""
+    score, negative_sequence, _ = entry
+    return -score, -negative_sequence
+
+
+def week_start(now=None):
+    """Начало текущей недели (понедельник 00:00) в формате поля date - для фильтра since"""
+    now = now or datetime.now()
+    monday = (now - timedelta(days=now.weekday())).replace(hour=0, minute=0, second=0, microsecond=0)
+    return monday.strftime(DATE_FORMAT)
+
+
+def record_matches(record, since=None, name=None, theme=None):
+    """Подходит ли результат под фильтры query_records"""
+    if since is not None and record.get("date", "") < since:
+        return False
+    if name is not None and record.get("name") != name:
+        return False
+    if theme is not None and record.get("theme") != theme:
+        return False
+    return True
+
+
+def _parse_line(line):
+    """Результат из строки журнала или None, если строка испорчена"""
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+    if isinstance(record, dict) and "score" in record:
+        return record
+    return None
+
+
+class _RecordsIndex:
+    """
+    Индексы выборок журнала. Номер результата - его порядковый номер в журнале;
+    по номеру в плотных массивах лежат смещение строки, очки, дата и тема. Порядки
+    хранятся отсортированными массивами номеров или ключей _score_key.
+    """
+
+    def __init__(self):
+        self.offsets = array("q")
+        self.scores = array("q")
+        self.dates = array("q")
+        self.themes = array("q")  # Номер темы в theme_codes
+        self.theme_codes = {}
+        self.by_score = array("q")  # Ключи _score_key по возрастанию - лучшие первыми
+        self.by_date = array("q")  # Номера: сначала новые, при равной дате - записанные позже
+        self.by_name = {}  # Игрок -> ключи _score_key его результатов по возрастанию
+        self.by_theme = {}  # Тема -> ключи _score_key ее результатов по возрастанию
+        self.week = None  # (начало недели, ключи _score_key ее результатов) для вкладки "за неделю"
+
+    def _date_order(self, sequence):
+        return -self.dates[sequence], -sequence
+
+    def _theme_code(self, theme):
+        return self.theme_codes.setdefault(theme, len(self.theme_codes))
+
+    def extend(self, entries):
+        """Добавляет много результатов (смещение, запись) и сортирует порядки один раз"""
+        first = len(self.offsets)
+        names, themes = {}, {}
+        for sequence, (offset, record) in enumerate(entries, first):
+            self.offsets.append(offset)
+            self.scores.append(record["score"])
+            self.dates.append(_date_key(record.get("date")))
+            self.themes.append(self._theme_code(record.get("theme")))
+            names.setdefault(record.get("name"), []).append(sequence)
+            themes.setdefault(record.get("theme"), []).append(sequence)
+
+        added = range(first, len(self.offsets))
+        self.by_score = array("q", sorted([*self.by_score, *(_score_key(self.scores[s], s) for s in added)]))
+        self.by_date = array("q", sorted([*self.by_date, *added], key=self._date_order))
+        for groups, index in ((names, self.by_name), (themes, self.by_theme)):
+            for value, sequences in groups.items():
+                keys = [*index.get(value, ()), *(_score_key(self.scores[s], s) for s in sequences)]
+                index[value] = array("q", sorted(keys))
+        self.week = None
+
+    def add(self, offset, record):
+        sequence = len(self.offsets)
+        score, date = record["score"], _date_key(record.get("date"))
+        self.offsets.append(offset)
+        self.scores.append(score)
+        self.dates.append(date)
+        self.themes.append(self._theme_code(record.get("theme")))
+
+        key = _score_key(score, sequence)
+        insort(self.by_score, key)
+        # Результаты дописываются по времени, поэтому новый встает в начало:
+        # сдвиг массива восьмибайтных чисел, а не пересортировка
+        insort(self.by_date, sequence, key=self._date_order)
+        insort(self.by_name.setdefault(record.get("name"), array("q")), key)
+        insort(self.by_theme.setdefault(record.get("theme"), array("q")), key)
+        if self.week is not None and date >= self.week[0]:
+            insort(self.week[1], key)
+
+    def _since_count(self, since):
+        """Сколько результатов с датой не раньше since (они идут первыми в by_date)"""
+        return bisect_right(self.by_date, -since, key=lambda sequence: -self.dates[sequence])
+
+    def _week_keys(self, since):
+        """Ключи результатов начиная с since; для начала недели массив держится и пополняется"""
+        if self.week is None or self.week[0] != since:
+            recent = self.by_date[:self._since_count(since)]
+            self.week = since, array("q", sorted(_score_key(self.scores[s], s) for s in recent))
+        return self.week[1]
+
+    def select(self, order, since=None, name=None, theme=None):
+        """Номера результатов под фильтры query_records в порядке выборки"""
+        since = None if since is None else _date_key(since)
+        if name is not None or theme is not None:
+            # Результаты игрока или темы берутся из их индекса, остальные фильтры - по массивам
+            keys = self.by_name.get(name, ()) if name is not None else self.by_theme.get(theme, ())
+            sequences = [key & SEQUENCE_MASK for key in keys]
+            if since is not None:
+                sequences = [s for s in sequences if self.dates[s] >= since]
+            if name is not None and theme is not None:
+                code = self.theme_codes.get(theme)
+                sequences = [s for s in sequences if self.themes[s] == code]
+            if order == "date":
+                sequences.sort(key=self._date_order)
+            return sequences
+        if order == "date":
+            return self.by_date if since is None else self.by_date[:self._since_count(since)]
+        keys = self.by_score if since is None else self._week_keys(since)
+        return _ScoreOrder(keys)
+
+
+class _ScoreOrder:
+    """Номера результатов в порядке ключей _score_key; срез декодирует только свою страницу"""
+
+    def __init__(self, keys):
+        self.keys = keys
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [key & SEQUENCE_MASK for key in self.keys[index]]
+        return self.keys[index] & SEQUENCE_MASK
+
+    def __iter__(self):
+        return (key & SEQUENCE_MASK for key in self.keys)
+
+
+class RecordsLog:
+    """Дописываемый журнал результатов с кучей лучших top_size"""
+
+    def __init__(self, path="data/records.jsonl", top_size=TOP_SIZE):
+        self.path = Path(path)
+        self.snapshot_path = self.path.with_name(self.path.stem + ".snapshot.json")
+        self.top_size = top_size
+        self.count = 0  # Всего результатов в журнале
+        self._heap = []  # (очки, -порядковый номер, запись); в корне - худший из лучших
+        self._log_size = 0  # Длина журнала в байтах (после последней целой строки)
+        self._appends_since_compact = 0
+        self._index = None  # Индексы выборок (_RecordsIndex); строятся при первой выборке
+        self.load()
+
+    def load(self):
+        """Читает снимок и хвост журнала после него"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        offset = self._load_snapshot()
+        if not self.path.exists():
+            return
+
+        damaged = 0
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        damaged += 1  # Строка, оборванная при сбое
+                        break
+                    self._log_size += len(line)
+                    if not line.strip():
+                        continue
+                    try:
+                        record = json.loads(line)
+                        self._push(record["score"], record)
+                    except (ValueError, KeyError, TypeError):
+                        damaged += 1
+        except OSError as e:
+            print(f"Ошибка чтения журнала рекордов: {e}")
+            return
+
+        if damaged:
+            print(f"В журнале рекордов испорченных строк: {damaged} - журнал будет переписан")
+            self.compact(rewrite=True)
+        elif self._log_size - offset > 0:
+            self._appends_since_compact = COMPACT_EVERY  # Длинный хвост - обновим снимок при первой записи
+
+    def _load_snapshot(self):
+        """Заполняет кучу из снимка; возвращает, с какого байта читать журнал"""
+        self.count = 0
+        self._heap = []
+        self._log_size = 0
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            offset = snapshot["log_offset"]
+            if not self.path.exists() or self.path.stat().st_size < offset:
+                return 0  # Журнал заменили или обрезали - снимок устарел
+            self._heap = [(record["score"], -sequence, record) for sequence, record in snapshot["top"]]
+            heapq.heapify(self._heap)
+            self.count = snapshot["count"]
+            self._log_size = offset
+            return offset
+        except FileNotFoundError:
+            return 0
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Снимок рекордов не прочитан ({e}) - читаем журнал целиком")
+            self.count = 0
+            self._heap = []
+            return 0
+
+    def _push(self, score, record):
+        entry = (score, -self.count, record)
+        self.count += 1
+        if len(self._heap) < self.top_size:
+            heapq.heappush(self._heap, entry)
+        elif entry > self._heap[0]:
+            heapq.heapreplace(self._heap, entry)
+
+    def append(self, record):
+        """Дописывает результат в журнал и обновляет лучшие"""
+        data = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        with open(self.path, "ab") as f:
+            f.write(data)
+        if self._index is not None:
+            self._index.add(self._log_size, record)
+        self._log_size += len(data)
+        self._push(record["score"], record)
+
+        self._appends_since_compact += 1
+        if self._appends_since_compact >= COMPACT_EVERY:
+            self.compact()
+
+    def top(self):
+        """Лучшие результаты по убыванию очков"""
+        return [record for _, _, record in sorted(self._heap, key=_rank_key)]
+
+    def build_index(self):
+        """Строит индексы выборок одним просмотром журнала (дальше их обновляет append)"""
+        if self._index is not None:
+            return
+        index = _RecordsIndex()
+        if self.path.exists():
+            with open(self.path, "rb") as f:
+                index.extend(self._iter_entries(f))
+        self._index = index
+
+    @staticmethod
+    def _iter_entries(f):
+        """(смещение строки, результат) для всех целых строк журнала"""
+        offset = 0
+        for line in f:
+            record = _parse_line(line)
+            if record is not None:
+                yield offset, record
+            offset += len(line)
+
+    def query_records(self, order="score", since=None, name=None, theme=None, offset=0, limit=PAGE_SIZE):
+        """
+        Страница результатов: order="score" - по убыванию очков, "date" - сначала новые.
+        Первые страницы лучших берутся из кучи, остальные - срезом индекса.
+        """
+        filtered = since is not None or name is not None or theme is not None
+        if order == "score" and not filtered and offset + limit <= self.top_size:
+            return self.top()[offset:offset + limit]
+
+        self.build_index()
+        sequences = self._index.select(order, since, name, theme)
+        return list(self._read(sequences[offset:offset + limit]))
+
+    def count_records(self, since=None, name=None, theme=None):
+        """Сколько результатов подходит под фильтры"""
+        if since is None and name is None and theme is None:
+            return self.count
+        self.build_index()
+        return len(self._index.select("score", since, name, theme))
+
+    def _read(self, sequences):
+        """Результаты с номерами sequences: каждая строка читается по смещению из индекса"""
+        if not len(sequences):
+            return
+        offsets = self._index.offsets
+        with open(self.path, "rb") as f:
+            for sequence in sequences:
+                f.seek(offsets[sequence])
+                yield json.loads(f.readline())
+
+    def iter_records(self):
+        """Все результаты журнала в порядке записи"""
+        if not self.path.exists():
+            return
+        with open(self.path, "rb") as f:
+            for line in f:
+                record = _parse_line(line)
+                if record is not None:
+                    yield record
+
+    def compact(self, rewrite=False):
+        """Сохраняет снимок лучших; с rewrite=True журнал переписывается без испорченных строк"""
+        try:
+            if rewrite:
+                def write_log(f):
+                    for record in self.iter_records():
+                        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                write_atomic(self.path, write_log)
+                # Номера записей и смещения строк могли сдвинуться - пересчитываем все по новому журналу
+                self.count = 0
+                self._heap = []
+                self._index = None
+                for record in self.iter_records():
+                    self._push(record["score"], record)
+                self._log_size = self.path.stat().st_size
+
+            snapshot = {
+                "log_offset": self._log_size,
+                "count": self.count,
+                "top": [[-negative_sequence, record] for _, negative_sequence, record in self._heap]
+            }
+            write_atomic(self.snapshot_path, lambda f: json.dump(snapshot, f, ensure_ascii=False))
+        except OSError as e:
+            print(f"Ошибка сжатия журнала рекордов: {e}")
+            return False
+        self._appends_since_compact = 0
+        return True
@@ -0,0 +1,112 @@
+"""
+Гистограммы времени ответа по уровням и по наборам.
+
+Время от показа вопроса (Game.load_question) до ответа (Game.check_answer)
+раскладывается по корзинам с логарифмической шкалой: четыре корзины на
+каждое удвоение, от 0.1 с до ~7 минут. Сырые события не хранятся - только
+счетчики, поэтому запись стоит O(1) и памяти не прибавляется.
+"""
+
+import json
+import math
+from array import array
+from pathlib import Path
+
+from core.persistence import write_atomic
+
+DEFAULT_EXPORT_PATH = "data/response_times.json"
+
+MIN_SECONDS = 0.1  # Все, что быстрее, попадает в нулевую корзину
+BUCKETS_PER_DOUBLING = 4
+DOUBLINGS = 12  # 0.1 * 2 ** 12 ~ 410 с; медленнее - последняя корзина
+BUCKET_COUNT = BUCKETS_PER_DOUBLING * DOUBLINGS + 2
+
+# Нижние границы корзин в секундах (у нулевой - 0)
+BUCKET_BOUNDS = tuple([0.0] + [MIN_SECONDS * 2 ** (i / BUCKETS_PER_DOUBLING)
+                               for i in range(BUCKET_COUNT - 1)])
+
+
+def bucket_for(seconds):
+    """Номер корзины для времени ответа"""
+    if seconds < MIN_SECONDS:
+        return 0
+    index = int(math.log2(seconds / MIN_SECONDS) * BUCKETS_PER_DOUBLING) + 1
+    return min(index, BUCKET_COUNT - 1)
+
+
+class Histogram:
+    """Счетчики по корзинам плюс число и сумма значений (для среднего)"""
+
+    __slots__ = ("counts", "total", "sum_seconds")
+
+    def __init__(self):
+        self.counts = array('I', bytes(4 * BUCKET_COUNT))
+        self.total = 0
+        self.sum_seconds = 0.0
+
+    def add(self, seconds):
+        self.counts[bucket_for(seconds)] += 1
+        self.total += 1
+        self.sum_seconds += seconds
+
+    def mean(self):
+        return self.sum_seconds / self.total if self.total else 0.0
+
+    def percentile(self, q):
+        """Приближенный процентиль: верхняя граница корзины, в которую он попал"""
+        if not self.total:
+            return 0.0
+        rank = q / 100 * self.total
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                if index + 1 < BUCKET_COUNT:
+                    return BUCKET_BOUNDS[index + 1]
+                return BUCKET_BOUNDS[index]
+        return BUCKET_BOUNDS[-1]
+
+    def to_dict(self):
+        return {
+            "count": self.total,
+            "mean": round(self.mean(), 3),
+            "p50": round(self.percentile(50), 3),
+            "p90": round(self.percentile(90), 3),
+            "buckets": list(self.counts)
+        }
+
+
+class ResponseTimeHistograms:
+    """Гистограммы времени ответа по уровням лестницы и по наборам"""
+
+    def __init__(self):
+        self.levels = {}  # уровень -> Histogram
+        self.sets = {}  # номер набора (с 0) -> Histogram
+
+    def record(self, level, set_index, seconds):
+        """Учитывает один ответ"""
+        histogram = self.levels.get(level)
+        if histogram is None:
+            histogram = self.levels[level] = Histogram()
+        histogram.add(seconds)
+
+        histogram = self.sets.get(set_index)
+        if histogram is None:
+            histogram = self.sets[set_index] = Histogram()
+        histogram.add(seconds)
+
+    def export(self):
+        """Все гистограммы в виде словаря (границы корзин - в секундах)"""
+        return {
+            "bucket_bounds": [round(bound, 4) for bound in BUCKET_BOUNDS],
+            "levels": {str(level): self.levels[level].to_dict() for level in sorted(self.levels)},
+            "sets": {str(index + 1): self.sets[index].to_dict() for index in sorted(self.sets)}
+        }
+
+    def export_json(self, path=DEFAULT_EXPORT_PATH):
+        """Сохраняет гистограммы в JSON (атомарно) и возвращает путь"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = self.export()
+        write_atomic(path, lambda f: json.dump(data, f, ensure_ascii=False, indent=2))
+        return path
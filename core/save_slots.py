@@ -0,0 +1,172 @@
+"""
+Слоты сохранения игры ("продолжить позже").
+
+Снимок Game - несколько десятков байт в двоичном формате:
+    заголовок  <4sBBBBIIiqqd  магия, версия, уровень, подсказки (биты), вид выдачи,
+                              набор, резерв, номер вопроса (-1 - нет), накоплено,
+                              выигрыш текущей игры, время сохранения (unix)
+    имя набора <H + UTF-8     (проверяется при загрузке)
+    пул        <I + байты     битовое поле выданных вопросов случайной выдачи
+Файл записывается во временный, сбрасывается на диск и подменяет прежний,
+поэтому слот никогда не остается наполовину записанным. Для загрузки
+файлы вопросов не читаются: набор разбирается, только когда нужен вопрос.
+"""
+
+import struct
+import time
+from pathlib import Path
+
+from core.journal import HINT_NAMES
+from core.persistence import write_atomic
+
+DEFAULT_SAVE_DIR = "data/saves"
+SLOT_COUNT = 3
+
+SAVE_MAGIC = b"MQS1"
+SAVE_VERSION = 1
+HEADER = struct.Struct("<4sBBBBIIiqqd")
+NAME_LENGTH = struct.Struct("<H")
+POOL_LENGTH = struct.Struct("<I")
+
+# Вид выдачи вопросов
+DRAW_ORDERED = 0  # По порядку набора
+DRAW_POOL = 1  # QuestionPool (сохраняется битовое поле выданных)
+DRAW_ADAPTIVE = 2  # AdaptiveQuestionSampler (статистика копится заново)
+
+
+class SaveFormatError(Exception):
+    """Файл не является сохранением поддерживаемой версии"""
+
+
+def slot_path(slot, save_dir=DEFAULT_SAVE_DIR):
+    return Path(save_dir) / f"slot{slot}.sav"
+
+
+def snapshot(game):
+    """Снимок состояния игры в байтах"""
+    manager = game.question_manager
+    hint_bits = 0
+    for bit, name in enumerate(HINT_NAMES):
+        if game.used_hints.get(name):
+            hint_bits |= 1 << bit
+
+    pool = game.question_pool
+    pool_state = b""
+    if pool is None:
+        draw_mode = DRAW_ORDERED
+    elif hasattr(pool, "get_served_state"):
+        draw_mode = DRAW_POOL
+        pool_state = pool.get_served_state()
+    else:
+        draw_mode = DRAW_ADAPTIVE
+
+    question_id = game.current_question_id if game.current_question_id is not None else -1
+    name = (manager.get_current_set_name() or "").encode("utf-8")
+    return b"".join((
+        HEADER.pack(SAVE_MAGIC, SAVE_VERSION, game.current_level, hint_bits, draw_mode,
+                    manager.current_set_index, 0, question_id,
+                    game.total_accumulated_winnings, game.current_game_winnings, time.time()),
+        NAME_LENGTH.pack(len(name)), name,
+        POOL_LENGTH.pack(len(pool_state)), pool_state
+    ))
+
+
+def parse_snapshot(data):
+    """Разбирает снимок в словарь; SaveFormatError, если данные повреждены"""
+    if len(data) < HEADER.size or data[:4] != SAVE_MAGIC:
+        raise SaveFormatError("не файл сохранения")
+    (_, version, level, hint_bits, draw_mode, set_index, _, question_id,
+     total, game_winnings, saved_at) = HEADER.unpack_from(data)
+    if version != SAVE_VERSION:
+        raise SaveFormatError(f"версия {version} не поддерживается")
+
+    try:
+        offset = HEADER.size
+        (name_length,) = NAME_LENGTH.unpack_from(data, offset)
+        offset += NAME_LENGTH.size
+        set_name = data[offset:offset + name_length].decode("utf-8")
+        offset += name_length
+        (pool_length,) = POOL_LENGTH.unpack_from(data, offset)
+        offset += POOL_LENGTH.size
+        pool_state = data[offset:offset + pool_length]
+    except (struct.error, UnicodeDecodeError) as e:
+        raise SaveFormatError(f"поврежденное сохранение: {e}")
+    if len(pool_state) != pool_length:
+        raise SaveFormatError("сохранение обрезано")
+
+    return {
+        "level": level,
+        "used_hints": [name for bit, name in enumerate(HINT_NAMES) if hint_bits & (1 << bit)],
+        "draw_mode": draw_mode,
+        "set_index": set_index,
+        "set_name": set_name,
+        "question_id": question_id if question_id >= 0 else None,
+        "total_accumulated_winnings": total,
+        "current_game_winnings": game_winnings,
+        "saved_at": saved_at,
+        "pool_state": pool_state
+    }
+
+
+def restore_snapshot(game, data):
+    """Восстанавливает игру из снимка; True при успехе"""
+    try:
+        state = parse_snapshot(data)
+    except SaveFormatError as e:
+        print(f"Ошибка загрузки сохранения: {e}")
+        return False
+
+    manager = game.question_manager
+    if state["set_index"] >= manager.get_total_sets() or \
+            manager.question_sets[state["set_index"]]['name'] != state["set_name"]:
+        print(f"Набор {state['set_name']} из сохранения не найден - загрузка невозможна")
+        return False
+
+    if state["pool_state"] and game.question_pool is not None and hasattr(game.question_pool, "load_served_state"):
+        game.question_pool.load_served_state(state["pool_state"])
+
+    return game.restore_state(state["set_index"], state["level"], state["total_accumulated_winnings"],
+                              state["current_game_winnings"], state["used_hints"],
+                              question_id=state["question_id"])
+
+
+def save_slot(game, slot=1, save_dir=DEFAULT_SAVE_DIR):
+    """Атомарно сохраняет игру в слот и возвращает путь к файлу"""
+    path = slot_path(slot, save_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = snapshot(game)
+
+    write_atomic(path, lambda f: f.write(data), "wb")
+    return path
+
+
+def load_slot(game, slot=1, save_dir=DEFAULT_SAVE_DIR):
+    """Загружает игру из слота; True при успехе"""
+    try:
+        with open(slot_path(slot, save_dir), "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return False
+    except OSError as e:
+        print(f"Ошибка чтения сохранения: {e}")
+        return False
+    return restore_snapshot(game, data)
+
+
+def list_slots(save_dir=DEFAULT_SAVE_DIR):
+    """Занятые слоты: [(номер, сведения из parse_snapshot)]"""
+    slots = []
+    for slot in range(1, SLOT_COUNT + 1):
+        try:
+            with open(slot_path(slot, save_dir), "rb") as f:
+                slots.append((slot, parse_snapshot(f.read())))
+        except (OSError, SaveFormatError):
+            continue
+    return slots
+
+
+def delete_slot(slot, save_dir=DEFAULT_SAVE_DIR):
+    try:
+        slot_path(slot, save_dir).unlink()
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,261 @@
+"""
+Локальный сервер игровых сессий для режима класса.
+
+Один процесс загружает наборы вопросов один раз и ведет тысячи независимых
+игр: у каждого ученика свой Game с курсором, уровнем и подсказками, а
+вопросы общие (QuestionManager.fork) и только читаются. Все сессии
+обслуживаются одним циклом asyncio, поэтому блокировки не нужны.
+
+Клиенты подключаются по TCP к локальному адресу, одно подключение - одна
+сессия. Протокол: одна строка JSON на запрос и одна на ответ.
+    {"cmd": "new_game"}                   новая сессия (накопленное обнуляется)
+    {"cmd": "question"}                   текущий вопрос без правильного ответа
+    {"cmd": "answer", "option": 0..3}     ответ на текущий вопрос
+    {"cmd": "hint", "name": "50_50" | "call_friend" | "audience_help"}
+    {"cmd": "next_set"}                   следующий набор после победы
+    {"cmd": "state"}                      уровень, выигрыш, подсказки
+Ответ всегда содержит "ok"; при ошибке - "error" с описанием.
+
+Запуск из корня проекта:
+    python -m core.session_host [--host 127.0.0.1] [--port 8765] [--max-sessions 5000]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+
+from core import hints
+from core.game import Game
+from core.question_bank import DEFAULT_BANK_PATH
+from core.question_manager import QuestionManager
+
+DEFAULT_HOST = "127.0.0.1"  # Только локальная сеть машины: сервер не для интернета
+DEFAULT_PORT = 8765
+DEFAULT_MAX_SESSIONS = 5000
+MAX_REQUEST_SIZE = 4096  # Запросы короткие - длинная строка означает ошибку клиента
+LEVELS = 15
+
+
+def open_shared_question_manager(bank_path=DEFAULT_BANK_PATH):
+    """Загружает наборы для всех сессий: банк, если он собран, иначе все JSON сразу"""
+    if os.path.exists(bank_path):
+        try:
+            return QuestionManager(bank_path=bank_path)
+        except Exception as e:
+            print(f"Ошибка открытия банка вопросов: {e}")
+    # Все наборы разбираются заранее, чтобы сессии не разбирали их наперегонки
+    return QuestionManager()
+
+
+class GameSession:
+    """Игра одного ученика"""
+
+    __slots__ = ("session_id", "game", "rng", "state")
+
+    def __init__(self, session_id, question_manager, rng):
+        self.session_id = session_id
+        self.game = Game(question_manager.fork())
+        self.rng = rng  # Общий генератор хоста - отдельный на сессию не нужен
+        self.state = "idle"  # idle -> playing -> won | lost
+
+    def new_game(self):
+        self.game.start_new_game(reset_questions=True, is_new_session=True)
+        return self._next_question()
+
+    def _next_question(self):
+        if self.game.load_question() is None:
+            self.state = "idle"
+            return {"ok": False, "error": "В наборе нет вопросов"}
+        self.state = "playing"
+        return self.question()
+
+    def question(self):
+        if self.state != "playing":
+            return {"ok": False, "error": "Нет текущего вопроса"}
+        question = self.game.current_question
+        return {
+            "ok": True,
+            "set": self.game.get_current_question_set(),
+            "level": self.game.current_level,
+            "prize": self.game.prize_levels[self.game.current_level],
+            "question": question["question"],
+            "options": question["options"],
+        }
+
+    def answer(self, option):
+        if self.state != "playing":
+            return {"ok": False, "error": "Нет текущего вопроса"}
+        # bool - подкласс int, но true/false вариантом ответа не считаются
+        if not isinstance(option, int) or isinstance(option, bool) or not 0 <= option < hints.OPTIONS_COUNT:
+            return {"ok": False, "error": f"Вариант должен быть от 0 до {hints.OPTIONS_COUNT - 1}"}
+
+        game = self.game
+        correct_answer = game.current_question["correct_answer"]
+        if not game.check_answer(option):
+            self.state = "lost"
+            return {"ok": True, "correct": False, "correct_answer": correct_answer,
+                    "winnings": game.get_guaranteed_prize() + game.total_accumulated_winnings}
+
+        game.add_current_prize()
+        game.advance_level()
+        if game.current_level > LEVELS:
+            self.state = "won"
+            return {"ok": True, "correct": True, "set_won": True, "final": game.is_last_set(),
+                    "winnings": game.get_total_prize()}
+        response = self._next_question()
+        response["correct"] = True
+        return response
+
+    def hint(self, name):
+        if self.state != "playing":
+            return {"ok": False, "error": "Нет текущего вопроса"}
+        if not isinstance(name, str) or name not in self.game.used_hints:
+            return {"ok": False, "error": f"Неизвестная подсказка: {name}"}
+        if self.game.used_hints[name]:
+            return {"ok": False, "error": "Подсказка уже использована"}
+
+        correct_answer = self.game.current_question["correct_answer"]
+        if name == "50_50":
+            result = {"removed": hints.fifty_fifty(correct_answer, self.rng)}
+        elif name == "call_friend":
+            answer, confident = hints.call_friend(correct_answer, self.rng)
+            result = {"answer": answer, "confident": confident}
+        else:
+            result = {"percentages": hints.audience_help(correct_answer, self.rng)}
+        self.game.use_hint(name)
+        result["ok"] = True
+        return result
+
+    def next_set(self):
+        if self.state != "won":
+            return {"ok": False, "error": "Набор еще не пройден"}
+        if not self.game.handle_level_completion():
+            self.state = "idle"
+            return {"ok": True, "final": True, "winnings": self.game.total_accumulated_winnings}
+        self.game.start_new_game(reset_questions=True, is_new_session=False)
+        return self._next_question()
+
+    def describe(self):
+        return {
+            "ok": True,
+            "session": self.session_id,
+            "state": self.state,
+            "set": self.game.get_current_question_set(),
+            "level": self.game.current_level,
+            "winnings": self.game.get_total_prize(),
+            "used_hints": [name for name, used in self.game.used_hints.items() if used],
+        }
+
+
+class SessionHost:
+    """Держит сессии всех учеников над одним загруженным набором вопросов"""
+
+    def __init__(self, question_manager=None, max_sessions=DEFAULT_MAX_SESSIONS, rng=None):
+        self.question_manager = question_manager or open_shared_question_manager()
+        self.max_sessions = max_sessions
+        self.rng = rng or random.Random()
+        self.sessions = {}  # номер -> GameSession
+        self._next_id = 1
+
+    def open_session(self):
+        """Новая сессия или None, если достигнут предел"""
+        if len(self.sessions) >= self.max_sessions:
+            return None
+        session = GameSession(self._next_id, self.question_manager, self.rng)
+        self.sessions[session.session_id] = session
+        self._next_id += 1
+        return session
+
+    def close_session(self, session):
+        self.sessions.pop(session.session_id, None)
+
+    def handle_request(self, session, request):
+        """Выполняет одну команду клиента и возвращает ответ"""
+        if not isinstance(request, dict):
+            return {"ok": False, "error": "Запрос должен быть объектом JSON"}
+        command = request.get("cmd")
+        if command == "new_game":
+            return session.new_game()
+        if command == "question":
+            return session.question()
+        if command == "answer":
+            return session.answer(request.get("option"))
+        if command == "hint":
+            return session.hint(request.get("name"))
+        if command == "next_set":
+            return session.next_set()
+        if command == "state":
+            return session.describe()
+        return {"ok": False, "error": f"Неизвестная команда: {command}"}
+
+    async def handle_client(self, reader, writer):
+        session = self.open_session()
+        try:
+            if session is None:
+                await self._send(writer, {"ok": False, "error": "Сервер заполнен"})
+                return
+            await self._send(writer, session.describe())
+
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    await self._send(writer, {"ok": False, "error": "Слишком длинный запрос"})
+                    return
+                if not line:
+                    return  # Клиент отключился
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                except json.JSONDecodeError:
+                    response = {"ok": False, "error": "Некорректный JSON"}
+                else:
+                    try:
+                        response = self.handle_request(session, request)
+                    except Exception as e:
+                        # Ошибка в одной команде не должна обрывать сессию ученика
+                        print(f"Ошибка команды в сессии {session.session_id}: {e!r}")
+                        response = {"ok": False, "error": "Команда не выполнена"}
+                await self._send(writer, response)
+        except ConnectionError:
+            pass
+        finally:
+            if session is not None:
+                self.close_session(session)
+            writer.close()
+
+    @staticmethod
+    async def _send(writer, response):
+        writer.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+        await writer.drain()
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        # Большая очередь подключений: на уроке ученики подключаются почти одновременно
+        server = await asyncio.start_server(self.handle_client, host, port, limit=MAX_REQUEST_SIZE,
+                                            backlog=min(self.max_sessions, 4096))
+        print(f"Сервер сессий запущен на {host}:{port} (до {self.max_sessions} сессий)")
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m core.session_host", description="Сервер игр для режима класса")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="адрес (по умолчанию только локальный)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--max-sessions", type=int, default=DEFAULT_MAX_SESSIONS)
+    parser.add_argument("--bank", default=DEFAULT_BANK_PATH, help="скомпилированный банк вопросов")
+    args = parser.parse_args(argv)
+
+    host = SessionHost(open_shared_question_manager(args.bank), args.max_sessions)
+    try:
+        asyncio.run(host.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("Сервер остановлен")
+    return 0
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,29 @@
 import json
+import threading
 from pathlib import Path
 from datetime import datetime
 
+from core.persistence import write_json_atomic
+from core.rank_index import RankIndex, top_percent
+from core.records_log import RecordsLog, PAGE_SIZE, record_matches
+
+RECORDS_BACKENDS = ("json", "sqlite")
+FLUSH_TIMEOUT = 3.0  # Дольше интерфейс не ждет фоновую запись
+
 
 class Settings:
-    def __init__(self, records_file="data/records.json"):
+    def __init__(self, records_file="data/records.json", writer=None):
         self.records_file = Path(records_file)
         self.settings_file = Path("data/settings.json")
         self.current_theme = 'dark'
         self.music_volume = 0.7  # Значение по умолчанию
-        self.records = []
+        self.records = []  # Лучшие результаты (топ-10) по убыванию очков
+        self.records_backend = "json"  # "json" - журнал records.jsonl, "sqlite" - база records.sqlite3
+        self.records_log = None  # Все результаты (RecordsLog или SqliteRecords)
+        self.writer = writer  # core.persistence.WriteBehind; без него запись идет сразу
+        self._records_lock = threading.Lock()  # Хранилище рекордов пишется из фонового потока
+        self._writer_stalled = False  # Прошлое ожидание фоновой записи кончилось по таймауту
+        self.rank_index = None  # core.rank_index.RankIndex по всем результатам; строится один раз
 
         self._ensure_directories_exist()  # ← ДОБАВЬТЕ ЭТУ СТРОЧКУ В НАЧАЛО!
         self.load_settings()
@@ -38,70 +52,189 @@ class Settings:
                     data = json.load(f)
                     self.current_theme = data.get('theme', 'dark')
                     self.music_volume = data.get('music_volume', 0.7)
+                    backend = data.get('records_backend', 'json')
+                    self.records_backend = backend if backend in RECORDS_BACKENDS else 'json'
                 print(f"Настройки загружены: тема={self.current_theme}, громкость={self.music_volume}")
         except (json.JSONDecodeError, Exception) as e:
             print(f"Ошибка загрузки настроек: {e}. Используем значения по умолчанию")
 
     def save_settings(self):
-        """Сохраняет настройки в файл"""
+        """Сохраняет настройки в файл (с writer - в фоне, серия вызовов дает одну запись)"""
+        settings_data = {
+            'theme': self.current_theme,
+            'music_volume': self.music_volume,
+            'records_backend': self.records_backend
+        }
+        self._write_later(lambda: self._write_settings(settings_data), key="settings")
+
+    def _write_settings(self, settings_data):
         try:
-            settings_data = {
-                'theme': self.current_theme,
-                'music_volume': self.music_volume
-            }
-            with open(self.settings_file, "w", encoding="utf-8") as f:
-                json.dump(settings_data, f, indent=2, ensure_ascii=False)
+            write_json_atomic(self.settings_file, settings_data)
         except Exception as e:
             print(f"Ошибка сохранения настроек: {e}")
 
+    def _write_later(self, write, key=None):
+        """Отдает запись фоновому потоку, а без него выполняет сразу"""
+        if self.writer is None:
+            write()
+        else:
+            self.writer.submit(write, key)
+
+    def flush(self, timeout=None):
+        """
+        Дожидается записи всего отложенного (перед чтением рекордов), но не дольше
+        FLUSH_TIMEOUT: если фоновый поток завис на диске, интерфейс не должен зависнуть
+        с ним. Пока зависшая запись не завершится, повторные вызовы не ждут вовсе.
+        Возвращает False, если запись не успела.
+        """
+        if self.writer is None:
+            return True
+        if self._writer_stalled and self.writer.pending():
+            return False
+        timeout = FLUSH_TIMEOUT if timeout is None else timeout
+        self._writer_stalled = not self.writer.flush(timeout)
+        if self._writer_stalled:
+            print(f"Фоновая запись не завершилась за {timeout} с - показываем данные из памяти")
+        return not self._writer_stalled
+
+    def _lock_records(self):
+        """Дописывает отложенное и берет блокировку хранилища; False - фоновая запись не успела"""
+        return self.flush() and self._records_lock.acquire(timeout=FLUSH_TIMEOUT)
+
+    def _records_in_memory(self, order, since, name, theme):
+        """Запасной ответ, пока хранилище недоступно: лучшие результаты из памяти (с еще не записанными)"""
+        records = [record for record in self.records if record_matches(record, since, name, theme)]
+        if order == "date":
+            records.sort(key=lambda record: record.get("date", ""), reverse=True)
+        return records
+
     def load_records(self):
-        """Загружает рекорды из файла"""
-        if self.records_file.exists():
+        """Загружает рекорды из журнала или базы (старый records.json переносится один раз)"""
+        log_path = self.records_file.with_suffix(".jsonl")
+        self.records_log = None
+        if self.records_backend == "sqlite":
+            self.records_log = self._open_sqlite_records(log_path)
+        if self.records_log is None:
+            self.records_log = RecordsLog(log_path)
+
+        migrate = self.records_log.count == 0 and not log_path.exists() and self.records_file.exists()
+        if migrate:
             try:
                 with open(self.records_file, "r", encoding="utf-8") as f:
-                    self.records = json.load(f)
-                print(f"Загружено рекордов: {len(self.records)}")
+                    for record in json.load(f):
+                        self.records_log.append(record)
+                print(f"Рекорды перенесены из {self.records_file.name}")
             except (json.JSONDecodeError, Exception) as e:
-                print(f"Ошибка загрузки рекордов: {e}")
-                self.records = []
-        else:
-            self.records = []
-            print("Файл рекордов не найден, создан новый список")
+                print(f"Ошибка переноса рекордов: {e}")
+
+        self.records = self.records_log.top()
+        print(f"Загружено рекордов: {self.records_log.count}")
+
+        # Индекс мест требует прочитать все суммы - с writer это делается в фоне,
+        # в одной очереди с дозаписью рекордов, поэтому ни один результат не теряется
+        self.rank_index = None
+        if self.writer is not None:
+            self._write_later(self._build_rank_index)
+
+    def _open_sqlite_records(self, log_path):
+        """Открывает базу рекордов; пустая база заполняется из журнала records.jsonl"""
+        try:
+            from core.records_db import SqliteRecords
+            import sqlite3
+        except ImportError as e:
+            print(f"SQLite недоступен ({e}) - рекорды хранятся в журнале")
+            return None
+
+        try:
+            records_db = SqliteRecords(self.records_file.with_suffix(".sqlite3"))
+            if records_db.count_records() == 0 and log_path.exists():
+                records_db.extend(RecordsLog(log_path).iter_records())
+                print(f"Рекорды перенесены из {log_path.name} в базу")
+            return records_db
+        except sqlite3.Error as e:
+            print(f"Ошибка открытия базы рекордов: {e} - рекорды хранятся в журнале")
+            return None
 
     def add_record(self, name, score):
         """Добавляет новый рекорд"""
         if not name or not name.strip():
             name = "Аноним"
 
-        self.records.append({
+        record = {
             "name": name.strip(),
             "score": score,
             "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             "theme": self.current_theme
-        })
+        }
 
-        # Сортируем по убыванию очков
-        self.records.sort(key=lambda x: x["score"], reverse=True)
+        # Топ-10 обновляется сразу, а сама запись в журнал или базу уходит в фон
+        self.records = sorted(self.records + [record], key=lambda r: -r["score"])[:self.records_log.top_size]
+        self._write_later(lambda: self._append_record(record))
 
-        # Оставляем только топ-10
-        if len(self.records) > 10:
-            self.records = self.records[:10]
+    def _append_record(self, record):
+        try:
+            with self._records_lock:
+                self.records_log.append(record)
+                if self.rank_index is not None:
+                    self.rank_index.add(record["score"])
+            print("Рекорд сохранен")
+        except Exception as e:
+            print(f"Ошибка сохранения рекорда: {e}")
 
-        self.save_records()
+    def _build_rank_index(self):
+        with self._records_lock:
+            # Индексы выборок таблицы рекордов тоже строятся здесь, а не при первом открытии таблицы
+            self.records_log.build_index()
+            if self.rank_index is None:
+                self.rank_index = RankIndex(record["score"] for record in self.records_log.iter_records())
 
-    def save_records(self):
-        """Сохраняет рекорды в файл"""
+    def get_rank(self, score, recorded=False):
+        """
+        Место суммы score среди всех результатов: (место, всего, топ в процентах).
+        recorded=False - результат еще не записан и считается вместе с остальными.
+        None - фоновая запись (и построение индекса в ее очереди) не успела за FLUSH_TIMEOUT.
+        """
+        if not self._lock_records():
+            return None
         try:
-            with open(self.records_file, "w", encoding="utf-8") as f:
-                json.dump(self.records, f, indent=2, ensure_ascii=False)
-            print("Рекорды сохранены")
-        except Exception as e:
-            print(f"Ошибка сохранения рекордов: {e}")
+            if self.rank_index is None:
+                self.rank_index = RankIndex(record["score"] for record in self.records_log.iter_records())
+            rank = self.rank_index.rank(score)
+            total = len(self.rank_index) + (0 if recorded else 1)
+        finally:
+            self._records_lock.release()
+        return rank, total, top_percent(rank, total)
+
+    def save_records(self):
+        """Сжимает журнал или базу рекордов (каждый рекорд и так сохраняется сразу)"""
+        self._write_later(self._compact_records, key="records_compact")
+
+    def _compact_records(self):
+        with self._records_lock:
+            self.records_log.compact()
 
     def get_records(self):
-        """Возвращает список рекордов"""
+        """Возвращает лучшие результаты (топ-10)"""
         return self.records
 
+    def query_records(self, order="score", since=None, name=None, theme=None, offset=0, limit=PAGE_SIZE):
+        """Страница результатов из хранилища: лучшие, за период, по игроку или теме"""
+        if not self._lock_records():  # Только что добавленный рекорд должен попасть в выборку
+            return self._records_in_memory(order, since, name, theme)[offset:offset + limit]
+        try:
+            return self.records_log.query_records(order, since, name, theme, offset, limit)
+        finally:
+            self._records_lock.release()
+
+    def count_records(self, since=None, name=None, theme=None):
+        """Сколько результатов подходит под фильтры query_records"""
+        if not self._lock_records():
+            return len(self._records_in_memory("score", since, name, theme))
+        try:
+            return self.records_log.count_records(since, name, theme)
+        finally:
+            self._records_lock.release()
+
     def get_music_volume(self):
         """Возвращает текущую громкость музыки"""
         return self.music_volume
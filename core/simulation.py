@@ -0,0 +1,205 @@
+"""
+Безоконная симуляция игр для балансировки лестницы призов и подсказок.
+
+Модуль не импортирует tkinter: правила берутся из core.game, модели
+подсказок - из core.hints. Есть два режима:
+    run(n, fast=False) - честная партия по вопросам, любые стратегии;
+    run(n)             - если игрок умеет назвать вероятность ответа, а подсказки
+                         заданы планом по уровням, партия сводится к одному
+                         случайному числу (сотни тысяч игр в секунду и больше).
+"""
+
+import random
+from collections import Counter
+
+from core import hints
+from core.game import PRIZE_LEVELS, guaranteed_prize_for_level
+
+LEVELS = 15
+HINT_ESTIMATE_SAMPLES = 20000  # Партий для оценки пользы сочетания подсказок
+
+
+class SkillPlayer:
+    """Игрок, знающий ответ с вероятностью, зависящей от сложности вопроса"""
+
+    def __init__(self, accuracy_by_difficulty=None, default_accuracy=0.5):
+        self.accuracy_by_difficulty = accuracy_by_difficulty or {1: 0.9, 2: 0.7, 3: 0.45}
+        self.default_accuracy = default_accuracy
+
+    def knowledge(self, question):
+        """Вероятность знать ответ на вопрос"""
+        return self.accuracy_by_difficulty.get(question.get("difficulty"), self.default_accuracy)
+
+    def knows(self, question, rng):
+        return rng.random() < self.knowledge(question)
+
+
+class FixedLevelHints:
+    """Стратегия подсказок: каждая подсказка берется на заранее выбранном уровне"""
+
+    def __init__(self, plan=None):
+        # Имя подсказки -> уровень: 50/50 и зал - на сложных вопросах, друг - в самом конце
+        self.plan = plan if plan is not None else {"fifty_fifty": 11, "audience_help": 12, "call_friend": 14}
+        by_level = {}
+        for name, level in self.plan.items():
+            by_level.setdefault(level, []).append(name)
+        self._by_level = {level: tuple(sorted(names)) for level, names in by_level.items()}
+
+    def hint_plan(self):
+        """Уровень -> кортеж подсказок (нужен для быстрого режима)"""
+        return self._by_level
+
+    def choose(self, level, question, used):
+        return [name for name in self._by_level.get(level, ()) if name not in used]
+
+
+class NoHints(FixedLevelHints):
+    """Игрок не пользуется подсказками"""
+
+    def __init__(self):
+        super().__init__({})
+
+
+def resolve_unknown_answer(correct_answer, used_now, rng):
+    """
+    Ответ игрока, не знающего вопроса, с учетом взятых подсказок:
+    50/50 сужает выбор, друг и зал подсказывают вариант.
+    """
+    available = list(range(hints.OPTIONS_COUNT))
+    if "fifty_fifty" in used_now:
+        removed = hints.fifty_fifty(correct_answer, rng)
+        available = [i for i in available if i not in removed]
+    if "call_friend" in used_now:
+        answer, _ = hints.call_friend(correct_answer, rng)
+        if answer in available:
+            return answer
+    if "audience_help" in used_now:
+        votes = hints.audience_help(correct_answer, rng)
+        return max(available, key=lambda i: (votes[i], rng.random()))
+    return rng.choice(available)
+
+
+class SimulationStats:
+    """Итоги серии игр: сколько игр остановилось на каждом числе верных ответов"""
+
+    def __init__(self):
+        self.outcomes = [0] * (LEVELS + 1)  # индекс - число верных ответов
+        self.hint_uses = Counter()
+
+    @property
+    def games(self):
+        return sum(self.outcomes)
+
+    @staticmethod
+    def prize_for(passed):
+        """Выигрыш игры, в которой дано passed верных ответов"""
+        if passed >= LEVELS:
+            return PRIZE_LEVELS[LEVELS]
+        return guaranteed_prize_for_level(passed + 1)
+
+    def prize_distribution(self):
+        """Выигрыш -> число игр"""
+        distribution = Counter()
+        for passed, count in enumerate(self.outcomes):
+            if count:
+                distribution[self.prize_for(passed)] += count
+        return dict(sorted(distribution.items()))
+
+    def mean_prize(self):
+        games = self.games
+        if not games:
+            return 0
+        return sum(self.prize_for(passed) * count for passed, count in enumerate(self.outcomes)) / games
+
+    def win_rate(self):
+        games = self.games
+        return self.outcomes[LEVELS] / games if games else 0
+
+
+class GameSimulator:
+    """Играет партии по 15 вопросам без интерфейса"""
+
+    def __init__(self, questions, player=None, hint_strategy=None, rng=None):
+        if len(questions) < LEVELS:
+            raise ValueError(f"Для партии нужно {LEVELS} вопросов, передано {len(questions)}")
+        self.questions = [questions[i] for i in range(LEVELS)]
+        self.player = player or SkillPlayer()
+        self.hint_strategy = hint_strategy or NoHints()
+        self.rng = rng or random.Random()
+        self._hint_success = {}  # сочетание подсказок -> вероятность угадать без знаний
+
+    @classmethod
+    def from_set(cls, question_manager, set_index, **kwargs):
+        """Симулятор по набору QuestionManager"""
+        return cls(question_manager.get_set_questions(set_index), **kwargs)
+
+    def play(self, stats=None):
+        """Одна честная партия; возвращает число верных ответов"""
+        rng = self.rng
+        used = set()
+        for level, question in enumerate(self.questions, 1):
+            used_now = self.hint_strategy.choose(level, question, used)
+            used.update(used_now)
+            if stats is not None:
+                stats.hint_uses.update(used_now)
+
+            if self.player.knows(question, rng):
+                continue
+            if resolve_unknown_answer(question["correct_answer"], used_now, rng) != question["correct_answer"]:
+                return level - 1
+        return LEVELS
+
+    def _guess_success(self, used_now):
+        """Вероятность угадать без знаний при данном сочетании подсказок (оценивается один раз)"""
+        if used_now not in self._hint_success:
+            rng = random.Random(len(used_now))
+            hits = sum(resolve_unknown_answer(0, used_now, rng) == 0 for _ in range(HINT_ESTIMATE_SAMPLES))
+            self._hint_success[used_now] = hits / HINT_ESTIMATE_SAMPLES
+        return self._hint_success[used_now]
+
+    def level_probabilities(self):
+        """Вероятность верного ответа на каждом уровне (для быстрого режима)"""
+        plan = self.hint_strategy.hint_plan()
+        probabilities = []
+        for level, question in enumerate(self.questions, 1):
+            knowledge = self.player.knowledge(question)
+            probabilities.append(knowledge + (1 - knowledge) * self._guess_success(plan.get(level, ())))
+        return probabilities
+
+    def supports_fast(self):
+        return hasattr(self.player, "knowledge") and hasattr(self.hint_strategy, "hint_plan")
+
+    def run(self, games, fast=None):
+        """Играет серию партий и возвращает SimulationStats"""
+        if fast is None:
+            fast = self.supports_fast()
+
+        stats = SimulationStats()
+        if not fast:
+            for _ in range(games):
+                stats.outcomes[self.play(stats)] += 1
+            return stats
+
+        # Накопленные вероятности исходов "ровно k верных ответов": одно случайное число на партию
+        probabilities = self.level_probabilities()
+        cumulative = []
+        survive = 1.0
+        total = 0.0
+        for probability in probabilities:
+            total += survive * (1 - probability)
+            cumulative.append(total)
+            survive *= probability
+        cumulative.append(1.0)
+
+        counts = Counter(self.rng.choices(range(LEVELS + 1), cum_weights=cumulative, k=games))
+        for passed, count in counts.items():
+            stats.outcomes[passed] = count
+
+        # Подсказки в быстром режиме не разыгрываются - считаем ожидаемое число использований
+        plan = self.hint_strategy.hint_plan()
+        reach = 1.0
+        for level, probability in enumerate(probabilities, 1):
+            for name in plan.get(level, ()):
+                stats.hint_uses[name] += round(games * reach)
+            reach *= probability
+        return stats
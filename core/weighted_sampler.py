@@ -0,0 +1,215 @@
+import math
+import random
+from array import array
+from collections import deque
+
+from core.question_pool import difficulty_for_level
+
+# Желаемая доля верных ответов для вопросов каждой сложности
+TARGET_ACCURACY = {1: 0.8, 2: 0.55, 3: 0.3}
+ACCURACY_SPREAD = 0.2  # Насколько быстро падает вес вопроса, не подходящего своей группе
+MIN_WEIGHT = 0.05  # Даже неудачный вопрос иногда выпадает - иначе его статистика не обновится
+COOLDOWN_DRAWS = 20  # Столько следующих выдач группы вопрос отдыхает (не больше половины группы)
+REBUILD_EVERY = 1 << 16  # Через столько изменений дерево пересчитывается (копится ошибка округления)
+
+
+class FenwickTree:
+    """
+    Дерево Фенвика над весами: изменение веса, префиксная сумма и поиск
+    элемента по накопленной сумме - все за O(log n).
+    Индексы элементов - с нуля, внутри дерево хранится с единицы.
+    """
+
+    def __init__(self, weights=()):
+        self.values = array('d', weights)
+        self.size = len(self.values)
+        self._top_bit = 1 << self.size.bit_length() >> 1 if self.size else 0
+        self._changes = 0
+        self.rebuild()
+
+    def __len__(self):
+        return self.size
+
+    def rebuild(self):
+        """Строит дерево по весам за O(n)"""
+        tree = array('d', [0.0]) * (self.size + 1)
+        for i, weight in enumerate(self.values, 1):
+            tree[i] += weight
+            parent = i + (i & -i)
+            if parent <= self.size:
+                tree[parent] += tree[i]
+        self.tree = tree
+        self._changes = 0
+
+    def get(self, index):
+        return self.values[index]
+
+    def set(self, index, weight):
+        """Меняет вес элемента"""
+        delta = weight - self.values[index]
+        if delta == 0:
+            return
+        self.values[index] = weight
+        tree = self.tree
+        i = index + 1
+        while i <= self.size:
+            tree[i] += delta
+            i += i & -i
+
+        self._changes += 1
+        if self._changes >= REBUILD_EVERY:
+            self.rebuild()
+
+    def prefix_sum(self, count):
+        """Сумма весов первых count элементов"""
+        tree = self.tree
+        total = 0.0
+        i = count
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def total(self):
+        return self.prefix_sum(self.size)
+
+    def find(self, value):
+        """Индекс элемента, на который приходится накопленная сумма value (0 <= value < total)"""
+        tree = self.tree
+        position = 0
+        step = self._top_bit
+        while step:
+            following = position + step
+            if following <= self.size and tree[following] <= value:
+                position = following
+                value -= tree[following]
+            step >>= 1
+        return min(position, self.size - 1)  # Защита от ошибки округления на самом краю
+
+
+def question_weight(correct, attempts, target):
+    """
+    Вес вопроса: чем ближе наблюдаемая доля верных ответов к желаемой, тем чаще
+    он выпадает. Без статистики доля считается равной желаемой.
+    """
+    accuracy = (correct + target) / (attempts + 1)  # Сглаживание к желаемой доле
+    return MIN_WEIGHT + math.exp(-((accuracy - target) / ACCURACY_SPREAD) ** 2)
+
+
+class AdaptiveQuestionSampler:
+    """
+    Выдача вопросов с весами по статистике ответов вместо порядка набора.
+    Для каждой сложности - свое дерево Фенвика; выдача идет с возвращением,
+    поэтому как часто выпадает вопрос, определяет его вес. Чтобы вопрос не
+    повторялся подряд, после выдачи он отдыхает: получает нулевой вес на
+    следующие COOLDOWN_DRAWS выдач своей группы и возвращается с весом по
+    свежей статистике. И выдача, и обновление веса стоят O(log n) даже на
+    сотнях тысяч вопросов.
+    Интерфейс совпадает с QuestionPool, поэтому Game использует их одинаково.
+    """
+
+    def __init__(self, question_manager, rng=None):
+        self.question_manager = question_manager
+        self.rng = rng or random.Random()
+        self.question_count = question_manager.get_question_count()
+        self.attempts = array('I', bytes(4 * self.question_count))
+        self.correct = array('I', bytes(4 * self.question_count))
+        self.served = bytearray((self.question_count + 7) // 8)  # Бит на вопрос: отдыхает после выдачи
+        self.difficulties = array('b', bytes(self.question_count))
+        self.local_index = array('I', bytes(4 * self.question_count))  # Номер вопроса в его группе
+        self.band_questions = {}  # сложность -> array('I') номеров вопросов
+        self.cooldowns = {}  # сложность -> deque недавно выданных вопросов группы (старые слева)
+
+        for question_id in range(self.question_count):
+            difficulty = question_manager.get_question_difficulty(question_id)
+            band = self.band_questions.setdefault(difficulty, array('I'))
+            self.difficulties[question_id] = difficulty
+            self.local_index[question_id] = len(band)
+            band.append(question_id)
+
+        self.trees = {}  # сложность -> FenwickTree
+        for difficulty, band in self.band_questions.items():
+            weight = question_weight(0, 0, self.target_accuracy(difficulty))
+            self.trees[difficulty] = FenwickTree([weight] * len(band))
+            self.cooldowns[difficulty] = deque(maxlen=min(COOLDOWN_DRAWS, len(band) // 2) or None)
+
+    @staticmethod
+    def target_accuracy(difficulty):
+        if difficulty in TARGET_ACCURACY:
+            return TARGET_ACCURACY[difficulty]
+        # Сложность вне шкалы - берем ближайшую из известных
+        nearest = min(TARGET_ACCURACY, key=lambda d: (abs(d - difficulty), d))
+        return TARGET_ACCURACY[nearest]
+
+    def is_served(self, question_id):
+        """Проверяет, отдыхает ли вопрос после недавней выдачи"""
+        return bool(self.served[question_id >> 3] & (1 << (question_id & 7)))
+
+    def weight(self, question_id):
+        """Вес вопроса по его статистике (без учета того, выдан ли он)"""
+        target = self.target_accuracy(self.difficulties[question_id])
+        return question_weight(self.correct[question_id], self.attempts[question_id], target)
+
+    def _nearest_band(self, difficulty):
+        """Ближайшая по сложности непустая группа"""
+        if difficulty in self.trees:
+            return difficulty
+        if not self.trees:
+            return None
+        return min(self.trees, key=lambda d: (abs(d - difficulty), d))
+
+    def _release(self, question_id):
+        """Вопрос отдохнул - возвращаем ему вес по текущей статистике"""
+        self.served[question_id >> 3] &= ~(1 << (question_id & 7)) & 0xFF
+        difficulty = self.difficulties[question_id]
+        self.trees[difficulty].set(self.local_index[question_id], self.weight(question_id))
+
+    def draw(self, difficulty):
+        """Выдает номер вопроса нужной сложности с учетом весов (кроме отдыхающих)"""
+        difficulty = self._nearest_band(difficulty)
+        if difficulty is None:
+            return None
+
+        band = self.band_questions[difficulty]
+        tree = self.trees[difficulty]
+        local = tree.find(self.rng.random() * tree.total())
+        if tree.get(local) == 0:
+            # Ошибка округления на краю дерева - берем последний неотдыхающий вопрос
+            local = max(i for i in range(len(band)) if tree.get(i) > 0)
+
+        question_id = band[local]
+        cooldown = self.cooldowns[difficulty]
+        if cooldown.maxlen is None:
+            return question_id  # Группа из одного вопроса - отдыхать некогда
+
+        tree.set(local, 0.0)
+        self.served[question_id >> 3] |= 1 << (question_id & 7)
+        if len(cooldown) == cooldown.maxlen:
+            self._release(cooldown[0])  # deque сам вытеснит его при append
+        cooldown.append(question_id)
+        return question_id
+
+    def return_question(self, question_id):
+        """Возвращает выданный, но так и не показанный вопрос: отдыхать ему незачем"""
+        if not self.is_served(question_id):
+            return
+        self.cooldowns[self.difficulties[question_id]].remove(question_id)
+        self._release(question_id)
+
+    def draw_for_level(self, level):
+        """Выдает номер вопроса для уровня лестницы"""
+        return self.draw(difficulty_for_level(level))
+
+    def draw_ladder(self, levels=15):
+        """Выдает номера вопросов на всю лестницу"""
+        return [self.draw_for_level(level) for level in range(1, levels + 1)]
+
+    def record_answer(self, question_id, is_correct):
+        """Учитывает ответ и пересчитывает вес вопроса за O(log n)"""
+        self.attempts[question_id] += 1
+        if is_correct:
+            self.correct[question_id] += 1
+        if not self.is_served(question_id):
+            difficulty = self.difficulties[question_id]
+            self.trees[difficulty].set(self.local_index[question_id], self.weight(question_id))
+        # Отдыхающий вопрос получит вес по этой статистике, когда вернется (_release)
@@ -1,9 +1,16 @@
+import os
 import tkinter as tk
 from core.theme_manager import ThemeManager
 from core.game import Game
+from core.question_manager import QuestionManager
+from core.question_bank import DEFAULT_BANK_PATH, find_newer_sources
+from core.journal import SessionJournal
+from core.response_times import ResponseTimeHistograms
+from core import save_slots
 from core.settings import Settings
+from core.persistence import WriteBehind
 from core.resources import SoundManager
-from core.constants import WINDOW_WIDTH, WINDOW_HEIGHT, BACKGROUND_MAP
+from core.constants import WINDOW_WIDTH, WINDOW_HEIGHT, BACKGROUND_MAP, QUESTIONS_POLL_INTERVAL
 from ui.main_menu import MainMenu
 from ui.game_screen import GameScreen
 
@@ -16,8 +23,12 @@ class MillionaireApp:
         self.theme_manager = ThemeManager()
 
         # Инициализация компонентов
-        self.settings = Settings()
-        self.game = Game()
+        self.settings = Settings(writer=WriteBehind())  # Настройки и рекорды пишутся в фоне
+        self.game = Game(self.create_question_manager())
+        self.game.attach_journal(SessionJournal())
+        self.game.restore_from_journal()  # После сбоя "ИГРАТЬ" продолжит прерванную игру
+        self.attach_question_stats()
+        self.game.attach_response_times(ResponseTimeHistograms())
         self.sound_manager = SoundManager()
         self.current_frame = None
         self.current_theme = 'dark'
@@ -40,6 +51,53 @@ class MillionaireApp:
         self.root.overrideredirect(True)
         self.show_main_menu()
 
+        # Ctrl+E - выгрузить гистограммы времени ответа
+        self.root.bind("<Control-e>", lambda event: self.export_response_times())
+
+        # Следим за правкой вопросов во время мероприятия
+        self.root.after(QUESTIONS_POLL_INTERVAL, self.poll_question_updates)
+
+    def create_question_manager(self):
+        """
+        Открывает скомпилированный банк вопросов, а если его нет или он старше
+        JSON-наборов - сами наборы (тогда работает и горячая перезагрузка).
+        """
+        if os.path.exists(DEFAULT_BANK_PATH):
+            try:
+                newer = find_newer_sources(DEFAULT_BANK_PATH)
+                if newer:
+                    print(f"Банк вопросов {DEFAULT_BANK_PATH} устарел (изменено после сборки: "
+                          f"{', '.join(path.name for path in newer)}) - используем JSON-наборы. "
+                          f"Пересоберите банк: python -m tools.question_tool validate --output")
+                else:
+                    return QuestionManager(bank_path=DEFAULT_BANK_PATH)
+            except Exception as e:
+                print(f"Ошибка открытия банка вопросов: {e}")
+        return QuestionManager(lazy=True)  # Наборы разбираются по мере надобности
+
+    def attach_question_stats(self):
+        """Включает статистику по вопросам (нужен NumPy; без него игра работает как раньше)"""
+        try:
+            from core.question_stats import QuestionStats
+            self.game.attach_question_stats(QuestionStats())
+        except ImportError as e:
+            print(f"Статистика вопросов недоступна: {e}")
+        except OSError as e:
+            print(f"Ошибка открытия статистики вопросов: {e}")
+
+    def export_response_times(self):
+        """Сохраняет гистограммы времени ответа в файл"""
+        try:
+            path = self.game.response_times.export_json()
+            print(f"Время ответов сохранено: {path}")
+        except OSError as e:
+            print(f"Ошибка сохранения времени ответов: {e}")
+
+    def poll_question_updates(self):
+        """Периодически проверяет файлы вопросов; новые версии применятся со следующей игры"""
+        self.game.question_manager.check_for_updates()
+        self.root.after(QUESTIONS_POLL_INTERVAL, self.poll_question_updates)
+
     def show_video_intro(self):
         """Показ видео заставки"""
         try:
@@ -81,6 +139,8 @@ class MillionaireApp:
 
         # Устанавливаем callback-функции
         self.current_frame.start_game_callback = self.start_game
+        self.current_frame.continue_game_callback = self.continue_saved_game
+        self.current_frame.blitz_callback = self.start_blitz
         self.current_frame.show_records_callback = self.show_records
         self.current_frame.switch_theme_callback = self.switch_theme
         self.current_frame.show_settings_callback = self.show_settings
@@ -98,7 +158,10 @@ class MillionaireApp:
         self.root.update_idletasks()
 
         # Важно: передаем параметр is_new_session в game
-        self.game.start_new_game(reset_questions=True, is_new_session=is_new_session)
+        if self.game.resume_pending:
+            self.game.resume_recovered_session()
+        else:
+            self.game.start_new_game(reset_questions=True, is_new_session=is_new_session)
 
         theme_bg = "game_dark" if self.theme_manager.current_theme == "dark" else "game_light"
         self.show_screen_with_background(GameScreen, BACKGROUND_MAP[theme_bg], self.game, self)
@@ -107,6 +170,43 @@ class MillionaireApp:
         self.sound_manager.set_music_volume(self.settings.music_volume)
         self.sound_manager.play_sound("game", loop=True)
 
+    def start_blitz(self):
+        """Запускает блиц: вопросы подряд на время"""
+        from ui.blitz_screen import BlitzScreen
+
+        theme_bg = "game_dark" if self.theme_manager.current_theme == "dark" else "game_light"
+        self.show_screen_with_background(BlitzScreen, BACKGROUND_MAP[theme_bg], self.game, self)
+
+        # Музыка запускается один раз на весь раунд
+        self.sound_manager.set_music_volume(self.settings.music_volume)
+        self.sound_manager.play_sound("game", loop=True)
+
+    def save_game(self, slot=1):
+        """Сохраняет текущую игру в слот ("продолжить позже")"""
+        try:
+            save_slots.save_slot(self.game, slot)
+        except OSError as e:
+            print(f"Ошибка сохранения игры: {e}")
+
+    def has_saved_game(self, slot=1):
+        return save_slots.slot_path(slot).exists()
+
+    def continue_saved_game(self, slot=1):
+        """
+        Продолжает игру из слота; сохранение одноразовое и после загрузки удаляется.
+        Сохранение, которое не загрузилось, тоже удаляется - иначе кнопка
+        "ПРОДОЛЖИТЬ" осталась бы в меню и каждый раз вела бы к той же ошибке.
+        """
+        loaded = save_slots.load_slot(self.game, slot)
+        save_slots.delete_slot(slot)
+        if loaded:
+            self.start_game(is_new_session=False)
+            return
+
+        self.show_main_menu()  # Меню перестраивается уже без кнопки "ПРОДОЛЖИТЬ"
+        from ui.dialog import show_info
+        show_info(self.root, "Сохраненную игру не удалось загрузить", "Внимание")
+
     def set_background(self, image_path):
         """Универсальный метод установки фона"""
         from core.background import BackgroundManager
@@ -203,7 +303,7 @@ class MillionaireApp:
         # используем ОБЩУЮ накопленную сумму
         total_prize = self.game.get_total_prize()
 
-        # Проверяем все ли 7 игр пройдены
+        # Проверяем, пройдены ли все наборы
         if self.game.is_final_win():
             try:
                 from ui.final_win_screen import FinalWinScreen
@@ -277,6 +377,11 @@ def main():
     root = tk.Tk()
     app = MillionaireApp(root)
     root.mainloop()
+    app.settings.writer.close()  # Дописываем отложенное перед выходом
+    app.game.close_session()  # Штатный выход - после запуска восстанавливать нечего
+    app.game.journal.close()
+    if app.game.question_stats is not None:
+        app.game.question_stats.close()
 
 
 if __name__ == "__main__":
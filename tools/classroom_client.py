@@ -0,0 +1,107 @@
+"""
+Простой терминальный клиент для сервера сессий (core.session_host).
+
+Запуск из корня проекта:
+    python -m tools.classroom_client [--host 127.0.0.1] [--port 8765]
+Ответ - номер варианта 1-4; подсказки: 50, друг, зал; выход - q.
+"""
+
+import argparse
+import json
+import socket
+import sys
+
+from core.session_host import DEFAULT_HOST, DEFAULT_PORT
+
+HINT_COMMANDS = {"50": "50_50", "друг": "call_friend", "зал": "audience_help"}
+
+
+class ClassroomClient:
+    """Соединение с сервером: одна строка JSON туда, одна обратно"""
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.socket = socket.create_connection((host, port))
+        self.stream = self.socket.makefile("rwb")
+        self.greeting = self._receive()
+
+    def request(self, cmd, **params):
+        params["cmd"] = cmd
+        self.stream.write(json.dumps(params, ensure_ascii=False).encode("utf-8") + b"\n")
+        self.stream.flush()
+        return self._receive()
+
+    def _receive(self):
+        line = self.stream.readline()
+        if not line:
+            raise ConnectionError("Сервер закрыл соединение")
+        return json.loads(line)
+
+    def close(self):
+        self.stream.close()
+        self.socket.close()
+
+
+def show_question(response):
+    print(f"\nНабор {response['set']}, вопрос {response['level']} на {response['prize']:,} руб.")
+    print(response["question"])
+    for i, option in enumerate(response["options"], 1):
+        print(f"  {i}. {option}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m tools.classroom_client", description="Клиент режима класса")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args(argv)
+
+    client = ClassroomClient(args.host, args.port)
+    if not client.greeting.get("ok"):
+        print(client.greeting.get("error"))
+        return 1
+
+    response = client.request("new_game")
+    try:
+        while True:
+            if not response.get("ok"):
+                print(response.get("error"))
+                response = client.request("question")
+                if not response.get("ok"):
+                    return 1
+            if "question" in response:
+                show_question(response)
+            elif response.get("final"):
+                print(f"Все наборы пройдены! Итог: {response['winnings']:,} руб.")
+                return 0
+
+            command = input("> ").strip().lower()
+            if command == "q":
+                return 0
+            if command in HINT_COMMANDS:
+                hint = client.request("hint", name=HINT_COMMANDS[command])
+                if hint.get("ok"):
+                    print({key: value for key, value in hint.items() if key != "ok"})
+                else:
+                    print(hint.get("error"))
+                response = client.request("question")
+                continue
+            if not command.isdigit():
+                print("Введите номер варианта 1-4, 50, друг, зал или q")
+                response = client.request("question")
+                continue
+
+            response = client.request("answer", option=int(command) - 1)
+            if not response.get("ok"):
+                continue
+            if not response["correct"]:
+                print(f"Неверно! Правильный ответ: {response['correct_answer'] + 1}. "
+                      f"Выигрыш: {response['winnings']:,} руб.")
+                return 0
+            if response.get("set_won"):
+                print(f"Набор пройден! Всего: {response['winnings']:,} руб.")
+                response = client.request("next_set")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+"""
+Инструменты для наборов вопросов.
+
+Запуск из корня проекта:
+    python -m tools.question_tool validate [папка] [--output data/questions.mqb]
+    python -m tools.question_tool dedup [папка] [--index data/dedup_index.json]
+    python -m tools.question_tool import выгрузка.csv|выгрузка.jsonl [--questions-dir папка | --bank файл]
+    python -m tools.question_tool search "запрос" [папка | --bank файл] [--index data/search_index.pickle]
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from core.question_bank import BankWriter, DEFAULT_BANK_PATH
+from core.question_dedup import DEFAULT_THRESHOLD, NearDuplicateIndex
+from core.question_importer import SET_SIZE, import_questions
+from core.question_manager import QuestionManager, list_question_files
+from core.question_search import DEFAULT_INDEX_PATH, QuestionSearchIndex
+from core.question_validator import validate_file
+
+
+def positive_int(value):
+    """Тип аргумента argparse: целое число от 1"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"ожидается целое число, получено: {value}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"должно быть не меньше 1, получено: {number}")
+    return number
+
+
+def validate_command(args):
+    """Параллельно проверяет все наборы и при успехе собирает банк"""
+    files = list_question_files(args.questions_dir)
+    if not files:
+        print(f"Наборы не найдены: {args.questions_dir}")
+        return 1
+
+    workers = args.workers or os.cpu_count() or 1
+    chunksize = max(1, len(files) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # map сохраняет порядок файлов - он же порядок наборов в банке
+        results = list(pool.map(validate_file, files, chunksize=chunksize))
+
+    failed = 0
+    total = 0
+    for name, problems, questions in results:
+        total += len(questions)
+        if problems:
+            failed += 1
+            print(f"  ❌ {name}")
+            for problem in problems:
+                print(f"      {problem}")
+        elif args.verbose:
+            print(f"  ✓ {name} ({len(questions)} вопросов)")
+
+    print(f"Проверено наборов: {len(results)}, с ошибками: {failed}, корректных вопросов: {total}")
+
+    if not args.output:
+        return 1 if failed else 0
+    if failed and not args.force:
+        print("Банк не собран: исправьте ошибки или используйте --force")
+        return 1
+
+    writer = BankWriter(args.output)
+    try:
+        for name, _, questions in results:
+            if questions:
+                writer.begin_set(name)
+                for question in questions:
+                    writer.add_question(question)
+        print(f"Банк {args.output} собран: {writer.close()} вопросов")
+    finally:
+        writer.discard()
+    return 1 if failed else 0
+
+
+def dedup_command(args):
+    """Ищет похожие вопросы; с --index проверяет только наборы, которых еще нет в индексе"""
+    if args.index and os.path.exists(args.index) and not args.rebuild:
+        index = NearDuplicateIndex.load(args.index, args.threshold)
+    else:
+        index = NearDuplicateIndex(args.threshold if args.threshold is not None else DEFAULT_THRESHOLD)
+
+    known_sets = index.set_names()
+    found = []
+    added = 0
+    for file in list_question_files(args.questions_dir):
+        if file.stem in known_sets:
+            continue
+        try:
+            with open(file, "r", encoding="utf-8") as f:
+                questions = json.load(f)
+        except Exception as e:
+            print(f"  ❌ Ошибка загрузки {file.name}: {e}")
+            continue
+        if not isinstance(questions, list):
+            print(f"  ⚠ {file.name} - не набор вопросов, пропускаем")
+            continue
+        found.extend(index.add_set(file.stem, questions))
+        added += 1
+
+    for (set_name, number), (other_set, other_number), similarity in found:
+        print(f"  ⚠ {set_name} #{number} ~ {other_set} #{other_number} (сходство {similarity:.0%})")
+    print(f"Новых наборов: {added}, вопросов в индексе: {len(index)}, похожих пар: {len(found)}")
+
+    if args.index:
+        index.save(args.index)
+    return 1 if found else 0
+
+
+def import_command(args):
+    """Потоково импортирует выгрузку в наборы или банк"""
+    stats = import_questions(args.source, args.questions_dir, args.bank, args.set_size)
+    target = args.bank or args.questions_dir
+    print(f"Импортировано вопросов: {stats['imported']}, пропущено: {stats['skipped']}, "
+          f"наборов: {stats['sets']} -> {target}")
+    return 1 if stats['skipped'] else 0
+
+
+def search_command(args):
+    """Ищет вопросы по тексту и вариантам ответов"""
+    if args.bank:
+        manager = QuestionManager(bank_path=args.bank)
+    else:
+        manager = QuestionManager(args.questions_dir, lazy=True)
+    # Индекс с диска; заново индексируются только изменившиеся наборы
+    index = QuestionSearchIndex.load_or_build(manager, args.index)
+
+    results = index.search(args.query, args.limit)
+    for (set_name, number), question, score in results:
+        print(f"  {score:6.2f}  {set_name} #{number}: {question}")
+    print(f"Найдено: {len(results)} (вопросов в индексе: {len(index)})")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m tools.question_tool", description="Инструменты для наборов вопросов")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    validate = commands.add_parser("validate", help="проверить наборы и собрать банк")
+    validate.add_argument("questions_dir", nargs="?", default="data/questions")
+    validate.add_argument("-o", "--output", nargs="?", const=DEFAULT_BANK_PATH,
+                          help=f"собрать нормализованный банк (по умолчанию {DEFAULT_BANK_PATH})")
+    validate.add_argument("-j", "--workers", type=int, help="число процессов")
+    validate.add_argument("-f", "--force", action="store_true", help="собрать банк без вопросов с ошибками")
+    validate.add_argument("-v", "--verbose", action="store_true", help="показывать и корректные наборы")
+    validate.set_defaults(handler=validate_command)
+
+    dedup = commands.add_parser("dedup", help="найти похожие вопросы")
+    dedup.add_argument("questions_dir", nargs="?", default="data/questions")
+    dedup.add_argument("-i", "--index", help="файл индекса для инкрементальной проверки")
+    dedup.add_argument("-t", "--threshold", type=float, help=f"порог сходства (по умолчанию {DEFAULT_THRESHOLD})")
+    dedup.add_argument("--rebuild", action="store_true", help="построить индекс заново")
+    dedup.set_defaults(handler=dedup_command)
+
+    importer = commands.add_parser("import", help="импортировать выгрузку CSV/JSONL")
+    importer.add_argument("source", help="файл .csv (question, option1..option4, correct_answer, difficulty) или .jsonl")
+    target = importer.add_mutually_exclusive_group()
+    target.add_argument("-d", "--questions-dir", default="data/questions", help="папка для новых setN.json")
+    target.add_argument("-b", "--bank", help="собрать банк вместо JSON-наборов")
+    importer.add_argument("-s", "--set-size", type=positive_int, default=SET_SIZE, help=f"вопросов в наборе (по умолчанию {SET_SIZE})")
+    importer.set_defaults(handler=import_command)
+
+    search = commands.add_parser("search", help="поиск вопросов по тексту")
+    search.add_argument("query")
+    search.add_argument("questions_dir", nargs="?", default="data/questions")
+    search.add_argument("-b", "--bank", help="искать в скомпилированном банке")
+    search.add_argument("-n", "--limit", type=int, default=20, help="сколько результатов показать")
+    search.add_argument("-i", "--index", default=DEFAULT_INDEX_PATH,
+                        help=f"файл поискового индекса (по умолчанию {DEFAULT_INDEX_PATH})")
+    search.set_defaults(handler=search_command)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
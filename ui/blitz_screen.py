@@ -0,0 +1,129 @@
+import math
+import tkinter as tk
+from tkinter import font as tkfont
+
+from core.blitz import BLITZ_DURATION
+from ui.game_screen import GameScreen
+
+TIMER_TICK_MS = 100
+
+
+class BlitzScreen(GameScreen):
+    """
+    Блиц на основе игрового экрана: после ответа сразу следующий вопрос.
+    Нет паузы на звук и перезапуска музыки, а виджеты не пересоздаются -
+    у вопроса и кнопок меняется только текст.
+    """
+
+    def __init__(self, master, game, app, duration=BLITZ_DURATION):
+        self.round = game.start_blitz(duration)
+        self.timer_label = None
+        self.score_label = None
+        self._shown_seconds = None
+        self._timer_job = None
+        super().__init__(master, game, app)
+
+        self.hints_frame.pack_forget()  # В блице подсказок нет
+        self._timer_job = self.after(TIMER_TICK_MS, self.tick)
+
+    def create_prize_scale(self):
+        """Вместо лестницы призов - таймер и счет"""
+        tk.Label(
+            self.prize_scale,
+            text="БЛИЦ",
+            font=tkfont.Font(size=20, weight="bold"),
+            bg="#120A2F",
+            fg="#FFD700"
+        ).pack(pady=10)
+
+        self.timer_label = tk.Label(
+            self.prize_scale,
+            text="",
+            font=tkfont.Font(size=48, weight="bold"),
+            bg="#120A2F",
+            fg="white",
+            width=4
+        )
+        self.timer_label.pack(pady=20)
+
+        self.score_label = tk.Label(
+            self.prize_scale,
+            text="Верно: 0",
+            font=tkfont.Font(size=18, weight="bold"),
+            bg="#120A2F",
+            fg="#FFD700"
+        )
+        self.score_label.pack(pady=10)
+
+    def load_question(self):
+        """Показывает следующий готовый вопрос, меняя только текст виджетов"""
+        if self.round.started_at is None:
+            question = self.round.start()
+        else:
+            question = self.round.next_question()
+        if question is None:
+            self.finish()
+            return
+
+        text, options, _ = question
+        self.question_label.config(text=text)
+        for button, option in zip(self.answer_buttons, options):
+            button.config(text=option)
+
+    def update_prize_scale(self):
+        """Лестницы призов в блице нет"""
+
+    def check_answer(self, answer_index):
+        """Засчитывает ответ и сразу показывает следующий вопрос"""
+        if self.round.is_over():
+            return False
+
+        is_correct = self.round.answer(answer_index)
+        self.score_label.config(text=f"Верно: {self.round.correct}", fg="#01e489" if is_correct else "#e74c3c")
+
+        if self.round.is_over():
+            self.finish()
+        else:
+            self.load_question()
+            self.after_idle(self.round.refill)  # Очередь пополняется, когда интерфейс свободен
+        return is_correct
+
+    def tick(self):
+        """Обновляет таймер (виджет меняется, только когда сменилась секунда)"""
+        self._timer_job = None
+        if self.round.is_over():
+            self.finish()
+            return
+
+        seconds = math.ceil(self.round.time_left())
+        if seconds != self._shown_seconds:
+            self._shown_seconds = seconds
+            self.timer_label.config(text=str(seconds), fg="#e74c3c" if seconds <= 10 else "white")
+        self._timer_job = self.after(TIMER_TICK_MS, self.tick)
+
+    def finish(self):
+        """Раунд окончен: показываем итог"""
+        if self._timer_job is not None:
+            self.after_cancel(self._timer_job)
+            self._timer_job = None
+        self.timer_label.config(text="0")
+        for button in self.answer_buttons:
+            button.config(state=tk.DISABLED)
+        self.question_label.config(
+            text=f"Время вышло! Верных ответов: {self.round.correct} из {self.round.answered}"
+        )
+
+    def back_to_menu(self):
+        """Возвращает в главное меню (блиц не сохраняется)"""
+        if self._timer_job is not None:
+            self.after_cancel(self._timer_job)
+            self._timer_job = None
+        self.app.settings.save_settings()
+        self.app.sound_manager.stop_all_sounds()
+        self.app.show_main_menu()
+
+    def destroy(self):
+        if self._timer_job is not None:
+            self.after_cancel(self._timer_job)
+            self._timer_job = None
+        super().destroy()
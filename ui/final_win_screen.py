@@ -1,6 +1,7 @@
 import tkinter as tk
 from core.constants import WINDOW_WIDTH, WINDOW_HEIGHT
 from PIL import Image, ImageTk
+from ui.win_lose_screens import background_size, prepare_background
 import os
 
 
@@ -21,16 +22,14 @@ class FinalWinScreen(tk.Frame):
         self.play_win_end_sound()
 
     def load_background(self):
-        """Загружает фоновую картинку win_out.png"""
+        """Загружает фоновую картинку win_out.png (обычно уже подготовленную во время паузы)"""
         image_path = "assets/backgrounds/win_out.png"
         if os.path.exists(image_path):
             self.master.update_idletasks()
-            width = self.master.winfo_width() or WINDOW_WIDTH
-            height = self.master.winfo_height() or WINDOW_HEIGHT
+            width, height = background_size(self.master)
             self.canvas.config(width=width, height=height)
 
-            img = Image.open(image_path)
-            img = img.resize((width, height), Image.Resampling.LANCZOS)
+            img = prepare_background(image_path, width, height)
             self.bg_image = ImageTk.PhotoImage(img)
             self.canvas.create_image(0, 0, image=self.bg_image, anchor="nw")
         else:
@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import font as tkfont
-import random
+import threading
+from core import hints
 
 
 class GameScreen(tk.Frame):
@@ -97,8 +98,8 @@ class GameScreen(tk.Frame):
             self.answer_buttons.append(btn)
 
         # Панель с подсказками
-        hints_frame = tk.Frame(self.center_frame, bg=self.get_theme_color('bg'))
-        hints_frame.pack(pady=10)
+        self.hints_frame = tk.Frame(self.center_frame, bg=self.get_theme_color('bg'))
+        self.hints_frame.pack(pady=10)
 
         hints = [
             (" 50  НА  50 ", self.fifty_fifty),
@@ -108,7 +109,7 @@ class GameScreen(tk.Frame):
 
         for text, command in hints:
             btn = tk.Button(
-                hints_frame,
+                self.hints_frame,
                 text=text,
                 font=tkfont.Font(size=20, weight="bold"),
                 bg="#01e489",
@@ -168,8 +169,7 @@ class GameScreen(tk.Frame):
         for btn in self.answer_buttons:
             btn.config(state=tk.DISABLED)
 
-        correct_index = self.game.current_question["correct_answer"]
-        is_correct = (answer_index == correct_index)
+        is_correct = self.game.check_answer(answer_index)
 
         if is_correct:
             # Увеличиваем выигрыш текущей игры
@@ -184,11 +184,37 @@ class GameScreen(tk.Frame):
             self.app.sound_manager.play_sound("wrong")
             self.after(8000, self.handle_wrong_answer)
 
+        # Пока играет звук, готовим то, что понадобится после паузы
+        self.after_idle(lambda: self.prefetch(is_correct))
+
         return is_correct
 
+    def prefetch(self, is_correct):
+        """Готовит следующий вопрос, следующий набор или фон экрана победы/проигрыша"""
+        if is_correct and self.game.current_level < 15:
+            self.game.prefetch_next_question()
+            if self.game.current_level >= 14:
+                self.game.question_manager.warm_next_set()
+            return
+
+        if is_correct:
+            self.game.question_manager.warm_next_set()
+            name = "win_out" if self.game.is_final_win() else "win"
+        else:
+            name = "lose"
+
+        from ui.win_lose_screens import background_size, prepare_background
+        width, height = background_size(self.master)
+        # Масштабирование картинки - самая долгая часть, уводим его из потока интерфейса
+        threading.Thread(
+            target=prepare_background,
+            args=(f"assets/backgrounds/{name}.png", width, height),
+            daemon=True
+        ).start()
+
     def handle_correct_answer(self):
         """Обрабатывает правильный ответ"""
-        self.game.current_level += 1
+        self.game.advance_level()
 
         if self.game.current_level > 15:
             # Завершили текущий набор - переходим к победе
@@ -208,13 +234,11 @@ class GameScreen(tk.Frame):
 
         question = self.game.current_question
         correct = question["correct_answer"]
-        wrong_answers = [i for i in range(4) if i != correct]
-        random.shuffle(wrong_answers)
 
-        for i in wrong_answers[:2]:
+        for i in hints.fifty_fifty(correct):
             self.answer_buttons[i].config(state=tk.DISABLED)
 
-        self.game.used_hints["50_50"] = True
+        self.game.use_hint("50_50")
 
     def call_friend(self):
         """Подсказка 'Звонок другу'"""
@@ -224,16 +248,16 @@ class GameScreen(tk.Frame):
         question = self.game.current_question
         correct = question["correct_answer"]
 
-        if random.random() < 0.8:
-            message = f"Друг говорит: 'Я уверен, это вариант {correct + 1}!'"
+        answer, confident = hints.call_friend(correct)
+        if confident:
+            message = f"Друг говорит: 'Я уверен, это вариант {answer + 1}!'"
         else:
-            random_answer = random.choice([i for i in range(4) if i != correct])
-            message = f"Друг говорит: 'Мне кажется, это вариант {random_answer + 1}...'"
+            message = f"Друг говорит: 'Мне кажется, это вариант {answer + 1}...'"
 
         from ui.dialog import show_info
         show_info(self.master, message, "Звонок другу")
 
-        self.game.used_hints["call_friend"] = True
+        self.game.use_hint("call_friend")
 
     def audience_help(self):
         """Подсказка 'Помощь зала'"""
@@ -243,10 +267,7 @@ class GameScreen(tk.Frame):
         question = self.game.current_question
         correct = question["correct_answer"]
 
-        votes = [random.randint(5, 25) for _ in range(4)]
-        votes[correct] += random.randint(30, 60)
-        total = sum(votes)
-        percentages = [round((v / total) * 100) for v in votes]
+        percentages = hints.audience_help(correct)
 
         message = "Зал голосует:\n\n"
         for i, percent in enumerate(percentages):
@@ -256,11 +277,14 @@ class GameScreen(tk.Frame):
         from ui.dialog import show_info
         show_info(self.master, message, "Помощь зала")
 
-        self.game.used_hints["audience_help"] = True
+        self.game.use_hint("audience_help")
 
     def back_to_menu(self):
         """Возвращает в главное меню"""
         # Сохраняем настройки перед выходом из игры
         self.app.settings.save_settings()
+        if not self.answer_clicked:
+            self.app.save_game()  # Игру можно будет продолжить с этого вопроса
+        self.game.close_session()
         self.app.sound_manager.stop_all_sounds()
         self.app.show_main_menu()
@@ -1,9 +1,53 @@
 import tkinter as tk
 from tkinter import font as tkfont
 from core.constants import WINDOW_WIDTH, WINDOW_HEIGHT
+from core.records_log import PAGE_SIZE, week_start
 from PIL import Image, ImageTk
 import os
 
+ROW_STEP = 34  # Расстояние между строками таблицы
+VISIBLE_ROWS = PAGE_SIZE  # Сколько строк на экране (столько текстовых элементов и создается)
+FETCH_ROWS = 50  # Сколько результатов запрашивать за раз при прокрутке
+DRAG_RENDER_DELAY = 30  # мс: перетаскивание ползунка перерисовывает строки не чаще этого
+
+
+class RecordWindow:
+    """
+    Окно в хранилище рекордов: держит только блок результатов вокруг видимых
+    строк и дозапрашивает следующий блок при прокрутке. Сколько бы ни было
+    рекордов, в памяти - один блок, а открытие запрашивает только первую
+    страницу (у журнала она берется из кучи лучших, у SQLite - по индексу).
+    """
+
+    def __init__(self, settings, fetch_rows=FETCH_ROWS):
+        self.settings = settings
+        self.fetch_rows = fetch_rows
+        self.filters = {}
+        self.total = 0
+        self._block_start = 0
+        self._block = []
+
+    def set_filters(self, **filters):
+        self.filters = filters
+        self.total = self.settings.count_records(**filters)
+        self._block_start = 0
+        self._block = []
+
+    def rows(self, first, count):
+        """Результаты с номерами first..first+count-1 (меньше - если кончились)"""
+        last = min(first + count, self.total)
+        if first < self._block_start or last > self._block_start + len(self._block):
+            if not self._block:
+                start, limit = first, count  # Первый показ - только видимые строки
+            else:
+                # Блоки выровнены по fetch_rows и перекрываются на count строк,
+                # поэтому прокрутка по одной строке не делает запросов
+                start = first - first % self.fetch_rows
+                limit = self.fetch_rows + count
+            self._block = self.settings.query_records(offset=start, limit=limit, **self.filters)
+            self._block_start = start
+        return self._block[first - self._block_start:last - self._block_start]
+
 
 class LeaderboardScreen(tk.Frame):
     def __init__(self, master, settings):
@@ -13,6 +57,23 @@ class LeaderboardScreen(tk.Frame):
         self.pack(expand=True, fill=tk.BOTH)
         self.bg_image = None
 
+        # Текущая выборка: вкладка, игрок (клик по имени) и первая видимая строка
+        self.mode = "top"  # "top" - лучшие за все время, "week" - лучшие за неделю
+        self.player = None
+        self.first_row = 0
+        self.window = RecordWindow(settings)
+        self.row_items = []  # Текстовые элементы строк - создаются один раз и переиспользуются
+        self.row_names = []  # Имя игрока в каждой видимой строке (для клика)
+        self.player_item = None
+        self.empty_item = None
+        self.scroll_thumb = None
+        self._drag_job = None  # Отложенная перерисовка при перетаскивании ползунка
+        self.track_top = self.track_bottom = 0
+        self.tab_buttons = {}
+        self.page_label = None
+        self.prev_btn = None
+        self.next_btn = None
+
         # Создаем Canvas для фоновой картинки
         self.canvas = tk.Canvas(self, highlightthickness=0, width=WINDOW_WIDTH, height=WINDOW_HEIGHT)
         self.canvas.pack(fill=tk.BOTH, expand=True)
@@ -41,8 +102,6 @@ class LeaderboardScreen(tk.Frame):
             self.canvas.create_image(0, 0, image=self.bg_image, anchor="nw")
 
     def create_widgets(self):
-        text_color = "white"  # Белый
-
         # Заголовок в первой четверти экрана
         title_font = tkfont.Font(size=48, weight="bold")
         self.canvas.create_text(
@@ -61,36 +120,85 @@ class LeaderboardScreen(tk.Frame):
         )
         self.canvas.tag_lower(title_bg)  # Под текст
 
-        # Получаем записи
-        records = self.settings.get_records()
-        y_position = WINDOW_HEIGHT // 4  # Начальная позиция для записей
-
-        if not records:
-            # Нет рекордов
-            no_records_font = tkfont.Font(size=28)
-            self.canvas.create_text(
-                WINDOW_WIDTH // 2,
-                y_position,
-                text="РЕКОРДОВ ПОКА НЕТ",
-                font=no_records_font,
-                fill=text_color,
+        # Вкладки выборки
+        tab_font = tkfont.Font(size=16, weight="bold")
+        tabs = (("top", "ЛУЧШИЕ"), ("week", "ЗА НЕДЕЛЮ"))
+        for i, (mode, title) in enumerate(tabs):
+            button = tk.Button(
+                self.canvas,
+                text=title,
+                font=tab_font,
+                fg="white",
+                width=12,
+                command=lambda m=mode: self.set_mode(m)
+            )
+            self.canvas.create_window(
+                WINDOW_WIDTH // 2 + (i * 2 - 1) * 110,
+                WINDOW_HEIGHT // 6 + 60,
+                window=button,
                 anchor="center"
             )
+            self.tab_buttons[mode] = button
 
-        else:
-            # Есть рекорды
-            record_font = tkfont.Font(size=18)
-            for i, record in enumerate(records, 1):
-                record_text = f"{i}. {record['name']} - {record['score']} руб. (дата: {record.get('date', 'неизвестно')})"
-                self.canvas.create_text(
-                    WINDOW_WIDTH // 2,
-                    y_position,
-                    text=record_text,
-                    font=record_font,
-                    fill=text_color,
-                    anchor="center"
-                )
-                y_position += 40  # Отступ между записями
+        # Строки таблицы: VISIBLE_ROWS элементов, при прокрутке меняется только их текст
+        top_y = WINDOW_HEIGHT // 4 + 20
+        self.player_item = self.canvas.create_text(
+            WINDOW_WIDTH // 2, top_y, text="", font=tkfont.Font(size=16, slant="italic"),
+            fill="#FFD700", anchor="center", state=tk.HIDDEN
+        )
+        self.canvas.tag_bind(self.player_item, "<Button-1>", lambda event: self.set_player(None))
+        self.empty_item = self.canvas.create_text(
+            WINDOW_WIDTH // 2, top_y + ROW_STEP, text="РЕКОРДОВ ПОКА НЕТ", font=tkfont.Font(size=28),
+            fill="white", anchor="center", state=tk.HIDDEN
+        )
+        record_font = tkfont.Font(size=18)
+        for i in range(VISIBLE_ROWS):
+            item = self.canvas.create_text(
+                WINDOW_WIDTH // 2, top_y + ROW_STEP * (i + 1), text="", font=record_font,
+                fill="white", anchor="center"
+            )
+            # Клик по строке - все результаты этого игрока
+            self.canvas.tag_bind(item, "<Button-1>", lambda event, row=i: self.on_row_click(row))
+            self.row_items.append(item)
+            self.row_names.append(None)
+
+        # Полоса прокрутки справа от строк: дорожка и ползунок
+        track_x = WINDOW_WIDTH // 2 + 420
+        self.track_top = top_y + ROW_STEP // 2
+        self.track_bottom = top_y + ROW_STEP * VISIBLE_ROWS + ROW_STEP // 2
+        track = self.canvas.create_rectangle(
+            track_x - 4, self.track_top, track_x + 4, self.track_bottom, fill="#120A2F", outline=""
+        )
+        self.canvas.tag_bind(track, "<Button-1>", self.on_track_click)
+        self.scroll_thumb = self.canvas.create_rectangle(
+            track_x - 4, self.track_top, track_x + 4, self.track_bottom, fill="#FFD700", outline=""
+        )
+        self.canvas.tag_bind(self.scroll_thumb, "<B1-Motion>", self.on_track_click)
+
+        # Листание страниц
+        nav_font = tkfont.Font(size=18, weight="bold")
+        nav_y = top_y + ROW_STEP * (VISIBLE_ROWS + 1) + 20
+        self.prev_btn = tk.Button(self.canvas, text="◀", font=nav_font, width=3,
+                                  command=lambda: self.scroll_rows(-VISIBLE_ROWS))
+        self.next_btn = tk.Button(self.canvas, text="▶", font=nav_font, width=3,
+                                  command=lambda: self.scroll_rows(VISIBLE_ROWS))
+        self.canvas.create_window(WINDOW_WIDTH // 2 - 200, nav_y, window=self.prev_btn, anchor="center")
+        self.canvas.create_window(WINDOW_WIDTH // 2 + 200, nav_y, window=self.next_btn, anchor="center")
+        self.page_label = self.canvas.create_text(
+            WINDOW_WIDTH // 2, nav_y, text="", font=tkfont.Font(size=16), fill="white", anchor="center"
+        )
+
+        # Прокрутка колесом мыши и клавишами
+        self.canvas.bind("<MouseWheel>", lambda event: self.scroll_rows(-1 if event.delta > 0 else 1))
+        self.canvas.bind("<Button-4>", lambda event: self.scroll_rows(-1))  # Колесо в Linux
+        self.canvas.bind("<Button-5>", lambda event: self.scroll_rows(1))
+        self.canvas.bind("<Up>", lambda event: self.scroll_rows(-1))
+        self.canvas.bind("<Down>", lambda event: self.scroll_rows(1))
+        self.canvas.bind("<Prior>", lambda event: self.scroll_rows(-VISIBLE_ROWS))
+        self.canvas.bind("<Next>", lambda event: self.scroll_rows(VISIBLE_ROWS))
+        self.canvas.focus_set()
+
+        self.reload()
 
         # Кнопка НАЗАД в нижней четверти экрана
         back_btn = tk.Button(
@@ -104,14 +212,106 @@ class LeaderboardScreen(tk.Frame):
             command=self.back_to_menu
         )
 
-        # Размещаем кнопку на 3/4 высоты экрана
+        # Размещаем кнопку под таблицей
         self.canvas.create_window(
             WINDOW_WIDTH // 2,
-            WINDOW_HEIGHT * 2 // 3,
+            WINDOW_HEIGHT * 5 // 6,
             window=back_btn,
             anchor="center"
         )
 
+    def query_filters(self):
+        """Фильтры текущей выборки для settings.query_records"""
+        since = week_start() if self.mode == "week" else None
+        return {"since": since, "name": self.player}
+
+    def reload(self):
+        """Заново считает выборку (сменились вкладка или игрок) и показывает ее начало"""
+        self.window.set_filters(**self.query_filters())
+        self.first_row = 0
+        self.render()
+
+    def render(self):
+        """Перерисовывает видимые строки, меняя только текст существующих элементов"""
+        total = self.window.total
+        self.first_row = max(0, min(self.first_row, total - VISIBLE_ROWS))
+        records = self.window.rows(self.first_row, VISIBLE_ROWS)
+
+        for i, item in enumerate(self.row_items):
+            if i < len(records):
+                record = records[i]
+                record_text = (f"{self.first_row + i + 1}. {record['name']} - {record['score']} руб. "
+                               f"(дата: {record.get('date', 'неизвестно')})")
+                self.canvas.itemconfig(item, text=record_text, state=tk.NORMAL)
+                self.row_names[i] = record["name"]
+            else:
+                self.canvas.itemconfig(item, text="", state=tk.HIDDEN)
+                self.row_names[i] = None
+
+        if self.player is not None:
+            self.canvas.itemconfig(self.player_item, text=f"Игрок: {self.player} (нажмите, чтобы показать всех)",
+                                   state=tk.NORMAL)
+        else:
+            self.canvas.itemconfig(self.player_item, state=tk.HIDDEN)
+        self.canvas.itemconfig(self.empty_item, state=tk.HIDDEN if records else tk.NORMAL)
+
+        last = self.first_row + len(records)
+        self.canvas.itemconfig(
+            self.page_label, text=f"{self.first_row + 1}-{last} из {total}" if records else ""
+        )
+        self.prev_btn.config(state=tk.NORMAL if self.first_row > 0 else tk.DISABLED)
+        self.next_btn.config(state=tk.NORMAL if last < total else tk.DISABLED)
+        for mode, button in self.tab_buttons.items():
+            button.config(bg="#FFD700" if mode == self.mode else "#120A2F",
+                          fg="#120A2F" if mode == self.mode else "white")
+        self.update_scroll_thumb()
+
+    def update_scroll_thumb(self):
+        """Ползунок: его длина - доля видимых строк, положение - первая видимая строка"""
+        total = self.window.total
+        height = self.track_bottom - self.track_top
+        if total <= VISIBLE_ROWS:
+            self.canvas.itemconfig(self.scroll_thumb, state=tk.HIDDEN)
+            return
+        thumb = max(12, height * VISIBLE_ROWS // total)
+        top = self.track_top + (height - thumb) * self.first_row // (total - VISIBLE_ROWS)
+        x1, _, x2, _ = self.canvas.coords(self.scroll_thumb)
+        self.canvas.coords(self.scroll_thumb, x1, top, x2, top + thumb)
+        self.canvas.itemconfig(self.scroll_thumb, state=tk.NORMAL)
+
+    def scroll_rows(self, step):
+        self.first_row += step
+        self.render()
+
+    def on_track_click(self, event):
+        """
+        Переход к месту выборки по клику (или перетаскиванию) на полосе прокрутки.
+        Ползунок двигается сразу, а строки перерисовываются одним запросом для
+        последнего положения: события движения мыши между ними не запрашивают блоки.
+        """
+        fraction = (event.y - self.track_top) / max(1, self.track_bottom - self.track_top)
+        self.first_row = int(max(0.0, min(1.0, fraction)) * max(0, self.window.total - VISIBLE_ROWS))
+        self.update_scroll_thumb()
+        if self._drag_job is None:
+            self._drag_job = self.after(DRAG_RENDER_DELAY, self._render_drag)
+
+    def _render_drag(self):
+        self._drag_job = None
+        if self.winfo_exists():
+            self.render()
+
+    def on_row_click(self, row):
+        if self.row_names[row] is not None:
+            self.set_player(self.row_names[row])
+
+    def set_mode(self, mode):
+        self.mode = mode
+        self.reload()
+
+    def set_player(self, name):
+        self.player = name
+        self.reload()
+
     def back_to_menu(self):
         root = self.master.winfo_toplevel()
         app = root.millionaire_app
@@ -16,6 +16,8 @@ class MainMenu(tk.Frame):
 
         # Callback-функции
         self.start_game_callback = None
+        self.continue_game_callback = None
+        self.blitz_callback = None
         self.show_records_callback = None
         self.switch_theme_callback = None
         self.show_settings_callback = None
@@ -58,7 +60,7 @@ class MainMenu(tk.Frame):
         btn_style = {
             "font": btn_font,
             "width": 18,
-            "height": 2,
+            "height": 1,  # До семи кнопок (блиц, продолжение) - высота в строку, чтобы меню помещалось в окно
             "bd": 3,
             "relief": "raised",
             "cursor": "hand2"
@@ -67,10 +69,13 @@ class MainMenu(tk.Frame):
         # Список кнопок (УБИРАЕМ ТЕСТОВУЮ КНОПКУ)
         buttons = [
             ("ИГРАТЬ", self.start_game, False),
+            ("БЛИЦ", self.start_blitz, False),
             ("РЕКОРДЫ", self.show_records, False),
             ("НАСТРОЙКИ", self.show_settings, False),
             ("ВЫХОД", self.exit_game, True)
         ]
+        if self.app.has_saved_game():
+            buttons.insert(1, ("ПРОДОЛЖИТЬ", self.continue_game, False))
 
         # Цвета кнопок
         normal_color = self.get_theme_color('btn')
@@ -110,7 +115,7 @@ class MainMenu(tk.Frame):
             btn.bind("<ButtonPress-1>", lambda e, b=btn, a=active_bg: b.config(bg=a))
             btn.bind("<ButtonRelease-1>", lambda e, b=btn, h=hover_bg: b.config(bg=h))
 
-            btn.pack(pady=12)
+            btn.pack(pady=10, ipady=6)
 
     def _darken_color(self, color, factor):
         """Затемняет цвет на указанный коэффициент"""
@@ -131,6 +136,16 @@ class MainMenu(tk.Frame):
         if self.start_game_callback:
             self.start_game_callback()
 
+    def continue_game(self):
+        """Обработчик кнопки ПРОДОЛЖИТЬ"""
+        if self.continue_game_callback:
+            self.continue_game_callback()
+
+    def start_blitz(self):
+        """Обработчик кнопки БЛИЦ"""
+        if self.blitz_callback:
+            self.blitz_callback()
+
     def show_records(self):
         """Обработчик кнопки РЕКОРДЫ"""
         if self.show_records_callback:
@@ -166,7 +166,7 @@ class SettingsScreen(tk.Frame):
         self.app.sound_manager.set_music_volume(volume)  # текущий звук
         self.app.settings.music_volume = volume  # настройки приложения
         self.volume_value.config(text=f"{int(val)}%")
-        # Немедленно сохраняем
+        # Сохраняем в фоне: пока ползунок двигают, запись откладывается и выполняется один раз
         self.app.settings.save_settings()
 
     def switch_theme(self):
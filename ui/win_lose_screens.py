@@ -1,6 +1,58 @@
 import tkinter as tk
 from tkinter import font as tkfont
 from core.constants import WINDOW_WIDTH, WINDOW_HEIGHT
+from core.rank_index import describe_rank
+
+_prepared_backgrounds = {}  # (путь, ширина, высота) -> PIL-изображение нужного размера
+
+
+def background_size(master):
+    """
+    Размер фона экранов победы и проигрыша. Один и тот же и при подготовке
+    во время паузы, и при показе - иначе готовая картинка не найдется по ключу.
+    """
+    return master.winfo_width() or WINDOW_WIDTH, master.winfo_height() or WINDOW_HEIGHT
+
+
+def prepare_background(image_path, width, height):
+    """
+    Загружает и масштабирует фон заранее (можно вызывать из фонового потока).
+    Возвращает готовое PIL-изображение или None, если файла нет.
+    """
+    from PIL import Image
+    import os
+
+    key = (image_path, width, height)
+    if key not in _prepared_backgrounds:
+        if not os.path.exists(image_path):
+            return None
+        img = Image.open(image_path)
+        _prepared_backgrounds[key] = img.resize((width, height), Image.Resampling.LANCZOS)
+    return _prepared_backgrounds[key]
+
+
+def add_rank_label(parent, settings, prize, bg_color):
+    """Строка "вы #N из M (топ X%)" - место выигрыша среди всех результатов"""
+    if prize <= 0:
+        return
+    try:
+        placement = settings.get_rank(prize)
+    except Exception as e:
+        print(f"Ошибка расчета места: {e}")
+        return
+    if placement is None:
+        return  # Индекс мест пока недоступен - экран открывается без строки места
+    rank, total, _ = placement
+    if total <= 1:
+        return  # Других результатов еще нет
+    tk.Label(
+        parent,
+        text=describe_rank(rank, total).capitalize(),
+        font=tkfont.Font(size=20),
+        fg="#FFD700",
+        bg=bg_color,
+        pady=5
+    ).pack()
 
 
 class WinScreen(tk.Frame):
@@ -22,20 +74,15 @@ class WinScreen(tk.Frame):
         self.play_sounds()
 
     def load_background(self):
-        """Загружает фоновую картинку"""
-        from PIL import Image, ImageTk
-        import os
+        """Загружает фоновую картинку (обычно уже подготовленную во время паузы)"""
+        from PIL import ImageTk
 
-        image_path = "assets/backgrounds/win.png"
-        if os.path.exists(image_path):
-            self.master.update_idletasks()
-            width = self.master.winfo_width() or WINDOW_WIDTH
-            height = self.master.winfo_height() or WINDOW_HEIGHT
+        self.master.update_idletasks()
+        width, height = background_size(self.master)
 
+        img = prepare_background("assets/backgrounds/win.png", width, height)
+        if img is not None:
             self.canvas.config(width=width, height=height)
-
-            img = Image.open(image_path)
-            img = img.resize((width, height), Image.Resampling.LANCZOS)
             self.bg_image = ImageTk.PhotoImage(img)
             self.canvas.create_image(0, 0, image=self.bg_image, anchor="nw")
 
@@ -76,6 +123,7 @@ class WinScreen(tk.Frame):
             bg=bg_color,
             pady=15
         ).pack()
+        add_rank_label(main_frame, self.app.settings, self.prize, bg_color)
 
         # Вопрос
         question_font = tkfont.Font(size=24)
@@ -168,20 +216,15 @@ class LoseScreen(tk.Frame):
         self.play_sounds()
 
     def load_background(self):
-        """Загружает фоновую картинку"""
-        from PIL import Image, ImageTk
-        import os
+        """Загружает фоновую картинку (обычно уже подготовленную во время паузы)"""
+        from PIL import ImageTk
 
-        image_path = "assets/backgrounds/lose.png"
-        if os.path.exists(image_path):
-            self.master.update_idletasks()
-            width = self.master.winfo_width() or WINDOW_WIDTH
-            height = self.master.winfo_height() or WINDOW_HEIGHT
+        self.master.update_idletasks()
+        width, height = background_size(self.master)
 
+        img = prepare_background("assets/backgrounds/lose.png", width, height)
+        if img is not None:
             self.canvas.config(width=width, height=height)
-
-            img = Image.open(image_path)
-            img = img.resize((width, height), Image.Resampling.LANCZOS)
             self.bg_image = ImageTk.PhotoImage(img)
             self.canvas.create_image(0, 0, image=self.bg_image, anchor="nw")
 
@@ -228,6 +271,7 @@ class LoseScreen(tk.Frame):
                 bg=bg_color,
                 pady=15
             ).pack()
+        add_rank_label(main_frame, self.app.settings, self.prize, bg_color)
 
         question_font = tkfont.Font(size=24)
         tk.Label(